@@ -0,0 +1,178 @@
+"""
+HTTP-only job crawler base.
+
+Crawlers built on this class fetch pages with a pooled aiohttp session
+instead of driving a browser, which makes a search cost a few HTTP requests
+rather than a Chromium instance.
+"""
+from typing import Dict, Any, Optional
+import asyncio
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from core.config import settings
+from core.tracing import tracer
+from core.metrics import CRAWLER_REQUESTS, CRAWLER_REQUEST_DURATION
+from .base_crawler import BaseCrawler
+from .rate_limiter import rate_limiter
+
+
+# Status codes job sites use to turn away automated clients (999 is LinkedIn's)
+BLOCKED_STATUS_CODES = {403, 429, 999}
+
+# URL fragments of login walls and bot checks served instead of content
+BLOCKED_URL_MARKERS = ('authwall', 'checkpoint', 'login', 'captcha')
+
+
+class CrawlerBlockedError(Exception):
+    """Exception raised when a job site blocks plain HTTP requests."""
+    pass
+
+
+def http_block_key(domain: str) -> str:
+    """
+    Get the rate limiter key under which a domain's blocks of plain HTTP requests are recorded.
+
+    Blocks are kept apart from the domain's own backoff, so they hold back
+    plain HTTP requests without stalling the browser crawler that falls
+    back to the same site.
+    """
+    return f"{domain}#http"
+
+
+class AiohttpCrawler(BaseCrawler):
+    """
+    Base crawler class for job sites that can be crawled without a browser.
+
+    All instances share one aiohttp.ClientSession so connections are pooled
+    across crawlers and searches, with a per-host connection limit.
+    """
+    _session: Optional[aiohttp.ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self):
+        await self.get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The session is shared between crawlers and closed on shutdown
+        pass
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """
+        Get the shared client session, creating it if needed.
+
+        Returns:
+            Pooled aiohttp client session
+        """
+        # Stored on AiohttpCrawler itself so subclasses share one session
+        loop = asyncio.get_running_loop()
+        session = AiohttpCrawler._session
+        if session is None or session.closed or AiohttpCrawler._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=settings.HTTP_CRAWLER_MAX_CONNECTIONS,
+                limit_per_host=settings.HTTP_CRAWLER_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+            )
+            AiohttpCrawler._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=settings.HTTP_CRAWLER_TIMEOUT),
+            )
+            AiohttpCrawler._session_loop = loop
+        return AiohttpCrawler._session
+
+    @classmethod
+    async def close_session(cls) -> None:
+        """
+        Close the shared client session.
+        """
+        if AiohttpCrawler._session and not AiohttpCrawler._session.closed:
+            await AiohttpCrawler._session.close()
+        AiohttpCrawler._session = None
+        AiohttpCrawler._session_loop = None
+
+    def _get_headers(self) -> Dict[str, str]:
+        """
+        Get request headers resembling a regular browser.
+
+        Returns:
+            Dictionary of HTTP headers
+        """
+        return {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        }
+
+    async def _fetch(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        record_validators: bool = False
+    ) -> Optional[str]:
+        """
+        Fetch a page with rate limiting.
+
+        Args:
+            url: URL to fetch
+            params: Optional query parameters
+            record_validators: Keep the response's ETag / Last-Modified for the detail cache
+
+        Returns:
+            Response body, or None if the request failed
+
+        Raises:
+            CrawlerBlockedError: If the site refused the request or served a login wall
+        """
+        with tracer.span('crawler.fetch', url=url) as span:
+            domain = urlparse(url).netloc or self.domain
+            block_key = http_block_key(domain)
+            if rate_limiter.in_backoff(block_key):
+                raise CrawlerBlockedError(f"{domain} is blocking plain HTTP requests")
+
+            # Apply rate limiting
+            await rate_limiter.wait(domain)
+
+            session = await self.get_session()
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                async with session.get(url, params=params, headers=self._get_headers()) as response:
+                    if span:
+                        span.set_attribute('http.status_code', response.status)
+
+                    if response.status in BLOCKED_STATUS_CODES:
+                        outcome = 'blocked'
+                        rate_limiter.record_failure(block_key, response.status)
+                        raise CrawlerBlockedError(f"{domain} returned status {response.status}")
+
+                    final_url = str(response.url).lower()
+                    if any(marker in urlparse(final_url).path for marker in BLOCKED_URL_MARKERS):
+                        outcome = 'blocked'
+                        rate_limiter.record_failure(block_key, 403)
+                        raise CrawlerBlockedError(f"{domain} redirected to {final_url}")
+
+                    if response.status != 200:
+                        outcome = 'http_error'
+                        rate_limiter.record_failure(domain, response.status)
+                        return None
+
+                    body = await response.text()
+                    outcome = 'success'
+                    rate_limiter.record_success(domain)
+                    if record_validators:
+                        self._record_validators(url, response.headers)
+                    if settings.CRAWL_RECORD_DIR:
+                        self.recorded_responses[url] = {'status': response.status, 'headers': dict(response.headers)}
+                    return body
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                rate_limiter.record_failure(domain)
+                print(f"HTTP fetch error: {e}")
+                return None
+            finally:
+                CRAWLER_REQUESTS.inc(domain=domain, outcome=outcome)
+                CRAWLER_REQUEST_DURATION.observe(time.perf_counter() - started, domain=domain)
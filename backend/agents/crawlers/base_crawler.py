@@ -1,24 +1,45 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 import random
 import asyncio
+import time
 import sys
 from datetime import datetime
 from urllib.parse import urlparse
 from playwright.async_api import async_playwright, Browser, Page, TimeoutError
 
 from core.config import settings
+from core.mongodb import store_page_snapshot, get_crawl_watermark, update_crawl_watermark, get_jobs_by_external_ids
+from core.tracing import tracer, traced
+from core.metrics import CRAWLER_REQUESTS, CRAWLER_REQUEST_DURATION
 from .rate_limiter import rate_limiter
+from .html_parser import parse_items_async, parse_fields_async
+from .detail_cache import detail_cache, detail_cache_key
+from .crawl_recorder import record_page
 
 # Configure event loop policy for Windows
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
+# Job fields filled in by detail crawls
+DETAIL_FIELDS = ('description', 'details', 'job_type')
+
+# Detail fetches per search when the caller sets no limit
+DEFAULT_DETAIL_LIMIT = 5
+
+
 class BaseCrawler(ABC):
     """
     Base crawler class for job sites.
     """
+    # Last selector variant that matched, per (domain, wait key). Shared by all
+    # crawler instances so the winning layout is preferred on the next crawl.
+    selector_preferences: Dict[Tuple[str, str], str] = {}
+    
+    # Platform name used for watermarks and stored jobs
+    source: Optional[str] = None
+
     def __init__(self, domain: str = None, user_agent: str = None):
         self.playwright = None
         self.browser = None
@@ -27,33 +48,67 @@ class BaseCrawler(ABC):
         self.success_count = 0
         self.error_count = 0
         self.last_crawl_time = None
+        # ETag / Last-Modified of recent detail responses, keyed by URL
+        self.response_validators: Dict[str, Dict[str, str]] = {}
+        # Status and headers of responses awaiting recording, keyed by URL
+        self.recorded_responses: Dict[str, Dict[str, Any]] = {}
+        # Searches using the browser; concurrent searches on one crawler share it
+        self._browser_users = 0
+        self._browser_lock: Optional[asyncio.Lock] = None
         
     async def __aenter__(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-            ]
-        )
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._browser_users == 0:
+                with tracer.span('crawler.launch', domain=self.domain):
+                    self.playwright = await async_playwright().start()
+                    try:
+                        self.browser = await self.playwright.chromium.launch(
+                            headless=True,
+                            args=[
+                                '--disable-blink-features=AutomationControlled',
+                                '--no-sandbox',
+                                '--disable-dev-shm-usage',
+                            ]
+                        )
+                    except Exception:
+                        await self.playwright.stop()
+                        self.playwright = None
+                        raise
+            self._browser_users += 1
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        async with self._browser_lock:
+            self._browser_users -= 1
+            if self._browser_users > 0:
+                return
+            if self.browser:
+                await self.browser.close()
+                self.browser = None
+            if self.playwright:
+                await self.playwright.stop()
+                self.playwright = None
 
     @abstractmethod
-    async def search(self, keywords: List[str], location: str) -> List[Dict[str, Any]]:
+    async def search(
+        self,
+        keywords: List[str],
+        location: str,
+        max_results: Optional[int] = None,
+        detail_limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search for jobs with the given keywords and location.
         
         Args:
             keywords: List of search keywords
             location: Job location
+            max_results: Maximum number of jobs to return
+            detail_limit: Maximum number of job detail fetches
+            outcome: Dictionary to store whether this search succeeded in ('success') and its detail requests ('details')
             
         Returns:
             List of job dictionaries
@@ -87,38 +142,542 @@ class BaseCrawler(ABC):
         
         return page
     
-    async def _navigate(self, page: Page, url: str) -> bool:
+    async def _navigate(self, page: Page, url: str, record_validators: bool = False) -> bool:
         """
         Navigate to a URL with rate limiting.
         
         Args:
             page: Browser page
             url: URL to navigate to
+            record_validators: Keep the response's ETag / Last-Modified for the detail cache
             
         Returns:
             True if navigation was successful
         """
-        domain = urlparse(url).netloc
+        with tracer.span('crawler.navigate', url=url) as span:
+            domain = urlparse(url).netloc
+        
+            # Apply rate limiting
+            await rate_limiter.wait(domain or self.domain)
+        
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                response = await page.goto(url, wait_until='domcontentloaded')
+            
+                if response and record_validators:
+                    self._record_validators(url, response.headers)
+                if response and settings.CRAWL_RECORD_DIR:
+                    self.recorded_responses[url] = {'status': response.status, 'headers': response.headers}
+            
+                if span and response:
+                    span.set_attribute('http.status_code', response.status)
+                
+                # Check for successful navigation
+                if response and response.ok:
+                    outcome = 'success'
+                    rate_limiter.record_success(domain or self.domain)
+                    return True
+                else:
+                    status = response.status if response else 0
+                    outcome = 'blocked' if status in (403, 429, 503) else 'http_error'
+                    rate_limiter.record_failure(domain or self.domain, status)
+                    return False
+                
+            except Exception as e:
+                rate_limiter.record_failure(domain or self.domain)
+                print(f"Navigation error: {e}")
+                return False
+            finally:
+                CRAWLER_REQUESTS.inc(domain=domain or self.domain, outcome=outcome)
+                CRAWLER_REQUEST_DURATION.observe(time.perf_counter() - started, domain=domain or self.domain)
+    
+    @traced('crawler.wait')
+    async def _wait_for_any_selector(
+        self,
+        page: Page,
+        selectors: List[str],
+        key: str,
+        timeout: int = 10000
+    ) -> Optional[str]:
+        """
+        Wait for the first of several alternative selectors to appear.
+        
+        All variants are awaited concurrently, so a page that serves an
+        alternative layout costs one timeout at most instead of one per
+        variant. The variant that matched last time for this domain and key
+        is checked first and wins ties.
+        
+        Args:
+            page: Browser page
+            selectors: Alternative selectors for the same content
+            key: Name of the wait (e.g. 'search_results'), used to remember the winner
+            timeout: Maximum time to wait in milliseconds
+            
+        Returns:
+            The selector that matched, or None if none appeared before the timeout
+        """
+        ordered = self._order_selectors(key, selectors)
         
-        # Apply rate limiting
-        await rate_limiter.wait(domain or self.domain)
+        # The remembered variant is usually already present once the DOM is ready
+        try:
+            if await page.query_selector(ordered[0]):
+                self._remember_selector(key, ordered[0])
+                return ordered[0]
+        except Exception:
+            pass
         
+        tasks = {
+            asyncio.create_task(page.wait_for_selector(selector, timeout=timeout)): selector
+            for selector in ordered
+        }
+        pending = set(tasks)
         try:
-            response = await page.goto(url, wait_until='domcontentloaded')
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                matched = [tasks[task] for task in done if not task.cancelled() and task.exception() is None]
+                if matched:
+                    winner = min(matched, key=ordered.index)
+                    self._remember_selector(key, winner)
+                    return winner
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _order_selectors(self, key: str, selectors: List[str]) -> List[str]:
+        """
+        Order selector variants so the last winner for this domain comes first.
+        
+        Args:
+            key: Name of the wait
+            selectors: Alternative selectors
+            
+        Returns:
+            Reordered list of selectors
+        """
+        preferred = self.selector_preferences.get((self.domain, key))
+        if preferred in selectors:
+            return [preferred] + [s for s in selectors if s != preferred]
+        return list(selectors)
+    
+    def _remember_selector(self, key: str, selector: str) -> None:
+        """
+        Remember the selector variant that matched for this domain.
+        
+        Args:
+            key: Name of the wait
+            selector: Selector that matched
+        """
+        if self.selector_preferences.get((self.domain, key)) != selector:
+            print(f"Selector variant for {self.domain}/{key}: {selector}")
+        self.selector_preferences[(self.domain, key)] = selector
+    
+    @traced('crawler.extract')
+    async def _extract_items(self, page: Page, spec: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+        """
+        Extract repeated items (e.g. job cards) from a page.
+        
+        In offline mode the page HTML is fetched once and parsed in the parser
+        thread pool; in live mode each field is read through the DOM.
+        
+        Args:
+            page: Browser page
+            spec: Selector spec with an 'item' selector
+            
+        Returns:
+            List of field dictionaries, one per item
+        """
+        if settings.CRAWLER_EXTRACTION_MODE == 'offline':
+            return await self._parse_html(await page.content(), spec, page.url)
+        
+        items = []
+        for element in await page.query_selector_all(spec['item']):
+            items.append(await self._extract_live_fields(element, spec['fields']))
+        return items
+    
+    @traced('crawler.extract')
+    async def _extract_fields(self, page: Page, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Extract page-level fields (e.g. job details) from a page.
+        
+        Args:
+            page: Browser page
+            spec: Selector spec
+            
+        Returns:
+            Dictionary of field values
+        """
+        if settings.CRAWLER_EXTRACTION_MODE == 'offline':
+            return await self._parse_html(await page.content(), spec, page.url)
+        
+        return await self._extract_live_fields(page, spec['fields'])
+    
+    @traced('crawler.parse')
+    async def _parse_html(self, html: str, spec: Dict[str, Any], url: str) -> Any:
+        """
+        Parse page HTML with a selector spec, storing a snapshot if enabled.
+        
+        Args:
+            html: Page HTML
+            spec: Selector spec
+            url: URL of the page
+            
+        Returns:
+            List of item dictionaries for specs with an 'item' selector,
+            otherwise a dictionary of field values
+        """
+        if settings.CRAWLER_STORE_SNAPSHOTS:
+            await store_page_snapshot(spec['source'], spec['kind'], url, html)
+        if settings.CRAWL_RECORD_DIR:
+            response = self.recorded_responses.pop(url, {})
+            record_page(
+                settings.CRAWL_RECORD_DIR, spec['source'], spec['kind'], url, html,
+                response.get('headers'), response.get('status', 200)
+            )
+        
+        if 'item' in spec:
+            return await parse_items_async(html, spec)
+        return await parse_fields_async(html, spec)
+    
+    async def _extract_live_fields(self, root: Any, fields: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Extract fields through the live DOM.
+        
+        Args:
+            root: Page or element handle to query from
+            fields: Mapping of field name to field spec or list of alternatives
+            
+        Returns:
+            Dictionary of field values
+        """
+        values = {}
+        for name, field_spec in fields.items():
+            alternatives = field_spec if isinstance(field_spec, list) else [field_spec]
+            values[name] = None
+            for alternative in alternatives:
+                try:
+                    values[name] = await self._extract_live_field(root, alternative)
+                except Exception as e:
+                    print(f"Error extracting {name}: {e}")
+                if values[name]:
+                    break
+        return values
+    
+    async def _extract_live_field(self, root: Any, field_spec: Dict[str, Any]) -> Optional[str]:
+        """
+        Extract a single field through the live DOM.
+        
+        Args:
+            root: Page or element handle to query from
+            field_spec: Field spec (see selector_specs)
             
-            # Check for successful navigation
-            if response and response.ok:
-                rate_limiter.record_success(domain or self.domain)
-                return True
+        Returns:
+            Field value, or None if nothing matched
+        """
+        if field_spec.get('selector'):
+            candidates = await root.query_selector_all(field_spec['selector'])
+        else:
+            candidates = [root]
+        
+        for element in candidates:
+            if field_spec.get('contains') and field_spec['contains'] not in await element.inner_text():
+                continue
+            if field_spec.get('next_sibling'):
+                value = await element.evaluate(
+                    'el => el.nextElementSibling ? el.nextElementSibling.innerText : null'
+                )
+            elif field_spec.get('attr'):
+                value = await element.get_attribute(field_spec['attr'])
             else:
-                status = response.status if response else 0
-                rate_limiter.record_failure(domain or self.domain, status)
-                return False
+                value = await element.inner_text()
+            if value and value.strip():
+                return value.strip()
+        
+        return None
+    
+    async def _paginate(
+        self,
+        fetch_page: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+        max_results: int,
+        page_size: int,
+        known_ids: Optional[set] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch search result pages concurrently until enough unique jobs are found.
+        
+        Up to CRAWLER_PAGE_CONCURRENCY pages are in flight at once; every fetch
+        still goes through the domain rate limiter. Fetching stops once
+        max_results unique jobs are gathered, a page comes back empty, a page
+        is mostly jobs already seen by a previous crawl (results are sorted by
+        date, so later pages are older), or CRAWLER_MAX_PAGES is reached.
+        Pages still in flight that are no longer needed are then cancelled.
+        A page whose fetch fails is skipped; the pages after it are kept.
+        
+        Args:
+            fetch_page: Coroutine function returning the jobs on a zero-based page index
+            max_results: Number of unique jobs wanted
+            page_size: Number of results the site shows per page
+            known_ids: External IDs seen by previous crawls of the same query
+            
+        Returns:
+            Unique jobs in page order, at most max_results
+            
+        Raises:
+            Exception: The first page error, if no jobs could be fetched at all
+        """
+        max_pages = min(settings.CRAWLER_MAX_PAGES, max(1, -(-max_results // page_size) * 2))
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        seen = set()
+        next_page = 0
+        last_page = max_pages  # Exclusive bound, lowered when a page comes back empty
+        in_flight: Dict[asyncio.Task, int] = {}
+        cancelled: List[asyncio.Task] = []
+        first_error = None
+        
+        try:
+            while True:
+                while (len(in_flight) < settings.CRAWLER_PAGE_CONCURRENCY
+                       and next_page < last_page and len(seen) < max_results):
+                    in_flight[asyncio.create_task(fetch_page(next_page))] = next_page
+                    next_page += 1
                 
+                if not in_flight:
+                    break
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = in_flight.pop(task)
+                    try:
+                        page_jobs = task.result()
+                    except Exception as e:
+                        # Only this page is lost; unlike an empty page, it says nothing about later ones
+                        print(f"Error fetching results page {index}: {e}")
+                        first_error = first_error or e
+                        continue
+                    
+                    if not page_jobs:
+                        # No more results after this page
+                        last_page = min(last_page, index)
+                        continue
+                    
+                    pages[index] = page_jobs
+                    for job in page_jobs:
+                        seen.add(job.get('external_id') or job.get('url'))
+                    
+                    # Caught up with the previous crawl, later pages are older
+                    if known_ids:
+                        known_count = sum(1 for job in page_jobs if job.get('external_id') in known_ids)
+                        if known_count >= len(page_jobs) * settings.CRAWLER_KNOWN_STOP_RATIO:
+                            print(f"Results page {index} is mostly known jobs, stopping pagination")
+                            last_page = min(last_page, index + 1)
+                
+                # Stop fetching pages that can no longer be used
+                enough = len(seen) >= max_results
+                for task, index in list(in_flight.items()):
+                    if enough or index >= last_page:
+                        task.cancel()
+                        cancelled.append(task)
+                        del in_flight[task]
+                if enough:
+                    break
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, *cancelled, return_exceptions=True)
+        
+        jobs = []
+        keys = set()
+        for index in sorted(pages):
+            if index >= last_page:
+                break
+            for job in pages[index]:
+                key = job.get('external_id') or job.get('url')
+                if key not in keys:
+                    keys.add(key)
+                    jobs.append(job)
+        
+        # Surface the error (e.g. a block) when no page could be fetched at all
+        if not jobs and first_error:
+            raise first_error
+        
+        print(f"Fetched {len(pages)} result pages with {len(jobs)} unique jobs")
+        return jobs[:max_results]
+    
+    async def _load_watermark(self, keywords: List[str], location: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the crawl watermark for this platform and query.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            
+        Returns:
+            Watermark dictionary, or None if the query has not been crawled
+        """
+        try:
+            return await get_crawl_watermark(self.source, keywords, location)
+        except Exception as e:
+            print(f"Error loading crawl watermark: {e}")
+            return None
+    
+    async def _save_watermark(self, keywords: List[str], location: str, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Record the jobs seen by this crawl in the query watermark.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            jobs: Jobs found, newest first
+        """
+        external_ids = [job['external_id'] for job in jobs if job.get('external_id')]
+        try:
+            await update_crawl_watermark(self.source, keywords, location, external_ids)
         except Exception as e:
-            rate_limiter.record_failure(domain or self.domain)
-            print(f"Navigation error: {e}")
-            return False
+            print(f"Error saving crawl watermark: {e}")
+    
+    @traced('crawler.details')
+    async def _add_job_details(
+        self,
+        jobs: List[Dict[str, Any]],
+        get_details: Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+        limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None,
+        known_ids: Optional[set] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Add details to jobs, serving repeat jobs from storage or the detail cache.
+        
+        Jobs seen by a previous crawl of the same query (known_ids) take their
+        details from the stored job, without a request.
+        Cached details are used as-is while fresh and revalidated after the
+        TTL. Fetches and revalidations together make at most `limit` requests;
+        once they are used up, stale details are served without revalidating.
+        
+        Args:
+            jobs: Jobs from the search results
+            get_details: Coroutine function fetching the details of one job
+            limit: Maximum number of detail fetches and revalidations (defaults to DEFAULT_DETAIL_LIMIT)
+            outcome: Outcome dictionary of the search, to keep the requests made so far in under 'details'
+            known_ids: External IDs seen by previous crawls of the same query
+            
+        Returns:
+            Tuple of (all jobs in their original order, jobs whose details were fetched now)
+        """
+        limit = DEFAULT_DETAIL_LIMIT if limit is None else limit
+        result = []
+        fetched = []
+        cache_hits = 0
+        revalidations = 0
+        stored_jobs = await self._load_stored_jobs(jobs, known_ids)
+        for job in jobs:
+            stored = stored_jobs.get(job.get('external_id'))
+            if stored:
+                result.append({**job, **{key: stored[key] for key in DETAIL_FIELDS if stored.get(key)}})
+                continue
+            
+            cached_details, revalidated = await detail_cache.lookup(
+                job, self.user_agent, revalidate=len(fetched) + revalidations < limit
+            )
+            revalidations += revalidated
+            if outcome is not None:
+                outcome['details'] = len(fetched) + revalidations
+            if cached_details:
+                cache_hits += 1
+                result.append({**job, **cached_details})
+                continue
+            
+            if len(fetched) + revalidations >= limit:
+                result.append(job)
+                continue
+            
+            try:
+                job_details = await get_details(job)
+            except Exception as e:
+                print(f"Error getting job details: {e}")
+                job_details = None
+            
+            detail_url = self._detail_url(job)
+            validators = self.response_validators.pop(detail_url, None)
+            if job_details and detail_cache_key(job):
+                details = {key: job_details[key] for key in DETAIL_FIELDS if job_details.get(key)}
+                await detail_cache.put(detail_cache_key(job), detail_url, details, validators)
+            
+            detailed_job = {**job, **job_details} if job_details else job
+            fetched.append(detailed_job)
+            result.append(detailed_job)
+            if outcome is not None:
+                outcome['details'] = len(fetched) + revalidations
+        
+        span = tracer.current_span()
+        if span:
+            span.set_attribute('jobs', len(jobs))
+            span.set_attribute('fetched', len(fetched))
+            span.set_attribute('cache_hits', cache_hits)
+            span.set_attribute('stored', len(stored_jobs))
+        
+        if stored_jobs:
+            print(f"Served details for {len(stored_jobs)} known jobs from storage")
+        if cache_hits:
+            print(f"Served details for {cache_hits} jobs from the detail cache")
+        return result, fetched
+    
+    async def _load_stored_jobs(
+        self,
+        jobs: List[Dict[str, Any]],
+        known_ids: Optional[set]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the stored listings of known jobs that have details.
+        
+        Args:
+            jobs: Jobs from the search results
+            known_ids: External IDs seen by previous crawls of the same query
+            
+        Returns:
+            Dictionary of external ID to stored job listing
+        """
+        ids = [job['external_id'] for job in jobs if job.get('external_id') in (known_ids or ())]
+        if not ids:
+            return {}
+        try:
+            stored = await get_jobs_by_external_ids(self.source, ids)
+        except Exception as e:
+            print(f"Error loading stored jobs: {e}")
+            return {}
+        return {
+            external_id: job for external_id, job in stored.items()
+            if any(job.get(key) for key in DETAIL_FIELDS)
+        }
+    
+    def _detail_url(self, job: Dict[str, Any]) -> str:
+        """
+        Get the URL the details of a job are fetched from.
+        
+        Args:
+            job: Job dictionary
+            
+        Returns:
+            Detail page URL
+        """
+        return job['url']
+    
+    def _record_validators(self, url: str, headers: Dict[str, str]) -> None:
+        """
+        Keep the cache validators of a detail response until the job is cached.
+        
+        Args:
+            url: Requested URL
+            headers: Response headers
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        validators = {
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+        }
+        if any(validators.values()):
+            self.response_validators[url] = validators
     
     async def _random_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
         """
@@ -128,8 +687,28 @@ class BaseCrawler(ABC):
             min_seconds: Minimum wait time in seconds
             max_seconds: Maximum wait time in seconds
         """
-        delay = random.uniform(min_seconds, max_seconds)
-        await asyncio.sleep(delay)
+        delay = random.uniform(min_seconds, max_seconds) * settings.CRAWLER_DELAY_SCALE
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def _site_url(self, default: str) -> str:
+        """
+        Get the origin to crawl for this platform.
+        
+        CRAWLER_SITE_OVERRIDES can point a platform at another origin, such
+        as the local fake job board used by the crawler benchmarks.
+        
+        Args:
+            default: Origin of the real site
+            
+        Returns:
+            Origin without a trailing slash
+        """
+        for override in settings.CRAWLER_SITE_OVERRIDES.split(','):
+            source, _, origin = override.partition('=')
+            if source.strip() == self.source and origin.strip():
+                return origin.strip().rstrip('/')
+        return default
     
     def _get_random_user_agent(self) -> str:
         """
@@ -147,13 +726,19 @@ class BaseCrawler(ABC):
         ]
         return random.choice(user_agents)
     
-    def update_stats(self, success: bool) -> None:
+    def update_stats(self, success: bool, outcome: Optional[Dict[str, Any]] = None) -> None:
         """
         Update crawler statistics.
         
+        The counters are shared by every search on this crawler; a search's
+        own result goes into its outcome dictionary.
+        
         Args:
             success: Whether the crawl was successful
+            outcome: Outcome dictionary passed to search(), if any
         """
+        if outcome is not None:
+            outcome['success'] = success
         self.last_crawl_time = datetime.now()
         if success:
             self.success_count += 1
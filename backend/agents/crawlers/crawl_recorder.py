@@ -0,0 +1,105 @@
+"""
+Recording of crawled pages as replayable fixtures.
+
+With CRAWL_RECORD_DIR set, every page a crawler parses is saved as an HTML
+file plus a JSON file with its URL, status and response headers, under
+<CRAWL_RECORD_DIR>/<platform>/. The fake job board in benchmarks/ replays
+these files so crawlers can be measured without hitting the real sites.
+"""
+from typing import List, Dict, Any, Optional
+import os
+import json
+import hashlib
+from datetime import datetime
+
+
+# Headers not worth replaying (session state and transfer details)
+SKIPPED_HEADERS = {'set-cookie', 'content-length', 'content-encoding', 'transfer-encoding', 'connection'}
+
+
+def record_page(
+    directory: str,
+    source: str,
+    kind: str,
+    url: str,
+    html: str,
+    headers: Optional[Dict[str, str]] = None,
+    status: int = 200
+) -> Optional[str]:
+    """
+    Save a crawled page as a fixture.
+
+    Args:
+        directory: Root fixture directory
+        source: Platform name
+        kind: Page kind ('search' or 'detail')
+        url: URL of the page
+        html: Page HTML
+        headers: Response headers
+        status: Response status code
+
+    Returns:
+        Path of the saved HTML file, or None if it could not be written
+    """
+    name = f"{kind}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}"
+    platform_dir = os.path.join(directory, source)
+    meta = {
+        'url': url,
+        'source': source,
+        'kind': kind,
+        'status': status,
+        'headers': {
+            key: value for key, value in (headers or {}).items()
+            if key.lower() not in SKIPPED_HEADERS
+        },
+        'recorded_at': datetime.now().isoformat(),
+        'html_file': f"{name}.html",
+    }
+
+    try:
+        os.makedirs(platform_dir, exist_ok=True)
+        html_path = os.path.join(platform_dir, f"{name}.html")
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        with open(os.path.join(platform_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        return html_path
+    except OSError as e:
+        print(f"Error recording page {url}: {e}")
+        return None
+
+
+def load_recorded_pages(directory: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load recorded pages.
+
+    Args:
+        directory: Root fixture directory
+        source: Only load pages of this platform
+
+    Returns:
+        List of fixture dictionaries (the recorded metadata plus 'html')
+    """
+    pages = []
+    if not os.path.isdir(directory):
+        return pages
+
+    sources = [source] if source else sorted(os.listdir(directory))
+    for platform in sources:
+        platform_dir = os.path.join(directory, platform)
+        if not os.path.isdir(platform_dir):
+            continue
+        for file_name in sorted(os.listdir(platform_dir)):
+            if not file_name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(platform_dir, file_name), encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(os.path.join(platform_dir, meta['html_file']), encoding='utf-8') as f:
+                    meta['html'] = f.read()
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping fixture {file_name}: {e}")
+                continue
+            pages.append(meta)
+
+    return pages
@@ -0,0 +1,246 @@
+"""
+Cache of crawled job details.
+
+Details are kept in an in-memory LRU backed by the job detail collection,
+keyed by external ID (or canonical URL). Entries older than the TTL are
+revalidated with a conditional HTTP request when the site sent an ETag or
+Last-Modified header, so unchanged postings are not re-rendered.
+"""
+from typing import Dict, Any, Optional, Tuple
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from core.config import settings
+from core.mongodb import get_cached_job_detail, store_cached_job_detail
+from core.metrics import CRAWLER_DETAIL_CACHE, DETAIL_CACHE_SIZE
+from .rate_limiter import rate_limiter
+
+
+def detail_cache_key(job: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the cache key of a job.
+
+    Args:
+        job: Job dictionary
+
+    Returns:
+        External ID, or the URL without query and fragment, or None
+    """
+    if job.get('external_id'):
+        return job['external_id']
+    if job.get('url'):
+        parsed = urlparse(job['url'])
+        return f"{parsed.netloc}{parsed.path}"
+    return None
+
+
+class DetailCache:
+    """
+    Two-tier cache of job details with TTL-based revalidation.
+    """
+    def __init__(self, max_entries: int = 5000, ttl_seconds: int = 259200):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cache entry from memory or the durable tier.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cache entry, or None if the job has not been cached
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+
+        try:
+            entry = await get_cached_job_detail(key)
+        except Exception as e:
+            print(f"Error reading job detail cache: {e}")
+            entry = None
+
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def put(
+        self,
+        key: str,
+        url: str,
+        details: Dict[str, Any],
+        validators: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Store job details.
+
+        Args:
+            key: Cache key
+            url: URL the details were fetched from, used for revalidation
+            details: Detail fields of the job
+            validators: ETag / Last-Modified headers of the detail response
+        """
+        entry = {
+            'key': key,
+            'url': url,
+            'details': details,
+            'fetched_at': time.time(),
+            'etag': (validators or {}).get('etag'),
+            'last_modified': (validators or {}).get('last_modified'),
+        }
+        self._remember(key, entry)
+        try:
+            await store_cached_job_detail(entry)
+        except Exception as e:
+            print(f"Error writing job detail cache: {e}")
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """
+        Check whether an entry is younger than the TTL.
+
+        Args:
+            entry: Cache entry
+
+        Returns:
+            True if the entry can be served without revalidation
+        """
+        return time.time() - entry['fetched_at'] < self.ttl_seconds
+
+    def can_revalidate(self, entry: Dict[str, Any]) -> bool:
+        """
+        Check whether revalidating an entry would send a request.
+
+        Args:
+            entry: Stale cache entry
+
+        Returns:
+            True if the entry has validators and its site is not blocking plain HTTP requests
+        """
+        # Imported here because the HTTP crawler module depends on the base crawler
+        from .aiohttp_crawler import http_block_key
+
+        if not entry.get('etag') and not entry.get('last_modified'):
+            return False
+        return not rate_limiter.in_backoff(http_block_key(urlparse(entry['url']).netloc))
+
+    async def revalidate(self, entry: Dict[str, Any], user_agent: str) -> bool:
+        """
+        Check with the site whether a stale entry is still current.
+
+        Sends a conditional GET with If-None-Match / If-Modified-Since over
+        plain HTTP. Entries without validators cannot be revalidated cheaply.
+
+        Args:
+            entry: Stale cache entry
+            user_agent: User agent to send
+
+        Returns:
+            True if the entry is still current (and has been refreshed)
+        """
+        if not self.can_revalidate(entry):
+            return False
+
+        # Imported here because the HTTP crawler module depends on the base crawler
+        from .aiohttp_crawler import AiohttpCrawler, BLOCKED_STATUS_CODES, http_block_key
+
+        headers = {'User-Agent': user_agent}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        domain = urlparse(entry['url']).netloc
+        await rate_limiter.wait(domain)
+        self.revalidations += 1
+        CRAWLER_DETAIL_CACHE.inc(result='revalidation')
+
+        try:
+            session = await AiohttpCrawler.get_session()
+            async with session.get(entry['url'], headers=headers, allow_redirects=False) as response:
+                if response.status in BLOCKED_STATUS_CODES:
+                    rate_limiter.record_failure(http_block_key(domain), response.status)
+                    return False
+                if response.status >= 400:
+                    rate_limiter.record_failure(domain, response.status)
+                    return False
+                rate_limiter.record_success(domain)
+
+                # Sites that ignore conditional headers may still echo unchanged validators
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                not_modified = response.status == 304 or bool(
+                    response.status == 200
+                    and (etag or last_modified)
+                    and (not entry.get('etag') or etag == entry['etag'])
+                    and (not entry.get('last_modified') or last_modified == entry['last_modified'])
+                )
+        except Exception as e:
+            print(f"Error revalidating {entry['url']}: {e}")
+            return False
+
+        if not_modified:
+            entry['fetched_at'] = time.time()
+            try:
+                await store_cached_job_detail(entry)
+            except Exception as e:
+                print(f"Error writing job detail cache: {e}")
+        return not_modified
+
+    async def lookup(
+        self,
+        job: Dict[str, Any],
+        user_agent: str,
+        revalidate: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Get the cached details of a job, revalidating them if stale.
+
+        Args:
+            job: Job dictionary
+            user_agent: User agent to send when revalidating
+            revalidate: Revalidate stale entries; if False they are served as they are
+
+        Returns:
+            Tuple of (detail fields of the job, or None if they need to be fetched,
+            whether a revalidation request was sent)
+        """
+        key = detail_cache_key(job)
+        entry = await self.get(key) if key else None
+
+        revalidated = False
+        if entry is not None and not self.is_fresh(entry) and not revalidate:
+            self.hits += 1
+            CRAWLER_DETAIL_CACHE.inc(result='stale')
+            return entry['details'], False
+        if entry is not None and not self.is_fresh(entry):
+            revalidated = self.can_revalidate(entry)
+        if entry is not None and (self.is_fresh(entry) or await self.revalidate(entry, user_agent)):
+            self.hits += 1
+            CRAWLER_DETAIL_CACHE.inc(result='hit')
+            return entry['details'], revalidated
+
+        self.misses += 1
+        CRAWLER_DETAIL_CACHE.inc(result='miss')
+        return None, revalidated
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Put an entry in the memory tier, evicting the least recently used.
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# Create a global detail cache instance
+detail_cache = DetailCache(settings.DETAIL_CACHE_MAX_ENTRIES, settings.DETAIL_CACHE_TTL_SECONDS)
+DETAIL_CACHE_SIZE.set_function(lambda: len(detail_cache.entries))
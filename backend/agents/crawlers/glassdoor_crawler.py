@@ -3,11 +3,14 @@ Glassdoor job crawler.
 """
 from typing import List, Dict, Any, Optional
 import re
-from urllib.parse import quote
+from urllib.parse import quote, urljoin
 from datetime import datetime
-from playwright.async_api import TimeoutError
 
+from core.config import settings
+from core.mongodb import store_job_listings
+from core.vector_store import batch_index_jobs
 from .base_crawler import BaseCrawler
+from .selector_specs import GLASSDOOR_SEARCH_SPEC, GLASSDOOR_DETAIL_SPEC
 
 
 class GlassdoorCrawler(BaseCrawler):
@@ -16,127 +19,146 @@ class GlassdoorCrawler(BaseCrawler):
     """
     def __init__(self):
         super().__init__(domain="glassdoor.com")
-        self.base_url = "https://www.glassdoor.com/Job/jobs.htm"
+        self.source = "glassdoor"
+        self.site_url = self._site_url("https://www.glassdoor.com")
+        self.base_url = f"{self.site_url}/Job/jobs.htm"
+        self.page_size = 30
     
-    async def search(self, keywords: List[str], location: str) -> List[Dict[str, Any]]:
+    async def search(
+        self, 
+        keywords: List[str], 
+        location: str,
+        max_results: Optional[int] = None,
+        detail_limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search for jobs on Glassdoor.
         
         Args:
             keywords: List of search keywords
             location: Job location
+            max_results: Maximum number of jobs to return (defaults to settings.CRAWLER_MAX_RESULTS)
+            detail_limit: Maximum number of job detail fetches (defaults to DEFAULT_DETAIL_LIMIT)
+            outcome: Dictionary to store whether this search succeeded in ('success') and its detail requests ('details')
             
         Returns:
             List of job dictionaries
         """
         search_success = False
         jobs = []
+        max_results = max_results or settings.CRAWLER_MAX_RESULTS
         
         try:
             async with self as crawler:
-                page = await self._create_page()
+                # Known jobs from the previous crawl of this query stop paging early and skip their detail fetches
+                watermark = await self._load_watermark(keywords, location)
+                known_ids = set(watermark['external_ids']) if watermark else None
                 
-                # Construct search URL
-                keyword_string = ' '.join(keywords)
-                search_url = f"{self.base_url}?sc.keyword={quote(keyword_string)}&locT=C&locId=1147401&locKeyword={quote(location)}"
+                # Fetch result pages concurrently
+                jobs = await self._paginate(
+                    lambda page_index: self._search_page(keywords, location, page_index),
+                    max_results,
+                    self.page_size,
+                    known_ids=known_ids
+                )
                 
-                # Navigate to Glassdoor jobs
-                if not await self._navigate(page, search_url):
-                    self.update_stats(False)
+                if not jobs:
+                    self.update_stats(False, outcome)
                     return []
                 
-                # Check for and handle login modal
-                try:
-                    close_button = await page.query_selector('button[alt="Close"], .modal_closeIcon')
-                    if close_button:
-                        await close_button.click()
-                        await self._random_delay(1.0, 2.0)
-                except Exception:
-                    pass  # Ignore if no modal
-                
-                # Wait for results
-                try:
-                    await page.wait_for_selector('.react-job-listing, .jobCard', timeout=10000)
-                except TimeoutError:
-                    self.update_stats(False)
-                    return []
-                
-                # Random delay to simulate human behavior
-                await self._random_delay(2.0, 4.0)
-                
-                # Extract job listings
-                job_cards = await page.query_selector_all('.react-job-listing, .jobCard')
-                
-                for card in job_cards:
-                    try:
-                        # Extract basic job info
-                        title_elem = await card.query_selector('.job-title, .jobTitle')
-                        company_elem = await card.query_selector('.employer-name, .jobEmployer')
-                        location_elem = await card.query_selector('.location, .jobLocation')
-                        
-                        if not title_elem:
-                            continue
-                        
-                        title = await title_elem.inner_text()
-                        company = await company_elem.inner_text() if company_elem else "Unknown Company"
-                        job_location = await location_elem.inner_text() if location_elem else location
-                        
-                        # Get the job link
-                        url = await card.get_attribute('href') or await card.evaluate('el => el.querySelector("a").href')
-                        
-                        if not url:
-                            continue
-                        
-                        # Try to extract salary if available
-                        salary_elem = await card.query_selector('.salary-estimate, span:has-text("$")')
-                        salary = await salary_elem.inner_text() if salary_elem else None
-                        
-                        # Basic job data
-                        job = {
-                            'title': title.strip(),
-                            'company': company.strip(),
-                            'location': job_location.strip(),
-                            'url': url,
-                            'source': 'glassdoor',
-                            'search_date': datetime.now().isoformat(),
-                            'salary': salary.strip() if salary else None,
-                        }
-                        
-                        jobs.append(job)
-                        
-                        # Limit to 20 jobs per search to avoid overloading
-                        if len(jobs) >= 20:
-                            break
-                    
-                    except Exception as e:
-                        print(f"Error extracting Glassdoor job card: {e}")
-                        continue
+                # Get job details for new jobs
+                page = await self._create_page()
+                jobs, detailed_jobs = await self._add_job_details(
+                    jobs,
+                    lambda job: self._get_job_details(page, job['url']),
+                    detail_limit,
+                    outcome,
+                    known_ids
+                )
                 
-                # Get job details for first 5 jobs
-                detailed_jobs = []
-                for job in jobs[:5]:
+                # Store new jobs so repeat crawls can skip their details
+                if detailed_jobs:
                     try:
-                        job_details = await self._get_job_details(page, job['url'])
-                        if job_details:
-                            detailed_jobs.append({**job, **job_details})
-                        else:
-                            detailed_jobs.append(job)
+                        await store_job_listings(detailed_jobs)
+                        await batch_index_jobs(detailed_jobs)
                     except Exception as e:
-                        print(f"Error getting Glassdoor job details: {e}")
-                        detailed_jobs.append(job)
+                        print(f"Error storing or indexing jobs: {e}")
                 
+                await self._save_watermark(keywords, location, jobs)
                 search_success = True
-                jobs = detailed_jobs + jobs[5:]  # Combine detailed and non-detailed jobs
         
         except Exception as e:
             print(f"Glassdoor crawler error: {e}")
             search_success = False
         
         # Update crawler stats
-        self.update_stats(search_success)
+        self.update_stats(search_success, outcome)
         
         return jobs
     
+    async def _search_page(
+        self, 
+        keywords: List[str], 
+        location: str, 
+        page_index: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and extract one page of search results, newest first.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            page_index: Zero-based results page
+            
+        Returns:
+            List of job dictionaries on the page
+        """
+        page = await self._create_page()
+        try:
+            # Construct search URL (Glassdoor pages are one-based)
+            keyword_string = ' '.join(keywords)
+            search_url = (
+                f"{self.base_url}?sc.keyword={quote(keyword_string)}&locT=C&locId=1147401"
+                f"&locKeyword={quote(location)}&sortBy=date_desc&p={page_index + 1}"
+            )
+            
+            # Navigate to Glassdoor jobs
+            if not await self._navigate(page, search_url):
+                return []
+            
+            # Check for and handle login modal
+            try:
+                close_button = await page.query_selector('button[alt="Close"], .modal_closeIcon')
+                if close_button:
+                    await close_button.click()
+                    await self._random_delay(1.0, 2.0)
+            except Exception:
+                pass  # Ignore if no modal
+            
+            # Wait for results
+            card_selector = await self._wait_for_any_selector(
+                page,
+                ['.react-job-listing', '.jobCard'],
+                key='search_results',
+                timeout=10000
+            )
+            if not card_selector:
+                return []
+            
+            # Random delay to simulate human behavior
+            await self._random_delay(2.0, 4.0)
+            
+            # Extract job listings
+            jobs = []
+            for card in await self._extract_items(page, GLASSDOOR_SEARCH_SPEC):
+                job = self._build_job(card, location)
+                if job:
+                    jobs.append(job)
+            return jobs
+        finally:
+            await page.context.close()
+    
     async def _get_job_details(self, page, job_url: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed job information.
@@ -148,7 +170,7 @@ class GlassdoorCrawler(BaseCrawler):
         Returns:
             Dictionary with job details
         """
-        if not await self._navigate(page, job_url):
+        if not await self._navigate(page, job_url, record_validators=True):
             return None
         
         # Check for and handle login modal
@@ -161,26 +183,56 @@ class GlassdoorCrawler(BaseCrawler):
             pass  # Ignore if no modal
         
         # Wait for job details to load
-        try:
-            await page.wait_for_selector('.jobDescriptionContent, .desc', timeout=10000)
-        except TimeoutError:
+        description_selector = await self._wait_for_any_selector(
+            page,
+            ['.jobDescriptionContent', '.desc'],
+            key='job_description',
+            timeout=10000
+        )
+        if not description_selector:
             return None
         
         # Random delay
         await self._random_delay(1.0, 2.0)
         
-        # Extract job description
-        description_elem = await page.query_selector('.jobDescriptionContent, .desc')
-        description = await description_elem.inner_text() if description_elem else ""
-        
-        # Try to extract additional details
-        job_type_elem = await page.query_selector('span:has-text("Employment Type")')
-        job_type = None
-        if job_type_elem:
-            job_type_container = await job_type_elem.evaluate('el => el.nextElementSibling')
-            job_type = job_type_container.textContent if job_type_container else None
+        # Extract job description and employment type
+        fields = await self._extract_fields(page, GLASSDOOR_DETAIL_SPEC)
         
         return {
-            'description': description,
-            'job_type': job_type
-        }
\ No newline at end of file
+            'description': fields.get('description') or "",
+            'job_type': fields.get('job_type')
+        }
+    
+    def _build_job(self, card: Dict[str, Optional[str]], location: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a job dictionary from the fields of a Glassdoor job card.
+        
+        Args:
+            card: Field values extracted with GLASSDOOR_SEARCH_SPEC
+            location: Search location, used when the card has none
+            
+        Returns:
+            Job dictionary, or None if the card has no title or link
+        """
+        if not card.get('title') or not card.get('url'):
+            return None
+        
+        url = urljoin(self.site_url, card['url'])
+        
+        job = {
+            'title': card['title'].strip(),
+            'company': (card.get('company') or "Unknown Company").strip(),
+            'location': (card.get('location') or location).strip(),
+            'url': url,
+            'source': 'glassdoor',
+            'search_date': datetime.now().isoformat(),
+            'salary': card['salary'].strip() if card.get('salary') else None,
+        }
+        
+        # Extract listing ID from URL or card attributes
+        listing_id_match = re.search(r"(?:jobListingId|jl)=(\d+)", url)
+        listing_id = listing_id_match.group(1) if listing_id_match else card.get('listing_id')
+        if listing_id:
+            job['external_id'] = f"glassdoor-{listing_id}"
+        
+        return job
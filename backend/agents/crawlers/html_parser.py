@@ -0,0 +1,219 @@
+"""
+Offline HTML parsing for crawled pages.
+
+Parses page HTML in Python using the selector specs from selector_specs,
+so extraction does not need a live browser page. Uses selectolax (Lexbor)
+when installed and falls back to BeautifulSoup otherwise.
+"""
+from typing import List, Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config import settings
+from core.mongodb import get_page_snapshots
+from .selector_specs import SELECTOR_SPECS
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+if LexborHTMLParser is None:
+    from bs4 import BeautifulSoup
+    try:
+        import lxml  # noqa: F401
+        BS4_FEATURES = 'lxml'
+    except ImportError:
+        BS4_FEATURES = 'html.parser'
+
+
+# Thread pool that keeps HTML parsing off the event loop
+parser_executor = ThreadPoolExecutor(
+    max_workers=settings.HTML_PARSER_WORKERS,
+    thread_name_prefix="html-parser"
+)
+
+
+def _parse_document(html: str) -> Any:
+    """Parse HTML with the available backend."""
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(html)
+    return BeautifulSoup(html, BS4_FEATURES)
+
+
+def _select(node: Any, selector: str) -> List[Any]:
+    """Select all nodes matching a CSS selector."""
+    if LexborHTMLParser is not None:
+        return node.css(selector)
+    return node.select(selector)
+
+
+def _text(node: Any, multiline: bool = False) -> str:
+    """Get the stripped text content of a node."""
+    separator = '\n' if multiline else ' '
+    if LexborHTMLParser is not None:
+        return node.text(separator=separator, strip=True).strip()
+    return node.get_text(separator, strip=True)
+
+
+def _attr(node: Any, name: str) -> Optional[str]:
+    """Get an attribute value of a node."""
+    if LexborHTMLParser is not None:
+        return node.attributes.get(name)
+    value = node.get(name)
+    return ' '.join(value) if isinstance(value, list) else value
+
+
+def _next_element_sibling(node: Any) -> Optional[Any]:
+    """Get the next sibling element of a node, skipping text nodes."""
+    if LexborHTMLParser is not None:
+        sibling = node.next
+        while sibling is not None and sibling.tag in ('-text', '-comment'):
+            sibling = sibling.next
+        return sibling
+    return node.find_next_sibling()
+
+
+def _extract_field(root: Any, field_spec: Dict[str, Any]) -> Optional[str]:
+    """
+    Extract a single field from a parsed node.
+
+    Args:
+        root: Parsed item or document node
+        field_spec: Field spec (see selector_specs)
+
+    Returns:
+        Field value, or None if nothing matched
+    """
+    if field_spec.get('selector'):
+        candidates = _select(root, field_spec['selector'])
+    else:
+        candidates = [root]
+
+    for node in candidates:
+        if field_spec.get('contains') and field_spec['contains'] not in _text(node):
+            continue
+        if field_spec.get('next_sibling'):
+            node = _next_element_sibling(node)
+            if node is None:
+                continue
+        if field_spec.get('attr'):
+            value = _attr(node, field_spec['attr'])
+        else:
+            value = _text(node, field_spec.get('multiline', False))
+        if value:
+            return value
+
+    return None
+
+
+def extract_fields(root: Any, fields: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Extract all fields of a spec from a parsed node.
+
+    Args:
+        root: Parsed item or document node
+        fields: Mapping of field name to field spec or list of alternatives
+
+    Returns:
+        Dictionary of field values
+    """
+    values = {}
+    for name, field_spec in fields.items():
+        alternatives = field_spec if isinstance(field_spec, list) else [field_spec]
+        values[name] = None
+        for alternative in alternatives:
+            values[name] = _extract_field(root, alternative)
+            if values[name]:
+                break
+    return values
+
+
+def parse_items(html: str, spec: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse repeated items (e.g. job cards) from page HTML.
+
+    Args:
+        html: Page HTML
+        spec: Selector spec with an 'item' selector
+
+    Returns:
+        List of field dictionaries, one per item
+    """
+    document = _parse_document(html)
+    return [extract_fields(item, spec['fields']) for item in _select(document, spec['item'])]
+
+
+def parse_fields(html: str, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Parse page-level fields (e.g. job details) from page HTML.
+
+    Args:
+        html: Page HTML
+        spec: Selector spec
+
+    Returns:
+        Dictionary of field values
+    """
+    return extract_fields(_parse_document(html), spec['fields'])
+
+
+async def parse_items_async(html: str, spec: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+    """
+    Parse repeated items in the parser thread pool.
+
+    Args:
+        html: Page HTML
+        spec: Selector spec with an 'item' selector
+
+    Returns:
+        List of field dictionaries, one per item
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parser_executor, parse_items, html, spec)
+
+
+async def parse_fields_async(html: str, spec: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Parse page-level fields in the parser thread pool.
+
+    Args:
+        html: Page HTML
+        spec: Selector spec
+
+    Returns:
+        Dictionary of field values
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parser_executor, parse_fields, html, spec)
+
+
+async def reparse_page_snapshots(source: str = None, kind: str = None) -> List[Dict[str, Any]]:
+    """
+    Re-parse stored page snapshots with the current selector specs.
+
+    Lets selector changes be checked against saved pages without re-crawling.
+
+    Args:
+        source: Optional platform filter
+        kind: Optional page kind filter ('search' or 'detail')
+
+    Returns:
+        List of dictionaries with the snapshot URL, source, kind and parse result
+    """
+    results = []
+    for snapshot in await get_page_snapshots(source, kind):
+        spec = SELECTOR_SPECS.get(snapshot['source'], {}).get(snapshot['kind'])
+        if not spec:
+            continue
+        if 'item' in spec:
+            parsed = await parse_items_async(snapshot['html'], spec)
+        else:
+            parsed = await parse_fields_async(snapshot['html'], spec)
+        results.append({
+            'url': snapshot['url'],
+            'source': snapshot['source'],
+            'kind': snapshot['kind'],
+            'result': parsed
+        })
+    return results
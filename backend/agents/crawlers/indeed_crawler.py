@@ -3,11 +3,14 @@ Indeed job crawler.
 """
 from typing import List, Dict, Any, Optional
 import re
-from urllib.parse import quote
+from urllib.parse import quote, urljoin
 from datetime import datetime
-from playwright.async_api import TimeoutError
 
+from core.config import settings
+from core.mongodb import store_job_listings
+from core.vector_store import batch_index_jobs
 from .base_crawler import BaseCrawler
+from .selector_specs import INDEED_SEARCH_SPEC, INDEED_DETAIL_SPEC
 
 
 class IndeedCrawler(BaseCrawler):
@@ -16,129 +19,137 @@ class IndeedCrawler(BaseCrawler):
     """
     def __init__(self):
         super().__init__(domain="indeed.com")
-        self.base_url = "https://www.indeed.com/jobs"
+        self.source = "indeed"
+        self.site_url = self._site_url("https://www.indeed.com")
+        self.base_url = f"{self.site_url}/jobs"
+        self.page_size = 10
     
-    async def search(self, keywords: List[str], location: str) -> List[Dict[str, Any]]:
+    async def search(
+        self, 
+        keywords: List[str], 
+        location: str,
+        max_results: Optional[int] = None,
+        detail_limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search for jobs on Indeed.
         
         Args:
             keywords: List of search keywords
             location: Job location
+            max_results: Maximum number of jobs to return (defaults to settings.CRAWLER_MAX_RESULTS)
+            detail_limit: Maximum number of job detail fetches (defaults to DEFAULT_DETAIL_LIMIT)
+            outcome: Dictionary to store whether this search succeeded in ('success') and its detail requests ('details')
             
         Returns:
             List of job dictionaries
         """
         search_success = False
         jobs = []
+        max_results = max_results or settings.CRAWLER_MAX_RESULTS
         
         try:
             async with self as crawler:
-                page = await self._create_page()
-                
-                # Construct search URL
-                keyword_string = ' '.join(keywords)
-                search_url = f"{self.base_url}?q={quote(keyword_string)}&l={quote(location)}&sort=date"
+                # Known jobs from the previous crawl of this query stop paging early and skip their detail fetches
+                watermark = await self._load_watermark(keywords, location)
+                known_ids = set(watermark['external_ids']) if watermark else None
                 
-                # Navigate to Indeed jobs
-                if not await self._navigate(page, search_url):
-                    self.update_stats(False)
-                    return []
+                # Fetch result pages concurrently
+                jobs = await self._paginate(
+                    lambda page_index: self._search_page(keywords, location, page_index),
+                    max_results,
+                    self.page_size,
+                    known_ids=known_ids
+                )
                 
-                # Wait for results
-                try:
-                    await page.wait_for_selector('.job_seen_beacon, .jobsearch-ResultsList .result', timeout=10000)
-                except TimeoutError:
-                    self.update_stats(False)
+                if not jobs:
+                    self.update_stats(False, outcome)
                     return []
                 
-                # Random delay to simulate human behavior
-                await self._random_delay(2.0, 4.0)
-                
-                # Extract job listings
-                job_cards = await page.query_selector_all('.job_seen_beacon, .jobsearch-ResultsList .result')
-                
-                for card in job_cards:
-                    try:
-                        # Extract basic job info
-                        title_elem = await card.query_selector('h2.jobTitle, .jcs-JobTitle')
-                        company_elem = await card.query_selector('.companyName, .companyOverviewLink')
-                        location_elem = await card.query_selector('.companyLocation')
-                        link_elem = await card.query_selector('h2.jobTitle a, .jcs-JobTitle a')
-                        
-                        if not title_elem or not link_elem:
-                            continue
-                        
-                        title = await title_elem.inner_text()
-                        company = await company_elem.inner_text() if company_elem else "Unknown Company"
-                        job_location = await location_elem.inner_text() if location_elem else location
-                        
-                        # Get the relative URL and convert to absolute
-                        relative_url = await link_elem.get_attribute('href')
-                        url = f"https://www.indeed.com{relative_url}" if relative_url.startswith('/') else relative_url
-                        
-                        # Extract job ID from URL
-                        job_id_match = re.search(r'jk=([a-zA-Z0-9]+)', url)
-                        job_id = job_id_match.group(1) if job_id_match else None
-                        
-                        if not job_id:
-                            continue
-                        
-                        # Try to extract salary if available
-                        salary_elem = await card.query_selector('.salary-snippet-container, .metadataContainer .attribute:has-text("$")')
-                        salary = await salary_elem.inner_text() if salary_elem else None
-                        
-                        # Try to extract job type
-                        job_type_elem = await card.query_selector('.metadata:has-text("Full-time"), .metadata:has-text("Part-time")')
-                        job_type = await job_type_elem.inner_text() if job_type_elem else None
-                        
-                        # Basic job data
-                        job = {
-                            'title': title.strip(),
-                            'company': company.strip(),
-                            'location': job_location.strip(),
-                            'url': url,
-                            'source': 'indeed',
-                            'search_date': datetime.now().isoformat(),
-                            'salary': salary.strip() if salary else None,
-                            'job_type': job_type.strip() if job_type else None,
-                        }
-                        
-                        jobs.append(job)
-                        
-                        # Limit to 20 jobs per search to avoid overloading
-                        if len(jobs) >= 20:
-                            break
-                    
-                    except Exception as e:
-                        print(f"Error extracting Indeed job card: {e}")
-                        continue
+                # Get job details for new jobs
+                page = await self._create_page()
+                jobs, detailed_jobs = await self._add_job_details(
+                    jobs,
+                    lambda job: self._get_job_details(page, job['url']),
+                    detail_limit,
+                    outcome,
+                    known_ids
+                )
                 
-                # Get job details for first 5 jobs
-                detailed_jobs = []
-                for job in jobs[:5]:
+                # Store new jobs so repeat crawls can skip their details
+                if detailed_jobs:
                     try:
-                        job_details = await self._get_job_details(page, job['url'])
-                        if job_details:
-                            detailed_jobs.append({**job, **job_details})
-                        else:
-                            detailed_jobs.append(job)
+                        await store_job_listings(detailed_jobs)
+                        await batch_index_jobs(detailed_jobs)
                     except Exception as e:
-                        print(f"Error getting Indeed job details: {e}")
-                        detailed_jobs.append(job)
+                        print(f"Error storing or indexing jobs: {e}")
                 
+                await self._save_watermark(keywords, location, jobs)
                 search_success = True
-                jobs = detailed_jobs + jobs[5:]  # Combine detailed and non-detailed jobs
         
         except Exception as e:
             print(f"Indeed crawler error: {e}")
             search_success = False
         
         # Update crawler stats
-        self.update_stats(search_success)
+        self.update_stats(search_success, outcome)
         
         return jobs
     
+    async def _search_page(
+        self, 
+        keywords: List[str], 
+        location: str, 
+        page_index: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and extract one page of search results, newest first.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            page_index: Zero-based results page
+            
+        Returns:
+            List of job dictionaries on the page
+        """
+        page = await self._create_page()
+        try:
+            # Construct search URL
+            keyword_string = ' '.join(keywords)
+            search_url = (
+                f"{self.base_url}?q={quote(keyword_string)}&l={quote(location)}"
+                f"&sort=date&start={page_index * self.page_size}"
+            )
+            
+            # Navigate to Indeed jobs
+            if not await self._navigate(page, search_url):
+                return []
+            
+            # Wait for results
+            card_selector = await self._wait_for_any_selector(
+                page,
+                ['.job_seen_beacon', '.jobsearch-ResultsList .result'],
+                key='search_results',
+                timeout=10000
+            )
+            if not card_selector:
+                return []
+            
+            # Random delay to simulate human behavior
+            await self._random_delay(2.0, 4.0)
+            
+            # Extract job listings
+            jobs = []
+            for card in await self._extract_items(page, INDEED_SEARCH_SPEC):
+                job = self._build_job(card, location)
+                if job:
+                    jobs.append(job)
+            return jobs
+        finally:
+            await page.context.close()
+    
     async def _get_job_details(self, page, job_url: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed job information.
@@ -150,22 +161,61 @@ class IndeedCrawler(BaseCrawler):
         Returns:
             Dictionary with job details
         """
-        if not await self._navigate(page, job_url):
+        if not await self._navigate(page, job_url, record_validators=True):
             return None
         
         # Wait for job details to load
-        try:
-            await page.wait_for_selector('#jobDescriptionText', timeout=10000)
-        except TimeoutError:
+        description_selector = await self._wait_for_any_selector(
+            page,
+            ['#jobDescriptionText', '.jobsearch-JobComponent-description'],
+            key='job_description',
+            timeout=10000
+        )
+        if not description_selector:
             return None
         
         # Random delay
         await self._random_delay(1.0, 2.0)
         
         # Extract job description
-        description_elem = await page.query_selector('#jobDescriptionText')
-        description = await description_elem.inner_text() if description_elem else ""
+        fields = await self._extract_fields(page, INDEED_DETAIL_SPEC)
+        
+        return {
+            'description': fields.get('description') or ""
+        }
+    
+    def _build_job(self, card: Dict[str, Optional[str]], location: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a job dictionary from the fields of an Indeed job card.
+        
+        Args:
+            card: Field values extracted with INDEED_SEARCH_SPEC
+            location: Search location, used when the card has none
+            
+        Returns:
+            Job dictionary, or None if the card has no title, link or job key
+        """
+        if not card.get('title') or not card.get('url'):
+            return None
+        
+        # Convert the relative URL to absolute
+        url = urljoin(self.site_url, card['url'])
+        
+        # Extract job ID from URL
+        job_id_match = re.search(r'jk=([a-zA-Z0-9]+)', url)
+        job_id = job_id_match.group(1) if job_id_match else card.get('job_key')
+        
+        if not job_id:
+            return None
         
         return {
-            'description': description
-        }
\ No newline at end of file
+            'title': card['title'].strip(),
+            'company': (card.get('company') or "Unknown Company").strip(),
+            'location': (card.get('location') or location).strip(),
+            'url': url,
+            'external_id': f"indeed-{job_id}",
+            'source': 'indeed',
+            'search_date': datetime.now().isoformat(),
+            'salary': card['salary'].strip() if card.get('salary') else None,
+            'job_type': card['job_type'].strip() if card.get('job_type') else None,
+        }
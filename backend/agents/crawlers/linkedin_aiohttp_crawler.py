@@ -0,0 +1,185 @@
+"""
+LinkedIn job crawler using the public guest job endpoints.
+"""
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
+
+from core.config import settings
+from core.mongodb import store_job_listings, update_crawl_stats
+from core.vector_store import batch_index_jobs
+from .aiohttp_crawler import AiohttpCrawler, CrawlerBlockedError
+from .linkedin_crawler import LinkedInCrawler, parse_job_card, parse_job_details
+from .selector_specs import LINKEDIN_SEARCH_SPEC, LINKEDIN_DETAIL_SPEC
+
+
+class LinkedInAiohttpCrawler(AiohttpCrawler):
+    """
+    LinkedIn job crawler that fetches and parses HTML without a browser.
+
+    Falls back to the Playwright-based LinkedInCrawler when LinkedIn blocks
+    plain HTTP requests.
+    """
+    def __init__(self):
+        super().__init__(domain="linkedin.com")
+        self.source = "linkedin"
+        self.site_url = self._site_url("https://www.linkedin.com")
+        self.base_url = f"{self.site_url}/jobs-guest/jobs/api/seeMoreJobPostings/search"
+        self.detail_url = f"{self.site_url}/jobs-guest/jobs/api/jobPosting/{{job_id}}"
+        self.page_size = 10
+        self.fallback_crawler = LinkedInCrawler()
+
+    async def search(
+        self,
+        keywords: List[str],
+        location: str,
+        max_results: Optional[int] = None,
+        detail_limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for jobs on LinkedIn.
+
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            max_results: Maximum number of jobs to return (defaults to settings.CRAWLER_MAX_RESULTS)
+            detail_limit: Maximum number of job detail fetches (defaults to DEFAULT_DETAIL_LIMIT)
+            outcome: Dictionary to store whether this search succeeded in ('success') and its detail requests ('details')
+
+        Returns:
+            List of job dictionaries
+        """
+        search_success = False
+        jobs = []
+        max_results = max_results or settings.CRAWLER_MAX_RESULTS
+
+        try:
+            async with self:
+                # Known jobs from the previous crawl of this query stop paging early and skip their detail fetches
+                watermark = await self._load_watermark(keywords, location)
+                known_ids = set(watermark['external_ids']) if watermark else None
+
+                jobs = await self._paginate(
+                    lambda page_index: self._search_page(keywords, location, page_index, settings.CRAWLER_RECENCY_SECONDS),
+                    max_results,
+                    self.page_size,
+                    known_ids=known_ids
+                )
+                if not jobs:
+                    self.update_stats(False, outcome)
+                    return []
+                print(f"Found {len(jobs)} LinkedIn jobs over HTTP")
+
+                # Get job details for new jobs
+                jobs, detailed_jobs = await self._add_job_details(
+                    jobs,
+                    lambda job: self._get_job_details(self._job_id(job)),
+                    detail_limit,
+                    outcome,
+                    known_ids
+                )
+
+                if detailed_jobs:
+                    try:
+                        await store_job_listings(detailed_jobs)
+                        await batch_index_jobs(detailed_jobs)
+                    except Exception as e:
+                        print(f"Error storing or indexing jobs: {e}")
+
+                await self._save_watermark(keywords, location, jobs)
+                search_success = True
+
+        except CrawlerBlockedError as e:
+            print(f"LinkedIn blocked HTTP crawl ({e}), falling back to browser crawler")
+            self.update_stats(False, outcome)
+            return await self.fallback_crawler.search(keywords, location, max_results, detail_limit, outcome)
+        except Exception as e:
+            print(f"LinkedIn HTTP crawler error: {e}")
+            search_success = False
+
+        # Update crawler stats
+        self.update_stats(search_success, outcome)
+        await update_crawl_stats("linkedin",
+                                len(jobs) if search_success else 0,
+                                0 if search_success else 1,
+                                keywords)
+
+        return jobs
+
+    async def _search_page(
+        self,
+        keywords: List[str],
+        location: str,
+        page_index: int,
+        recency_seconds: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch and parse one page of guest search results, newest first.
+
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            page_index: Zero-based results page
+            recency_seconds: Only include jobs posted within this many seconds
+
+        Returns:
+            List of job dictionaries on the page
+
+        Raises:
+            CrawlerBlockedError: If LinkedIn blocked the request
+        """
+        params = {
+            'keywords': ' '.join(keywords),
+            'location': location,
+            'f_TPR': f'r{recency_seconds}',
+            'sortBy': 'DD',
+            'start': page_index * self.page_size,
+        }
+        search_url = f"{self.base_url}?{urlencode(params)}"
+        html = await self._fetch(search_url)
+        if html is None:
+            return []
+
+        cards = await self._parse_html(html, LINKEDIN_SEARCH_SPEC, search_url)
+        return [job for job in (parse_job_card(card, keywords, location, self.site_url) for card in cards) if job]
+
+    def _job_id(self, job: Dict[str, Any]) -> str:
+        """
+        Get the LinkedIn posting ID of a job.
+
+        Args:
+            job: Job dictionary
+
+        Returns:
+            Numeric job posting ID
+        """
+        return job['external_id'].split('-', 1)[1]
+
+    def _detail_url(self, job: Dict[str, Any]) -> str:
+        """
+        Get the guest posting URL the details of a job are fetched from.
+
+        Args:
+            job: Job dictionary
+
+        Returns:
+            Detail page URL
+        """
+        return self.detail_url.format(job_id=self._job_id(job))
+
+    async def _get_job_details(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get detailed job information.
+
+        Args:
+            job_id: LinkedIn job posting ID
+
+        Returns:
+            Dictionary with job details
+        """
+        url = self.detail_url.format(job_id=job_id)
+        html = await self._fetch(url, record_validators=True)
+        if html is None:
+            return None
+
+        return parse_job_details(await self._parse_html(html, LINKEDIN_DETAIL_SPEC, url))
@@ -1,8 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .base_crawler import BaseCrawler
 
 class NaukriCrawler(BaseCrawler):
-    async def search(self, keywords: List[str], location: str) -> List[Dict[str, Any]]:
+    async def search(
+        self,
+        keywords: List[str],
+        location: str,
+        max_results: Optional[int] = None,
+        detail_limit: Optional[int] = None,
+        outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         try:
             # Create a new page with stealth settings
             async with self as crawler:
@@ -33,8 +40,10 @@ class NaukriCrawler(BaseCrawler):
                 }
                 jobs.append(job)
             
+            self.update_stats(True, outcome)
             return jobs
         except Exception as e:
             print(f"Error creating page: {e}")
+            self.update_stats(False, outcome)
             return []
         
\ No newline at end of file
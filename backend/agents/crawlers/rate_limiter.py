@@ -8,6 +8,10 @@ from typing import Dict, Any, Optional, Callable
 import random
 from datetime import datetime, timedelta
 
+from core.config import settings
+from core.tracing import traced
+from core.metrics import RATE_LIMITER_WAIT, RATE_LIMITER_BACKOFFS
+
 # Configure event loop policy for Windows
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -25,6 +29,7 @@ class RateLimiter:
         self.success_count: Dict[str, int] = {}
         self.failure_count: Dict[str, int] = {}
     
+    @traced('crawler.rate_limit_wait')
     async def wait(self, domain: str) -> None:
         """
         Wait for the appropriate time before making a request.
@@ -32,24 +37,42 @@ class RateLimiter:
         Args:
             domain: Domain to rate limit
         """
+        started = time.perf_counter()
+        
         # Check if we're in backoff mode
         if domain in self.backoff_until and datetime.now() < self.backoff_until[domain]:
             backoff_seconds = (self.backoff_until[domain] - datetime.now()).total_seconds()
             print(f"In backoff mode for {domain}. Waiting {backoff_seconds:.2f} seconds...")
             await asyncio.sleep(backoff_seconds)
         
-        # Calculate wait time
+        # Reserve the next free request slot for this domain. Slots are claimed
+        # before sleeping so concurrent callers queue up instead of all firing
+        # after the same wait.
         now = time.time()
+        next_slot = now
         if domain in self.last_request_time:
-            elapsed = now - self.last_request_time[domain]
-            if elapsed < self.interval:
+            next_slot = max(now, self.last_request_time[domain] + self.interval)
+            if next_slot > now:
                 # Add jitter to avoid synchronized requests
-                jitter = random.uniform(0, 0.5)
-                wait_time = self.interval - elapsed + jitter
-                await asyncio.sleep(wait_time)
+                next_slot += random.uniform(0, 0.5) * settings.CRAWLER_DELAY_SCALE
+        self.last_request_time[domain] = next_slot
+        
+        if next_slot > now:
+            await asyncio.sleep(next_slot - now)
+        
+        RATE_LIMITER_WAIT.observe(time.perf_counter() - started, domain=domain)
+    
+    def in_backoff(self, domain: str) -> bool:
+        """
+        Check whether a domain is in backoff mode.
         
-        # Update last request time
-        self.last_request_time[domain] = time.time()
+        Args:
+            domain: Domain to check
+            
+        Returns:
+            True if requests to the domain are being held back
+        """
+        return domain in self.backoff_until and datetime.now() < self.backoff_until[domain]
     
     def record_success(self, domain: str) -> None:
         """
@@ -78,17 +101,22 @@ class RateLimiter:
         if self.failure_count[domain] >= 3:
             # Calculate backoff time: 2^(failure_count-2) minutes, max 60 minutes
             backoff_minutes = min(2 ** (self.failure_count[domain] - 2), 60)
-            self.backoff_until[domain] = datetime.now() + timedelta(minutes=backoff_minutes)
+            self.backoff_until[domain] = datetime.now() + timedelta(
+                minutes=backoff_minutes * settings.CRAWLER_DELAY_SCALE
+            )
+            RATE_LIMITER_BACKOFFS.inc(domain=domain, reason='failures')
             print(f"Too many failures for {domain}. Backing off for {backoff_minutes} minutes.")
         
         # Special handling for specific status codes
         if status_code == 429:  # Too Many Requests
-            self.backoff_until[domain] = datetime.now() + timedelta(minutes=15)
+            self.backoff_until[domain] = datetime.now() + timedelta(minutes=15 * settings.CRAWLER_DELAY_SCALE)
+            RATE_LIMITER_BACKOFFS.inc(domain=domain, reason='throttled')
             print(f"Rate limited by {domain}. Backing off for 15 minutes.")
         elif status_code in (403, 503):  # Forbidden or Service Unavailable
-            self.backoff_until[domain] = datetime.now() + timedelta(minutes=30)
+            self.backoff_until[domain] = datetime.now() + timedelta(minutes=30 * settings.CRAWLER_DELAY_SCALE)
+            RATE_LIMITER_BACKOFFS.inc(domain=domain, reason='blocked')
             print(f"Possible ban from {domain}. Backing off for 30 minutes.")
 
 
 # Create a global rate limiter instance
-rate_limiter = RateLimiter()
\ No newline at end of file
+rate_limiter = RateLimiter(settings.CRAWLER_REQUESTS_PER_MINUTE)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Selector specifications for job site pages.
+
+The same specs drive both live extraction through Playwright and offline
+parsing of saved HTML, so a selector change is made in one place.
+
+A spec is a dictionary with:
+    source: Platform name
+    kind: Page kind ('search' or 'detail')
+    item: CSS selector of repeated items (search pages only)
+    fields: Mapping of field name to a field spec, or a list of field specs
+        tried in order until one yields a value
+
+A field spec is a dictionary with:
+    selector: CSS selector relative to the item or page (omit to use the item itself)
+    attr: Attribute to read instead of the text content
+    contains: Only match elements whose text contains this string
+    next_sibling: Read the matched element's next element sibling instead
+    multiline: Keep line breaks in the text content
+"""
+from typing import Dict, Any
+
+
+LINKEDIN_SEARCH_SPEC: Dict[str, Any] = {
+    'source': 'linkedin',
+    'kind': 'search',
+    'item': '.job-card-container, .job-search-card, [data-job-id]',
+    'fields': {
+        'title': {'selector': '.job-card-list__title, .base-search-card__title, .job-title'},
+        'company': {'selector': '.job-card-container__company-name, .base-search-card__subtitle, .company-name'},
+        'location': {'selector': '.job-card-container__metadata-item, .job-search-card__location, .job-location'},
+        'url': {'selector': 'a', 'attr': 'href'},
+        'job_id': {'attr': 'data-job-id'},
+        'entity_urn': {'attr': 'data-entity-urn'},
+        'posted_date': {'selector': 'time', 'attr': 'datetime'},
+    },
+}
+
+LINKEDIN_DETAIL_SPEC: Dict[str, Any] = {
+    'source': 'linkedin',
+    'kind': 'detail',
+    'fields': {
+        'description': [
+            {'selector': '.jobs-description-content, .show-more-less-html__markup', 'multiline': True},
+            {'selector': '.description__text', 'multiline': True},
+        ],
+        'salary_text': [
+            {'selector': '.compensation-information, .compensation__salary'},
+            {'selector': '.jobs-unified-top-card__job-insight span', 'contains': '$'},
+        ],
+        'job_type': [
+            {'selector': '.jobs-unified-top-card__job-insight', 'contains': 'Employment type'},
+            {'selector': '.description__job-criteria-item', 'contains': 'Employment type'},
+        ],
+        'posted_date_text': {'selector': '.jobs-unified-top-card__posted-date, .posted-time-ago__text'},
+    },
+}
+
+INDEED_SEARCH_SPEC: Dict[str, Any] = {
+    'source': 'indeed',
+    'kind': 'search',
+    'item': '.job_seen_beacon, .jobsearch-ResultsList .result',
+    'fields': {
+        'title': {'selector': 'h2.jobTitle, .jcs-JobTitle'},
+        'company': {'selector': '.companyName, .companyOverviewLink, [data-testid="company-name"]'},
+        'location': {'selector': '.companyLocation, [data-testid="text-location"]'},
+        'url': {'selector': 'h2.jobTitle a, a.jcs-JobTitle, .jcs-JobTitle a', 'attr': 'href'},
+        'job_key': {'selector': 'a[data-jk]', 'attr': 'data-jk'},
+        'salary': [
+            {'selector': '.salary-snippet-container'},
+            {'selector': '.metadataContainer .attribute', 'contains': '$'},
+        ],
+        'job_type': [
+            {'selector': '.metadata', 'contains': 'Full-time'},
+            {'selector': '.metadata', 'contains': 'Part-time'},
+        ],
+    },
+}
+
+INDEED_DETAIL_SPEC: Dict[str, Any] = {
+    'source': 'indeed',
+    'kind': 'detail',
+    'fields': {
+        'description': {'selector': '#jobDescriptionText, .jobsearch-JobComponent-description', 'multiline': True},
+    },
+}
+
+GLASSDOOR_SEARCH_SPEC: Dict[str, Any] = {
+    'source': 'glassdoor',
+    'kind': 'search',
+    'item': '.react-job-listing, .jobCard',
+    'fields': {
+        'title': {'selector': '.job-title, .jobTitle'},
+        'company': {'selector': '.employer-name, .jobEmployer'},
+        'location': {'selector': '.location, .jobLocation'},
+        'url': [
+            {'attr': 'href'},
+            {'selector': 'a', 'attr': 'href'},
+        ],
+        'listing_id': [
+            {'attr': 'data-id'},
+            {'attr': 'data-jobid'},
+        ],
+        'salary': [
+            {'selector': '.salary-estimate'},
+            {'selector': 'span', 'contains': '$'},
+        ],
+    },
+}
+
+GLASSDOOR_DETAIL_SPEC: Dict[str, Any] = {
+    'source': 'glassdoor',
+    'kind': 'detail',
+    'fields': {
+        'description': {'selector': '.jobDescriptionContent, .desc', 'multiline': True},
+        'job_type': {'selector': 'span', 'contains': 'Employment Type', 'next_sibling': True},
+    },
+}
+
+# Specs by platform and page kind, used to re-parse stored pages
+SELECTOR_SPECS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'linkedin': {'search': LINKEDIN_SEARCH_SPEC, 'detail': LINKEDIN_DETAIL_SPEC},
+    'indeed': {'search': INDEED_SEARCH_SPEC, 'detail': INDEED_DETAIL_SPEC},
+    'glassdoor': {'search': GLASSDOOR_SEARCH_SPEC, 'detail': GLASSDOOR_DETAIL_SPEC},
+}
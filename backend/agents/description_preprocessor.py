@@ -0,0 +1,270 @@
+"""
+Job description preprocessing for LLM prompts.
+
+Crawled descriptions are raw page text: LinkedIn and Glassdoor postings in
+particular carry benefits lists, "About us" sections and EEO statements that
+say nothing about the job's skills but can make up most of the prompt. Before
+a description goes to the LLM it is:
+
+1. normalized (whitespace collapsed, one paragraph per line),
+2. stripped of boilerplate sections (by heading) and sentences (by pattern),
+   plus paragraphs learned to be boilerplate because they keep appearing
+   in unrelated postings (a company's standard footer),
+3. deduplicated by paragraph,
+4. cut to a token budget, keeping paragraphs about skills, requirements and
+   responsibilities first.
+"""
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import re
+from collections import OrderedDict
+
+from core.config import settings
+
+
+# Section headings whose content is boilerplate
+BOILERPLATE_HEADINGS = (
+    'about us', 'about the company', 'about the team', 'who we are', 'our company', 'our story',
+    'our mission', 'our values', 'benefits', 'perks', 'what we offer', 'we offer', 'why join us',
+    'why work with us', 'compensation', 'salary', 'equal opportunity', 'eeo', 'diversity',
+    'accommodation', 'privacy', 'how to apply', 'disclaimer', 'legal',
+)
+
+# Section headings whose content carries the job's skills
+SKILL_HEADINGS = (
+    'requirements', 'qualifications', 'skills', 'responsibilities', 'what you will do',
+    "what you'll do", 'what you bring', 'you have', 'must have', 'nice to have', 'preferred',
+    'experience', 'the role', 'role', 'job description', 'tech stack', 'technologies',
+)
+
+# Sentences that are boilerplate wherever they appear
+BOILERPLATE_SENTENCES = re.compile(
+    r'[^.!?\n]*(?:equal opportunity employer|without regard to (?:race|age|gender)|'
+    r'reasonable accommodation|e-?verify|affirmative action|click apply|apply now|'
+    r'background check|drug[- ]free workplace)[^.!?\n]*[.!?]?',
+    re.IGNORECASE
+)
+
+# Words that mark a paragraph as skill-bearing
+SKILL_MARKERS = re.compile(
+    r'\b(?:experience|years?|proficien\w*|knowledge|familiar\w*|skills?|degree|'
+    r'required|requirements?|must|responsib\w*|you will|develop\w*|build\w*|design\w*)\b',
+    re.IGNORECASE
+)
+
+# Words of a heading line, to tell title-case headings from short list items
+HEADING_WORDS = re.compile(r"[A-Za-z][\w'-]*")
+
+# Smallest useful piece of a paragraph cut to fit the budget
+MIN_TRUNCATED_TOKENS = 16
+
+# Word, number or single punctuation character, the units the token estimate is built from
+TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text without a tokenizer.
+
+    Short words are one token and long words one token per four characters,
+    digits one token per three, punctuation one token each, which tracks
+    BPE tokenizers closely enough for prompt budgeting.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    tokens = 0
+    for piece in TOKEN_PIECES.findall(text):
+        if piece.isalpha():
+            tokens += 1 + (len(piece) - 1) // 4
+        elif piece.isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        else:
+            tokens += 1
+    return tokens
+
+
+def section_heading(paragraph: str) -> Optional[str]:
+    """
+    Get the normalized heading a paragraph starts with, if it is a heading line.
+    """
+    first_line = paragraph.split('\n', 1)[0].strip().replace('\u2019', "'").replace('\u2018', "'")
+    if len(first_line) > 60 or first_line.endswith(('.', '!', ',')):
+        return None
+    heading = first_line.rstrip(':?').strip().lower()
+    if not heading or (not first_line.endswith(':') and len(heading.split()) > 5):
+        return None
+    return heading
+
+
+def starts_section(paragraph: str) -> bool:
+    """
+    Whether a heading line starts a new section rather than being a short
+    list item: it ends with a colon or is in title case ("Your Day-to-Day",
+    not "Health insurance").
+    """
+    first_line = paragraph.split('\n', 1)[0].strip()
+    if first_line.endswith(':'):
+        return True
+    words = [word for word in HEADING_WORDS.findall(first_line.replace('\u2019', "'")) if len(word) > 3]
+    return bool(words) and all(word[0].isupper() for word in words)
+
+
+def heading_matches(heading: str, headings: Tuple[str, ...]) -> bool:
+    """
+    Whether a heading matches any of a list of known headings.
+    """
+    return any(heading == known or heading.startswith(known + ' ') for known in headings)
+
+
+class DescriptionPreprocessor:
+    """
+    Cleans job descriptions and fits them into a token budget.
+    """
+    def __init__(self, token_budget: int = 600, learn_threshold: int = 3, max_learned: int = 5000):
+        """
+        Initialize the preprocessor.
+
+        Args:
+            token_budget: Maximum estimated tokens of a preprocessed description
+            learn_threshold: Number of distinct descriptions a paragraph must appear in
+                to be treated as boilerplate
+            max_learned: Maximum number of paragraphs and descriptions remembered for learning
+        """
+        self.token_budget = token_budget
+        self.learn_threshold = learn_threshold
+        self.max_learned = max_learned
+        self.paragraph_counts: "OrderedDict[str, int]" = OrderedDict()
+        self.seen_descriptions: "OrderedDict[str, None]" = OrderedDict()
+
+    def preprocess(self, description: str, token_budget: Optional[int] = None) -> str:
+        """
+        Clean a description and cut it to the token budget.
+
+        Args:
+            description: Raw job description text
+            token_budget: Token budget, or None for the preprocessor's default
+
+        Returns:
+            Preprocessed description
+        """
+        budget = token_budget or self.token_budget
+        paragraphs = self._paragraphs(description)
+        self._learn(description, paragraphs)
+
+        kept: List[Tuple[str, bool]] = []
+        seen = set()
+        in_boilerplate = False
+        in_skills = False
+        for paragraph in paragraphs:
+            heading = section_heading(paragraph)
+            if heading is not None and heading_matches(heading, BOILERPLATE_HEADINGS):
+                in_boilerplate, in_skills = True, False
+                continue
+            if heading is not None and heading_matches(heading, SKILL_HEADINGS):
+                in_boilerplate, in_skills = False, True
+            elif heading is not None and in_boilerplate and starts_section(paragraph):
+                # Any other section ends the boilerplate one
+                in_boilerplate = False
+            if in_boilerplate and not SKILL_MARKERS.search(paragraph):
+                continue
+            if self._is_learned_boilerplate(paragraph):
+                continue
+
+            paragraph = BOILERPLATE_SENTENCES.sub('', paragraph).strip()
+            key = paragraph.lower()
+            if not paragraph or key in seen:
+                continue
+            seen.add(key)
+            kept.append((paragraph, in_skills or bool(SKILL_MARKERS.search(paragraph))))
+
+        return self._fit(kept, budget)
+
+    def _paragraphs(self, description: str) -> List[str]:
+        """
+        Split a description into whitespace-normalized paragraphs.
+        """
+        lines = (re.sub(r'[^\S\n]+', ' ', line).strip() for line in re.split(r'\r\n|\r|\n', description))
+        return [line for line in lines if line]
+
+    def _hash(self, text: str) -> str:
+        """
+        Short hash of a normalized text.
+        """
+        return hashlib.sha1(text.lower().encode('utf-8')).hexdigest()[:16]
+
+    def _learn(self, description: str, paragraphs: List[str]) -> None:
+        """
+        Count the paragraphs of a description not seen before.
+        """
+        description_hash = self._hash(description)
+        if description_hash in self.seen_descriptions:
+            return
+        self.seen_descriptions[description_hash] = None
+        if len(self.seen_descriptions) > self.max_learned:
+            self.seen_descriptions.popitem(last=False)
+
+        for paragraph_hash in {self._hash(p) for p in paragraphs if len(p) >= 80}:
+            self.paragraph_counts[paragraph_hash] = self.paragraph_counts.get(paragraph_hash, 0) + 1
+            self.paragraph_counts.move_to_end(paragraph_hash)
+        while len(self.paragraph_counts) > self.max_learned:
+            self.paragraph_counts.popitem(last=False)
+
+    def _is_learned_boilerplate(self, paragraph: str) -> bool:
+        """
+        Whether a paragraph keeps appearing across different descriptions.
+
+        Skill-bearing paragraphs are never dropped this way, since postings
+        for the same role at one company legitimately share requirements.
+        """
+        if len(paragraph) < 80 or SKILL_MARKERS.search(paragraph):
+            return False
+        return self.paragraph_counts.get(self._hash(paragraph), 0) >= self.learn_threshold
+
+    def _fit(self, paragraphs: List[Tuple[str, bool]], budget: int) -> str:
+        """
+        Keep as many paragraphs as fit the budget, skill-bearing ones first, in original order.
+        """
+        costs = [estimate_tokens(paragraph) for paragraph, _ in paragraphs]
+        if sum(costs) <= budget:
+            return '\n'.join(paragraph for paragraph, _ in paragraphs)
+
+        order = sorted(range(len(paragraphs)), key=lambda i: (not paragraphs[i][1], i))
+        chosen: Dict[int, str] = {}
+        remaining = budget
+        for index in order:
+            if remaining <= 0:
+                break
+            if costs[index] <= remaining:
+                chosen[index] = paragraphs[index][0]
+                remaining -= costs[index]
+            elif paragraphs[index][1] and remaining >= MIN_TRUNCATED_TOKENS:
+                # Cut the first skill-bearing paragraph that does not fit, then stop
+                chosen[index] = self._truncate(paragraphs[index][0], remaining)
+                remaining = 0
+        return '\n'.join(chosen[index] for index in sorted(chosen))
+
+    def _truncate(self, text: str, budget: int) -> str:
+        """
+        Cut a text to a token budget at a word boundary.
+        """
+        words = text.split(' ')
+        kept = []
+        used = 0
+        for word in words:
+            cost = estimate_tokens(word) + 1
+            if used + cost > budget:
+                break
+            kept.append(word)
+            used += cost
+        return ' '.join(kept)
+
+
+# Create a global description preprocessor instance
+description_preprocessor = DescriptionPreprocessor(
+    settings.DESCRIPTION_TOKEN_BUDGET,
+    settings.DESCRIPTION_BOILERPLATE_THRESHOLD
+)
@@ -1,16 +1,31 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import asyncio
 import sys
 import os
 
+from pydantic import ValidationError
+
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from services.llm_service import groq_service, LLMServiceError
+from services.llm_scheduler import PRIORITY_BACKGROUND
+from services.llm_schemas import JobAnalysisSchema, BatchAnalysisSchema, BatchJobAnalysisSchema
+from core.config import settings
 from core.logging import get_logger
+from core.metrics import LLM_CACHE
+from .description_preprocessor import description_preprocessor, estimate_tokens
+from .keyword_graph import keyword_graph
 
 # Get logger
 logger = get_logger(__name__)
 
+# Completion tokens to allow per job in a batch response
+TOKENS_PER_ANALYSIS = 300
+
+# Related keywords to take from the LLM (the prompt asks for 10-15)
+MAX_RELATED_KEYWORDS = 15
+
 class JobAnalysisAgent:
     def __init__(self, groq_api_key: str = None):
         """
@@ -28,7 +43,7 @@ class JobAnalysisAgent:
 
     async def analyze_keywords(self, keywords: List[str]) -> List[str]:
         """
-        Analyze keywords using Groq API.
+        Analyze keywords using the keyword graph, and Groq API for keywords it does not know.
         
         Args:
             keywords: List of keywords to analyze
@@ -40,11 +55,45 @@ class JobAnalysisAgent:
             LLMServiceError: If there's an error with the LLM service
         """
         logger.info(f"Analyzing keywords: {keywords}")
+        if not settings.KEYWORD_GRAPH_ENABLED:
+            return await self._expand_keywords(keywords)
+        
+        enhanced, unseen = keyword_graph.expand(keywords)
+        if not unseen:
+            LLM_CACHE.inc(call='keywords', result='hit')
+            return enhanced
+        
+        # Only the keywords the graph does not know go to the LLM, each on its own so
+        # that its answer can be folded into the graph as that keyword's neighbors
+        LLM_CACHE.inc(call='keywords', result='miss')
+        expansions = await asyncio.gather(*(self._expand_keywords([keyword]) for keyword in unseen))
+        await keyword_graph.add_expansions(dict(zip(unseen, expansions)))
+        
+        seen = {keyword.lower() for keyword in enhanced}
+        for related in expansions:
+            for term in related:
+                if term.lower() not in seen:
+                    enhanced.append(term)
+                    seen.add(term.lower())
+        return enhanced
+
+    async def _expand_keywords(self, keywords: List[str]) -> List[str]:
+        """
+        Ask Groq API for keywords related to a keyword set.
+        
+        Args:
+            keywords: List of keywords to expand
+            
+        Returns:
+            List of enhanced keywords
+            
+        Raises:
+            LLMServiceError: If there's an error with the LLM service
+        """
         prompt = self._create_keyword_analysis_prompt(keywords)
         
-        # Call Groq API and extract list content
-        response = await self.groq_service.generate_completion(prompt)
-        return self.groq_service.extract_list_content(response)
+        # Call Groq API, stopping once the list is complete
+        return await self.groq_service.generate_list(prompt, limit=MAX_RELATED_KEYWORDS)
 
     async def categorize_job(self, description: str) -> Dict[str, Any]:
         """
@@ -60,11 +109,131 @@ class JobAnalysisAgent:
             LLMServiceError: If there's an error with the LLM service
         """
         logger.info("Categorizing job description")
-        prompt = self._create_job_analysis_prompt(description)
+        prompt = self._create_job_analysis_prompt(description_preprocessor.preprocess(description))
         
-        # Call Groq API and extract JSON content
-        response = await self.groq_service.generate_completion(prompt)
-        return self.groq_service.extract_json_content(response)
+        # Call Groq API, stopping once the JSON object is complete
+        return await self.groq_service.generate_json(prompt, JobAnalysisSchema, priority=PRIORITY_BACKGROUND)
+
+    async def categorize_jobs(self, descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Categorize several job descriptions with as few Groq requests as possible.
+        
+        Descriptions are preprocessed (boilerplate removed, cut to
+        DESCRIPTION_TOKEN_BUDGET tokens) and packed into batches of at most CATEGORIZATION_BATCH_SIZE jobs and
+        CATEGORIZATION_BATCH_TOKENS prompt tokens. Jobs a batch response does
+        not cover (or a malformed batch response) are categorized one by one.
+        
+        Args:
+            descriptions: Job descriptions to categorize
+            
+        Returns:
+            Dictionary with job categories for each description, in order
+            (empty if the description could not be categorized)
+        """
+        if not descriptions:
+            return []
+        if settings.CATEGORIZATION_BATCH_SIZE <= 1:
+            return list(await asyncio.gather(*(self._categorize_one(d) for d in descriptions)))
+        
+        preprocessed = [description_preprocessor.preprocess(d) for d in descriptions]
+        batches = self._make_batches(preprocessed)
+        logger.info(f"Categorizing {len(descriptions)} job descriptions in {len(batches)} batches")
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(descriptions)
+        batch_results = await asyncio.gather(*(self._categorize_batch(batch, descriptions, preprocessed) for batch in batches))
+        for batch_result in batch_results:
+            for index, analysis in batch_result.items():
+                results[index] = analysis
+        
+        # Fall back to single requests for jobs the batches did not cover
+        missing = [index for index, analysis in enumerate(results) if analysis is None]
+        if missing:
+            logger.warning(f"Categorizing {len(missing)} jobs individually after incomplete batch responses")
+            fallbacks = await asyncio.gather(*(self._categorize_one(descriptions[index]) for index in missing))
+            for index, analysis in zip(missing, fallbacks):
+                results[index] = analysis
+        return results
+
+    def _make_batches(self, descriptions: List[str]) -> List[List[int]]:
+        """
+        Group descriptions into batches within the size and token limits.
+        
+        Args:
+            descriptions: Preprocessed job descriptions
+            
+        Returns:
+            List of batches, each a list of description indexes
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index, description in enumerate(descriptions):
+            tokens = estimate_tokens(description)
+            if current and (len(current) >= settings.CATEGORIZATION_BATCH_SIZE
+                            or current_tokens + tokens > settings.CATEGORIZATION_BATCH_TOKENS):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _categorize_batch(
+        self,
+        batch: List[int],
+        descriptions: List[str],
+        preprocessed: List[str]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Categorize one batch of descriptions in a single Groq request.
+        
+        Args:
+            batch: Indexes of the descriptions in the batch
+            descriptions: All job descriptions
+            preprocessed: All job descriptions after preprocessing
+            
+        Returns:
+            Dictionary of description index to job categories, for the jobs
+            the response covered (empty if the response was malformed)
+        """
+        if len(batch) == 1:
+            analysis = await self._categorize_one(descriptions[batch[0]])
+            return {batch[0]: analysis} if analysis else {}
+        
+        prompt = self._create_batch_analysis_prompt({str(index): preprocessed[index] for index in batch})
+        try:
+            content = await self.groq_service.generate_json(
+                prompt,
+                BatchAnalysisSchema,
+                max_tokens=TOKENS_PER_ANALYSIS * len(batch) + 200,
+                priority=PRIORITY_BACKGROUND
+            )
+        except LLMServiceError as e:
+            logger.warning(f"Batch categorization failed: {e}")
+            return {}
+        
+        # Jobs that do not fit the schema are left for one-by-one categorization
+        results = {}
+        for analysis in content["jobs"]:
+            try:
+                analysis = BatchJobAnalysisSchema.model_validate(analysis).model_dump()
+            except ValidationError:
+                continue
+            job_id = analysis.pop("id")
+            if job_id.isdigit() and int(job_id) in batch:
+                results[int(job_id)] = analysis
+        return results
+
+    async def _categorize_one(self, description: str) -> Dict[str, Any]:
+        """
+        Categorize a single description, returning an empty result on LLM errors.
+        """
+        try:
+            return await self.categorize_job(description)
+        except LLMServiceError as e:
+            logger.error(f"Error categorizing job description: {e}")
+            return {}
 
     def _create_keyword_analysis_prompt(self, keywords: List[str]) -> str:
         """
@@ -103,13 +272,42 @@ class JobAnalysisAgent:
         """
         return f"""
         Analyze this job description and extract:
-        1. Required skills (technical and soft)
-        2. Experience level (junior, mid, senior)
-        3. Job category (e.g., frontend, backend, fullstack)
-        4. Key responsibilities
-        5. Nice-to-have skills
+        1. required_skills: required skills, technical and soft (list of strings)
+        2. experience_level: experience level, one of junior, mid, senior (string)
+        3. job_category: job category, e.g. frontend, backend, fullstack (string)
+        4. key_responsibilities: key responsibilities (list of strings)
+        5. nice_to_have_skills: nice-to-have skills (list of strings)
 
         Description: {description}
         
-        Format: Return as a JSON object with these fields.
-        """
\ No newline at end of file
+        Format: Return a JSON object with exactly these keys: "required_skills", "experience_level",
+        "job_category", "key_responsibilities", "nice_to_have_skills". Return only the JSON object.
+        """
+
+    def _create_batch_analysis_prompt(self, descriptions: Dict[str, str]) -> str:
+        """
+        Create prompt for analyzing several jobs at once.
+        
+        Args:
+            descriptions: Job descriptions keyed by job ID
+            
+        Returns:
+            Prompt string
+        """
+        jobs = "\n\n".join(f"[job {job_id}]\n{description}" for job_id, description in descriptions.items())
+        return f"""
+        Analyze each of these job descriptions and extract:
+        1. required_skills: required skills, technical and soft (list of strings)
+        2. experience_level: experience level, one of junior, mid, senior (string)
+        3. job_category: job category, e.g. frontend, backend, fullstack (string)
+        4. key_responsibilities: key responsibilities (list of strings)
+        5. nice_to_have_skills: nice-to-have skills (list of strings)
+
+        Each description starts with a line [job ID].
+
+        {jobs}
+        
+        Format: Return a JSON object {{"jobs": [...]}} with one object per job, each with exactly these keys:
+        "id" (the job ID), "required_skills", "experience_level", "job_category", "key_responsibilities",
+        "nice_to_have_skills". Return only the JSON object.
+        """
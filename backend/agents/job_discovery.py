@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 import time
 import sys
 import os
@@ -16,11 +16,19 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from core.config import settings
 from core.logging import get_logger
+from core.metrics import JOB_ANALYSES
+from core.tracing import tracer
 from services.llm_service import groq_service
 from services.llm_service import groq_service
+from services.llm_scheduler import llm_priority, PRIORITY_CRITICAL
 from .job_analysis_agent import JobAnalysisAgent
 from .search_strategy_agent import SearchStrategyAgent
-from .crawlers import LinkedInCrawler, NaukriCrawler
+from .strategy_planner import LocalStrategyPlanner, region_platforms
+from .local_job_analyzer import local_job_analyzer
+from .keyword_graph import keyword_graph
+from .platform_performance import platform_performance_tracker, expected_jobs_per_second
+from .platform_bandit import platform_bandit, query_category
+from .crawlers import LinkedInAiohttpCrawler, NaukriCrawler
 from .crawlers.indeed_crawler import IndeedCrawler
 from .crawlers.glassdoor_crawler import GlassdoorCrawler
 
@@ -31,6 +39,10 @@ if sys.platform == 'win32':
 # Get logger
 logger = get_logger(__name__)
 
+# Share of the raw keywords that must survive keyword analysis for a
+# speculative crawl to stand in for the planned crawl of its platform
+SPECULATIVE_KEYWORD_OVERLAP = 0.5
+
 
 class JobDiscoveryAgent:
     """
@@ -53,27 +65,36 @@ class JobDiscoveryAgent:
             
         self.job_analyzer = JobAnalysisAgent(groq_api_key)
         self.strategy_agent = SearchStrategyAgent(groq_api_key)
+        self.strategy_planner = LocalStrategyPlanner(
+            self.strategy_agent,
+            settings.STRATEGY_PLAN_CACHE_SIZE,
+            settings.STRATEGY_PLAN_TTL_SECONDS
+        )
         
         # Initialize crawlers
         self.crawlers = {
-            'linkedin': LinkedInCrawler(),
+            'linkedin': LinkedInAiohttpCrawler(),
             'naukri': NaukriCrawler(),
             'indeed': IndeedCrawler(),
             'glassdoor': GlassdoorCrawler(),
         }
         
-        # Default platform performance metrics
-        self.platform_performance = {
-            'linkedin': {'success_rate': 0.9, 'avg_results': 15, 'avg_time': 10},
-            'indeed': {'success_rate': 0.8, 'avg_results': 20, 'avg_time': 12},
-            'naukri': {'success_rate': 0.7, 'avg_results': 10, 'avg_time': 8},
-            'glassdoor': {'success_rate': 0.6, 'avg_results': 12, 'avg_time': 15},
-        }
+        # Rolling platform performance, updated by every crawl
+        self.performance_tracker = platform_performance_tracker
+        self.bandit = platform_bandit
+
+    @property
+    def platform_performance(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current performance metrics of each platform.
+        """
+        return self.performance_tracker.snapshot()
 
     async def search_jobs(
         self, 
         keywords: List[str], 
         location: str,
+        progress: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for jobs across multiple platforms in real-time.
@@ -81,6 +102,8 @@ class JobDiscoveryAgent:
         Args:
             keywords: List of search keywords
             location: Job location
+            progress: Coroutine function called with the current stage ('crawling'
+                or 'analyzing') and the jobs found so far, for partial results
             
         Returns:
             List of job dictionaries
@@ -88,43 +111,92 @@ class JobDiscoveryAgent:
         # Start timing the search
         start_time = time.time()
         
-        # Get enhanced keywords using Groq
-        enhanced_keywords = await self.job_analyzer.analyze_keywords(keywords)
-        logger.info(f"Enhanced keywords: {enhanced_keywords}")
+        # Start crawling the best platforms with the raw keywords while the LLM plans
+        category = query_category(keywords)
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        speculative = {}
+        speculative_limits: Dict[str, Optional[int]] = {}
+        speculative_outcomes: Dict[str, Dict[str, Any]] = {}
+        if settings.SPECULATIVE_CRAWL:
+            speculative, speculative_limits, speculative_outcomes = self._start_speculative_crawls(
+                category, keywords, location, outcomes
+            )
         
-        # Get optimal search strategy based on default performance metrics
-        search_strategy = await self.strategy_agent.optimize_search_strategy(
-            enhanced_keywords, 
-            location,
-            self.platform_performance
-        )
+        try:
+            # Keyword and strategy calls are on the critical path: schedule them ahead of categorizations
+            with llm_priority(PRIORITY_CRITICAL):
+                enhanced_keywords, search_strategy = await self._plan_search(keywords, location)
+        except BaseException:
+            for task in speculative.values():
+                task.cancel()
+            raise
+        
+        # Let the bandit choose platforms and detail budgets, with the LLM plan as its prior.
+        # Speculative crawls already hold part of the detail budget.
+        if settings.PLATFORM_BANDIT_ENABLED:
+            speculative_details = sum(limit for limit in speculative_limits.values() if limit is not None)
+            detail_budget = max(settings.CRAWLER_DETAIL_BUDGET - speculative_details, 0)
+            search_strategy = self._apply_bandit(category, location, search_strategy, detail_budget)
+        
+        if speculative:
+            kept = self._reconcile_speculative_crawls(speculative, keywords, enhanced_keywords, search_strategy)
+            # Detail fetches the cancelled crawls did not make go back to the planned crawls
+            unspent = sum(
+                max(limit - speculative_outcomes[source].get('details', 0), 0)
+                for source, limit in speculative_limits.items()
+                if source not in kept and limit is not None
+            )
+            search_strategy = self._credit_detail_budget(search_strategy, kept, unspent)
+            speculative = kept
         logger.info(f"Search strategy: {search_strategy}")
         
         # Execute search based on strategy
-        jobs = await self._execute_search(enhanced_keywords, location, search_strategy)
+        if progress:
+            await progress('crawling', [])
+        with tracer.span('job_discovery.crawl', category=category, speculative=len(speculative)) as span:
+            jobs = await self._execute_search(
+                enhanced_keywords, location, search_strategy, category, speculative, outcomes, progress
+            )
+            if span:
+                span.set_attribute('jobs', len(jobs))
         logger.info(f"Found {len(jobs)} jobs from crawlers")
         
         # Remove duplicates by URL
-        unique_jobs = {}
-        for job in jobs:
-            job_id = job.get('url')
-            if job_id and job_id not in unique_jobs:
-                unique_jobs[job_id] = job
-        
-        # Convert back to list
-        unique_jobs_list = list(unique_jobs.values())
-        
-        # Analyze and categorize jobs (limit to 10 for performance)
-        analyzed_jobs = []
-        for job in unique_jobs_list[:10]:
-            if job.get('description'):
-                job_analysis = await self.job_analyzer.categorize_job(job['description'])
-                analyzed_jobs.append({**job, 'analysis': job_analysis})
-            else:
-                analyzed_jobs.append(job)
+        with tracer.span('job_discovery.dedup', jobs=len(jobs)):
+            unique_jobs = {}
+            for job in jobs:
+                job_id = job.get('url')
+                if job_id and job_id not in unique_jobs:
+                    unique_jobs[job_id] = job
+            
+            # Convert back to list
+            unique_jobs_list = list(unique_jobs.values())
+        if progress:
+            await progress('analyzing', unique_jobs_list)
         
-        # Add remaining jobs without analysis
-        analyzed_jobs.extend(unique_jobs_list[10:])
+        # Analyze and categorize jobs
+        with tracer.span('job_discovery.categorization'):
+            if settings.LOCAL_ANALYSIS_ENABLED:
+                analyzed_jobs = await self._analyze_jobs(unique_jobs_list)
+            else:
+                # Limit LLM categorization to 10 jobs for performance
+                analyzed_jobs = []
+                described = [job for job in unique_jobs_list[:10] if job.get('description')]
+                analyses = await self.job_analyzer.categorize_jobs([job['description'] for job in described])
+                analysis_by_job = {id(job): analysis for job, analysis in zip(described, analyses)}
+                for job in unique_jobs_list[:10]:
+                    if id(job) in analysis_by_job:
+                        analyzed_jobs.append({**job, 'analysis': analysis_by_job[id(job)]})
+                    else:
+                        analyzed_jobs.append(job)
+                
+                # Add remaining jobs without analysis
+                analyzed_jobs.extend(unique_jobs_list[10:])
+            
+            # Grow the keyword expansion graph from the analyzed jobs
+            for job in analyzed_jobs:
+                if job.get('analysis'):
+                    await keyword_graph.add_job(job.get('title') or '', job['analysis'])
         
         # Log search time
         search_time = time.time() - start_time
@@ -132,11 +204,256 @@ class JobDiscoveryAgent:
         
         return analyzed_jobs
 
+    async def _analyze_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Analyze every job locally and send only the uncertain ones to the LLM.
+        
+        Jobs whose local analysis has a confidence below LOCAL_ANALYSIS_MIN_CONFIDENCE
+        and that have a description are categorized by the LLM, at most
+        LOCAL_ANALYSIS_MAX_ESCALATIONS per search. If the LLM fails, the local
+        analysis is kept.
+        
+        Args:
+            jobs: Deduplicated jobs
+            
+        Returns:
+            Jobs with an 'analysis' entry each
+        """
+        analyses = [
+            local_job_analyzer.analyze(job.get('title') or '', job.get('description') or '')
+            for job in jobs
+        ]
+        escalated = [
+            index for index, (job, analysis) in enumerate(zip(jobs, analyses))
+            if job.get('description') and analysis['confidence'] < settings.LOCAL_ANALYSIS_MIN_CONFIDENCE
+        ][:settings.LOCAL_ANALYSIS_MAX_ESCALATIONS]
+        
+        if escalated:
+            llm_analyses = await self.job_analyzer.categorize_jobs([jobs[index]['description'] for index in escalated])
+            for index, analysis in zip(escalated, llm_analyses):
+                if analysis:
+                    analyses[index] = {**analysis, 'analysis_source': 'llm'}
+        
+        for analysis in analyses:
+            JOB_ANALYSES.inc(source=analysis.get('analysis_source', 'llm'))
+        logger.info(f"Analyzed {len(jobs)} jobs locally, {len(escalated)} escalated to the LLM")
+        return [{**job, 'analysis': analysis} for job, analysis in zip(jobs, analyses)]
+
+    async def _plan_search(self, keywords: List[str], location: str) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Enhance the keywords and plan the search with the configured planner.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            
+        Returns:
+            Tuple of (enhanced keywords, search strategy)
+        """
+        if settings.STRATEGY_PLANNER == "combined":
+            # Enhance keywords and plan the search in a single Groq call
+            with tracer.span('job_discovery.plan', keywords=len(keywords)):
+                enhanced_keywords, search_strategy = await self.strategy_agent.analyze_and_plan(
+                    keywords,
+                    location,
+                    self.platform_performance
+                )
+            logger.info(f"Enhanced keywords: {enhanced_keywords}")
+            return enhanced_keywords, search_strategy
+        
+        # Get enhanced keywords using Groq
+        with tracer.span('job_discovery.keyword_analysis', keywords=len(keywords)):
+            enhanced_keywords = await self.job_analyzer.analyze_keywords(keywords)
+        logger.info(f"Enhanced keywords: {enhanced_keywords}")
+        
+        # Get optimal search strategy based on recent platform performance
+        with tracer.span('job_discovery.strategy', planner=settings.STRATEGY_PLANNER):
+            if settings.STRATEGY_PLANNER == "local":
+                # Rules now, LLM plan cached in the background for the next search
+                search_strategy = self.strategy_planner.plan(
+                    enhanced_keywords,
+                    location,
+                    list(self.crawlers.keys()),
+                    self.platform_performance
+                )
+            else:
+                search_strategy = await self.strategy_agent.optimize_search_strategy(
+                    enhanced_keywords, 
+                    location,
+                    self.platform_performance
+                )
+        return enhanced_keywords, search_strategy
+
+    def _start_speculative_crawls(
+        self,
+        category: str,
+        keywords: List[str],
+        location: str,
+        outcomes: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, asyncio.Task], Dict[str, Optional[int]], Dict[str, Dict[str, Any]]]:
+        """
+        Start crawling the historically best platforms with the raw keywords.
+        
+        Args:
+            category: Query category
+            keywords: Keywords as entered by the user
+            location: Job location
+            outcomes: Dictionary the crawls store their success and duration in
+            
+        Returns:
+            Tuple of (dictionary of platform to running crawl task,
+            detail fetches each crawl may use out of CRAWLER_DETAIL_BUDGET (None if unlimited),
+            outcome dictionary of each crawl, with its detail requests so far)
+        """
+        count = settings.SPECULATIVE_CRAWL_PLATFORMS
+        # No plan yet, but boards of other regions can be ruled out already
+        candidates = region_platforms(location, list(self.crawlers.keys()))
+        if settings.PLATFORM_BANDIT_ENABLED:
+            # No LLM plan yet, so the bandit goes on history alone. The crawls get
+            # their platforms' share of the detail budget; the planned crawls get the rest.
+            max_platforms = max(settings.PLATFORM_BANDIT_MAX_PLATFORMS, count, 1)
+            limits = self.bandit.plan(
+                category, candidates, [], count, settings.CRAWLER_DETAIL_BUDGET * count // max_platforms
+            )
+        else:
+            performance = self.platform_performance
+            ranked = sorted(
+                candidates,
+                key=lambda p: expected_jobs_per_second(performance.get(p, {})),
+                reverse=True
+            )
+            limits = {platform: None for platform in ranked[:count]}
+        
+        tasks = {}
+        crawl_outcomes = {}
+        for source, detail_limit in limits.items():
+            logger.info(f"Starting speculative search on {source}")
+            crawl_outcomes[source] = {}
+            tasks[source] = asyncio.create_task(self._search_platform(
+                source, self.crawlers[source], keywords, location, detail_limit, outcomes, crawl_outcomes[source]
+            ))
+        return tasks, limits, crawl_outcomes
+
+    def _reconcile_speculative_crawls(
+        self,
+        speculative: Dict[str, asyncio.Task],
+        raw_keywords: List[str],
+        enhanced_keywords: List[str],
+        strategy: Dict[str, Any]
+    ) -> Dict[str, asyncio.Task]:
+        """
+        Decide which speculative crawls to keep once the strategy is known.
+        
+        A speculative crawl of a planned platform stands in for the planned
+        crawl when most raw keywords survived keyword analysis; if the LLM
+        rewrote the query, it is cancelled and the platform crawled again.
+        Crawls of platforms the strategy left out are kept only if finished.
+        
+        Args:
+            speculative: Dictionary of platform to speculative crawl task
+            raw_keywords: Keywords as entered by the user
+            enhanced_keywords: Keywords from keyword analysis
+            strategy: Final search strategy
+            
+        Returns:
+            Dictionary of platform to speculative crawl task to merge
+        """
+        raw_terms = {keyword.strip().lower() for keyword in raw_keywords if keyword.strip()}
+        kept_terms = raw_terms & {keyword.strip().lower() for keyword in enhanced_keywords}
+        query_kept = len(kept_terms) >= SPECULATIVE_KEYWORD_OVERLAP * len(raw_terms)
+        planned = set(strategy.get("platforms", []))
+        
+        kept = {}
+        for source, task in speculative.items():
+            if source in planned and query_kept:
+                kept[source] = task
+            elif source not in planned and task.done() and not task.cancelled():
+                kept[source] = task
+            else:
+                logger.info(f"Cancelling speculative search on {source}")
+                task.cancel()
+        return kept
+
+    def _credit_detail_budget(
+        self,
+        strategy: Dict[str, Any],
+        speculative: Dict[str, asyncio.Task],
+        credit: int
+    ) -> Dict[str, Any]:
+        """
+        Share detail fetches among the planned crawls that will run.
+        
+        Args:
+            strategy: Search strategy with a detail_limit for each platform
+            speculative: Speculative crawls standing in for planned crawls
+            credit: Detail fetches to share
+            
+        Returns:
+            Strategy with the credit added to the detail limits of the new crawls
+        """
+        platforms = [
+            platform for platform in strategy.get("platforms", [])
+            if platform not in speculative and strategy.get(platform, {}).get("detail_limit") is not None
+        ]
+        if credit <= 0 or not platforms:
+            return strategy
+        
+        credited = dict(strategy)
+        share, extra = divmod(credit, len(platforms))
+        for index, platform in enumerate(platforms):
+            limit = strategy[platform]["detail_limit"] + share + (1 if index < extra else 0)
+            credited[platform] = {**strategy[platform], "detail_limit": limit}
+        return credited
+
+    def _apply_bandit(
+        self,
+        category: str,
+        location: str,
+        strategy: Dict[str, Any],
+        detail_budget: int
+    ) -> Dict[str, Any]:
+        """
+        Let the bandit choose among the platforms of a strategy.
+        
+        Only the strategy's platforms are candidates, so the bandit ranks
+        them and splits the detail budget but never brings back a platform
+        the plan left out (such as a regional board outside its region).
+        
+        Args:
+            category: Query category
+            location: Job location
+            strategy: Search strategy from the strategy agent
+            detail_budget: Detail fetches to share among the chosen platforms
+            
+        Returns:
+            Strategy crawling the chosen platforms, each with a detail_limit
+        """
+        planned_platforms = [p for p in strategy.get("platforms", []) if p in self.crawlers]
+        limits = self.bandit.plan(
+            category,
+            region_platforms(location, planned_platforms),
+            strategy.get("platforms", []),
+            settings.PLATFORM_BANDIT_MAX_PLATFORMS,
+            detail_budget
+        )
+        if not limits:
+            return strategy
+        
+        planned = {key: value for key, value in strategy.items() if key not in strategy.get("platforms", [])}
+        planned["platforms"] = list(limits.keys())
+        for priority, (platform, limit) in enumerate(limits.items(), 1):
+            planned[platform] = {**strategy.get(platform, {}), "priority": priority, "detail_limit": limit}
+        return planned
+
     async def _execute_search(
         self, 
         keywords: List[str], 
         location: str, 
-        strategy: Dict[str, Any]
+        strategy: Dict[str, Any],
+        category: Optional[str] = None,
+        speculative: Optional[Dict[str, asyncio.Task]] = None,
+        outcomes: Optional[Dict[str, Dict[str, Any]]] = None,
+        progress: Optional[Callable[[str, List[Dict[str, Any]]], Awaitable[None]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute job search across multiple platforms.
@@ -145,19 +462,34 @@ class JobDiscoveryAgent:
             keywords: List of search keywords
             location: Job location
             strategy: Search strategy
+            category: Query category to credit the bandit under, if any
+            speculative: Running crawl tasks to merge, used instead of new crawls of their platforms
+            outcomes: Dictionary the speculative crawls store their success and duration in
+            progress: Coroutine function called with the jobs found after each batch of crawls
             
         Returns:
             List of job dictionaries
         """
         all_jobs = []
         tasks = []
+        speculative = speculative or {}
+        outcomes = outcomes if outcomes is not None else {}
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        
+        # Merge speculative crawls first; they are already running
+        for source, task in speculative.items():
+            logger.info(f"Merging speculative search on {source}")
+            tasks.append((source, task))
         
         # Create tasks for crawler-based platforms
         for source in strategy.get("platforms", []):
+            if source in speculative:
+                continue
             if crawler := self.crawlers.get(source):
                 logger.info(f"Creating search task for {source}")
+                detail_limit = (strategy.get(source) or {}).get("detail_limit")
                 # Create coroutine but don't schedule it yet
-                coro = crawler.search(keywords, location)
+                coro = self._search_platform(source, crawler, keywords, location, detail_limit, outcomes)
                 tasks.append((source, coro))
         
         if not tasks:
@@ -172,7 +504,7 @@ class JobDiscoveryAgent:
             # Process tasks in batches to limit concurrency
             for i in range(0, len(tasks), max_concurrent):
                 batch = tasks[i:i+max_concurrent]
-                batch_tasks = [asyncio.create_task(coro) for _, coro in batch]
+                batch_tasks = [asyncio.ensure_future(coro) for _, coro in batch]
                 batch_sources = [source for source, _ in batch]
                 
                 # Wait for all tasks in this batch to complete
@@ -190,22 +522,126 @@ class JobDiscoveryAgent:
                         logger.info(f"Found {job_count} jobs from {source}")
                         if job_count > 0:
                             all_jobs.extend(result)
+                            results[source] = result
+                if progress:
+                    await progress('crawling', all_jobs)
         except Exception as e:
             logger.error(f"Error executing search tasks: {e}")
             import traceback
             logger.error(traceback.format_exc())
         
+        if category and settings.PLATFORM_BANDIT_ENABLED:
+            self._reward_bandit(category, [source for source, _ in tasks], results, outcomes)
+        
         logger.info(f"Total jobs found across all platforms: {len(all_jobs)}")
         return all_jobs
     
+    def _reward_bandit(
+        self,
+        category: str,
+        sources: List[str],
+        results: Dict[str, List[Dict[str, Any]]],
+        outcomes: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """
+        Credit each crawled platform with the unique jobs it found.
+        
+        Jobs are counted for the first platform, in strategy order, that
+        returned their URL.
+        
+        Args:
+            category: Query category
+            sources: Crawled platforms in strategy order
+            results: Jobs returned by each platform
+            outcomes: Success and duration of each platform's search
+        """
+        seen_urls = set()
+        for source in sources:
+            outcome = outcomes.get(source)
+            if outcome is None:
+                continue
+            unique_jobs = 0
+            for job in results.get(source, []):
+                url = job.get('url')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    unique_jobs += 1
+            self.bandit.record(category, source, outcome['success'], unique_jobs, outcome['seconds'])
+    
+    async def _search_platform(
+        self,
+        source: str,
+        crawler: Any,
+        keywords: List[str],
+        location: str,
+        detail_limit: Optional[int] = None,
+        outcomes: Optional[Dict[str, Dict[str, Any]]] = None,
+        crawl_outcome: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search one platform inside a tracing span and record its performance.
+        
+        Crawlers report failures in the outcome dictionary passed to search()
+        rather than raising; the crawler's own error_count is shared with
+        concurrent searches and says nothing about this one.
+        
+        Args:
+            source: Platform name
+            crawler: Crawler for the platform
+            keywords: List of search keywords
+            location: Job location
+            detail_limit: Maximum number of job detail fetches, or None for the crawler default
+            outcomes: Dictionary to store the search's success and duration in, by platform
+            crawl_outcome: Outcome dictionary to pass to the crawler, for the caller to follow its detail requests
+            
+        Returns:
+            List of job dictionaries
+        """
+        started = time.time()
+        crawl_outcome = {} if crawl_outcome is None else crawl_outcome
+        jobs = []
+        success = False
+        cancelled = False
+        with tracer.span('crawler.search', platform=source, detail_limit=detail_limit or 0) as span:
+            try:
+                jobs = await crawler.search(keywords, location, detail_limit=detail_limit, outcome=crawl_outcome)
+                if not isinstance(jobs, list):
+                    jobs = []
+                success = crawl_outcome.get('success', True)
+                if span:
+                    span.set_attribute('jobs', len(jobs))
+                return jobs
+            except asyncio.CancelledError:
+                # A cancelled speculative crawl says nothing about the platform
+                cancelled = True
+                raise
+            finally:
+                if not cancelled:
+                    seconds = time.time() - started
+                    self.performance_tracker.record(source, success, len(jobs), seconds)
+                    if outcomes is not None:
+                        outcomes[source] = {'success': success, 'seconds': seconds}
+    
     async def get_platform_stats(self) -> Dict[str, Any]:
         """
         Get platform statistics.
         
         Returns:
-            Dictionary with platform statistics
+            Dictionary of platform name to statistics (see PlatformStats)
         """
-        return {
-            'performance': self.platform_performance,
-            'available_platforms': list(self.crawlers.keys())
-        }
\ No newline at end of file
+        stats = {}
+        for platform, metrics in self.platform_performance.items():
+            if platform not in self.crawlers:
+                continue
+            stats[platform] = {
+                'success_rate': metrics['success_rate'],
+                'avg_response_time': metrics['avg_time'],
+                'job_count': metrics['total_jobs'],
+                'last_crawl_time': metrics['last_crawl_time'],
+                'searches': metrics['total_searches'],
+                'avg_results': metrics['avg_results'],
+                'p50_response_time': metrics['p50_time'],
+                'p95_response_time': metrics['p95_time'],
+                'window_success_rate': metrics['window_success_rate'],
+            }
+        return stats
\ No newline at end of file
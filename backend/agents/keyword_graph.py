@@ -0,0 +1,313 @@
+"""
+Keyword expansion graph.
+
+A co-occurrence graph of job search terms built from the analyzed jobs: the
+nodes are skills and normalized job titles, and two nodes are linked each
+time they appear in the same job. Expanding a keyword returns its strongest
+neighbors (by co-occurrence normalized by both terms' frequency, so
+ubiquitous skills like Git do not dominate) plus its synonyms from the
+skill taxonomy.
+
+Keywords the corpus has not seen often enough are expanded by the LLM, and
+the LLM's related terms are added to the graph as edges, so each unseen
+keyword costs one LLM call. With KEYWORD_GRAPH_FILE set, the graph is loaded
+from and saved to that file, so it survives restarts; searches save it from a
+worker thread so the dump does not block the event loop.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import json
+import math
+import os
+import re
+from collections import defaultdict
+
+from core.config import settings
+from core.logging import get_logger
+from .local_job_analyzer import local_job_analyzer
+from .skill_taxonomy import SKILL_TAXONOMY
+
+# Get logger
+logger = get_logger(__name__)
+
+
+# Title words that do not change what a job is about
+TITLE_NOISE = re.compile(
+    r'\b(?:senior|sr\.?|junior|jr\.?|lead|principal|staff|intern|mid[- ]level|entry[- ]level|'
+    r'i{1,3}|iv|[1-4]|remote|hybrid|contract|full[- ]time|part[- ]time)\b|\(.*?\)|\s[-–|]\s.*$|,.*$',
+    re.IGNORECASE
+)
+
+# Co-occurrence weight of a related term suggested by the LLM
+LLM_EDGE_WEIGHT = 3.0
+
+# Saves to KEYWORD_GRAPH_FILE after this many new jobs
+SAVE_EVERY_JOBS = 100
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a job title into a search term (e.g. "Senior Backend Engineer II" -> "backend engineer").
+
+    Args:
+        title: Job title
+
+    Returns:
+        Lowercase title without seniority, level and employment type words
+    """
+    return ' '.join(TITLE_NOISE.sub(' ', title).lower().split())
+
+
+class KeywordGraph:
+    """
+    Co-occurrence graph of skills and job titles for keyword expansion.
+    """
+    def __init__(self, min_count: int = 3, max_nodes: int = 20000, path: str = ""):
+        """
+        Initialize the graph.
+
+        Args:
+            min_count: Jobs a term must appear in before the graph can expand it
+            max_nodes: Maximum number of terms kept; the rarest are pruned beyond this
+            path: File to load the graph from and save it to, or "" to keep it in memory
+        """
+        self.min_count = min_count
+        self.max_nodes = max_nodes
+        self.path = path
+        self.counts: Dict[str, float] = defaultdict(float)
+        self.edges: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.expanded: Dict[str, bool] = {}
+        self.unsaved_jobs = 0
+        self._save_lock = asyncio.Lock()
+
+        # Taxonomy phrases of each skill, as synonyms (not spelling variants like python3)
+        self.synonyms: Dict[str, List[str]] = {
+            skill.lower(): [phrase for phrase in phrases if not phrase.startswith(skill.lower())]
+            for skills in SKILL_TAXONOMY.values()
+            for skill, phrases in skills.items()
+        }
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def terms(self, keyword: str) -> List[str]:
+        """
+        Graph nodes a keyword refers to: the skills it mentions, or the keyword itself.
+
+        Args:
+            keyword: Search keyword
+
+        Returns:
+            Node names
+        """
+        normalized = ' '.join(keyword.lower().split())
+        if normalized in self.counts or normalized in self.expanded:
+            return [normalized]
+        skills = []
+        for _, skill in local_job_analyzer.matcher.find(normalized):
+            if skill.lower() not in skills:
+                skills.append(skill.lower())
+        return skills or [normalized]
+
+    async def add_job(self, title: str, analysis: Dict[str, Any]) -> None:
+        """
+        Add an analyzed job to the graph.
+
+        Args:
+            title: Job title
+            analysis: Job analysis with required_skills and nice_to_have_skills
+        """
+        skills = analysis.get('required_skills', []) + analysis.get('nice_to_have_skills', [])
+        nodes = {str(skill).lower() for skill in skills if isinstance(skill, str) and skill}
+        title_term = normalize_title(title or '')
+        if title_term:
+            nodes.add(title_term)
+        self._add_nodes(sorted(nodes)[:40], 1.0)
+
+        self.unsaved_jobs += 1
+        if self.unsaved_jobs >= SAVE_EVERY_JOBS:
+            await self.save_async()
+
+    async def add_expansions(self, expansions: Dict[str, List[str]]) -> None:
+        """
+        Fold related terms suggested by the LLM into the graph.
+
+        Args:
+            expansions: Related terms returned by the LLM for each keyword, expanded on its own.
+                Keywords without any related term are not marked as expanded.
+        """
+        added = False
+        for keyword, related in expansions.items():
+            node = ' '.join(keyword.lower().split())
+            terms = {' '.join(term.lower().split()) for term in related} - {'', node}
+            if not terms:
+                # Nothing learned (an error or an empty answer); ask again next time
+                continue
+            for term in terms:
+                self.edges[node][term] += LLM_EDGE_WEIGHT
+                self.edges[term][node] += LLM_EDGE_WEIGHT
+                self.counts[term] += 0
+            self.counts[node] += 0
+            self.expanded[node] = True
+            added = True
+        if added:
+            await self.save_async()
+
+    def _add_nodes(self, nodes: List[str], weight: float) -> None:
+        """
+        Count nodes that appeared together and link every pair of them.
+        """
+        for node in nodes:
+            self.counts[node] += weight
+        for index, node in enumerate(nodes):
+            for other in nodes[index + 1:]:
+                self.edges[node][other] += weight
+                self.edges[other][node] += weight
+        if len(self.counts) > self.max_nodes:
+            self._prune()
+
+    def _prune(self) -> None:
+        """
+        Drop the rarest tenth of the terms that the LLM did not expand.
+        """
+        candidates = sorted((node for node in self.counts if node not in self.expanded), key=self.counts.get)
+        for node in candidates[:max(len(self.counts) // 10, 1)]:
+            del self.counts[node]
+            for other in self.edges.pop(node, {}):
+                self.edges[other].pop(node, None)
+
+    def is_known(self, keyword: str) -> bool:
+        """
+        Whether the graph can expand a keyword without the LLM.
+        """
+        for term in self.terms(keyword):
+            if term in self.expanded:
+                continue
+            if self.counts.get(term, 0) < self.min_count or not self.edges.get(term):
+                return False
+        return True
+
+    def related(self, keyword: str, limit: int = 10) -> List[str]:
+        """
+        Terms related to a keyword, strongest first.
+
+        Args:
+            keyword: Search keyword
+            limit: Maximum number of terms
+
+        Returns:
+            Related terms (synonyms first), not including the keyword itself
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        terms = self.terms(keyword)
+        for term in terms:
+            count = max(self.counts.get(term, 0), 1.0)
+            for other, weight in self.edges.get(term, {}).items():
+                other_count = max(self.counts.get(other, 0), 1.0)
+                scores[other] += weight / math.sqrt(count * other_count)
+
+        synonyms = [synonym for term in terms for synonym in self.synonyms.get(term, [])[:2]]
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        related = []
+        for term in synonyms + ranked:
+            if term not in related and term not in terms and term != keyword.lower():
+                related.append(term)
+        return related[:limit]
+
+    def expand(self, keywords: List[str], limit: int = 15) -> Tuple[List[str], List[str]]:
+        """
+        Expand keywords from the graph.
+
+        Args:
+            keywords: Search keywords
+            limit: Maximum number of keywords returned, including the originals
+
+        Returns:
+            Tuple of (original keywords followed by related terms, keywords the graph does not know)
+        """
+        unseen = [keyword for keyword in keywords if not self.is_known(keyword)]
+        known = [keyword for keyword in keywords if keyword not in unseen]
+
+        expanded = list(keywords)
+        per_keyword = max(limit // max(len(known), 1), 3)
+        for keyword in known:
+            for term in self.related(keyword, per_keyword):
+                if term not in (k.lower() for k in expanded):
+                    expanded.append(term)
+        return expanded[:max(limit, len(keywords))], unseen
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Save the graph to a JSON file (if a path is configured).
+
+        Args:
+            path: File to save to, or None for the graph's path
+        """
+        path = path or self.path
+        self.unsaved_jobs = 0
+        if path:
+            self._write(path, self._snapshot())
+
+    async def save_async(self) -> None:
+        """
+        Save the graph to its JSON file from a worker thread.
+
+        The graph is copied on the event loop, so searches can keep updating
+        it while the copy is written.
+        """
+        self.unsaved_jobs = 0
+        if not self.path:
+            return
+        data = self._snapshot()
+        async with self._save_lock:
+            await asyncio.to_thread(self._write, self.path, data)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """
+        Copy the graph into plain JSON-serializable containers.
+        """
+        return {
+            'counts': dict(self.counts),
+            'edges': {node: dict(neighbors) for node, neighbors in self.edges.items()},
+            'expanded': sorted(self.expanded),
+        }
+
+    def _write(self, path: str, data: Dict[str, Any]) -> None:
+        """
+        Write a graph snapshot to a JSON file, replacing it atomically.
+        """
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.error(f"Error saving keyword graph to {path}: {e}")
+
+    def load(self, path: str) -> None:
+        """
+        Load the graph from a JSON file written by save().
+
+        Args:
+            path: File to load from
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading keyword graph from {path}: {e}")
+            return
+        for node, count in data.get('counts', {}).items():
+            self.counts[node] = count
+        for node, neighbors in data.get('edges', {}).items():
+            self.edges[node].update(neighbors)
+        self.expanded.update({node: True for node in data.get('expanded', [])})
+        logger.info(f"Loaded keyword graph with {len(self.counts)} terms from {path}")
+
+
+# Create a global keyword graph instance
+keyword_graph = KeywordGraph(
+    settings.KEYWORD_GRAPH_MIN_COUNT,
+    settings.KEYWORD_GRAPH_MAX_NODES,
+    settings.KEYWORD_GRAPH_FILE
+)
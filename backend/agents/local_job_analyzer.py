@@ -0,0 +1,282 @@
+"""
+Local job analysis without the LLM.
+
+Extracts the same fields as the LLM categorization (required skills,
+experience level, job category, key responsibilities, nice-to-have skills)
+from a job's title and description:
+
+- skills by matching every phrase of the skill taxonomy in one pass over the
+  text with an Aho-Corasick automaton,
+- experience level from seniority words in the title and years of
+  experience in the description,
+- job category from title phrases and the categories of the matched skills.
+
+Each analysis carries a confidence between 0 and 1, so callers can send
+only the uncertain jobs to the LLM.
+"""
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+import re
+from collections import defaultdict, deque
+
+from .description_preprocessor import SKILL_HEADINGS, BOILERPLATE_HEADINGS, section_heading, heading_matches
+from .skill_taxonomy import SKILL_TAXONOMY, AMBIGUOUS_SKILLS, TITLE_CATEGORIES, CATEGORY_SKILL_GROUPS
+
+
+# Title words that give the experience level away
+SENIORITY_TITLES = (
+    ('senior', re.compile(r'\b(?:senior|sr\.?|lead|principal|staff|head|architect|director|vp)\b', re.IGNORECASE)),
+    ('junior', re.compile(r'\b(?:junior|jr\.?|intern|internship|graduate|entry[- ]level|trainee|apprentice)\b', re.IGNORECASE)),
+    ('mid', re.compile(r'\b(?:mid[- ]level|intermediate|ii|2)\b', re.IGNORECASE)),
+)
+
+# Years of experience asked for, e.g. "5+ years", "3-5 years", "at least 2 yrs"
+YEARS_OF_EXPERIENCE = re.compile(
+    r'(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*(\d{1,2})\s*)?(?:years?|yrs?)(?:\s+of)?(?:\s+\w+){0,3}?\s+experience',
+    re.IGNORECASE
+)
+
+# Description words that give the experience level away when no years are given
+SENIORITY_DESCRIPTION = (
+    ('junior', re.compile(r'\b(?:entry[- ]level|new grads?|recent graduates?|no experience required)\b', re.IGNORECASE)),
+    ('senior', re.compile(r'\b(?:senior[- ]level|extensive experience|deep expertise)\b', re.IGNORECASE)),
+)
+
+# Section headings and line markers of nice-to-have skills
+NICE_TO_HAVE_HEADINGS = ('nice to have', 'nice-to-have', 'preferred', 'bonus', 'pluses', 'good to have')
+NICE_TO_HAVE_LINE = re.compile(r'\b(?:nice to have|preferred|a plus|is a bonus|bonus points|good to have)\b', re.IGNORECASE)
+
+# Section headings of responsibilities
+RESPONSIBILITY_HEADINGS = ('responsibilities', 'what you will do', "what you'll do", 'the role', 'your role', 'duties')
+
+# Verbs that start a responsibility line outside a responsibilities section
+RESPONSIBILITY_VERBS = re.compile(
+    r'^(?:[-*•]\s*)?(?:you will\s+)?(?:build|design|develop|implement|own|lead|maintain|write|create|'
+    r'collaborate|work|drive|deliver|mentor|support|improve|architect|deploy|manage|analy[sz]e|test)\b',
+    re.IGNORECASE
+)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over the phrases of a skill taxonomy.
+    """
+    def __init__(
+        self,
+        taxonomy: Dict[str, Dict[str, Tuple[str, ...]]],
+        ambiguous: FrozenSet[str] = AMBIGUOUS_SKILLS
+    ):
+        """
+        Compile the automaton.
+
+        Args:
+            taxonomy: Skill groups, each mapping canonical skill names to their phrases
+            ambiguous: Skills matched only by their phrases, not by their canonical name
+        """
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[int, str]]] = [[]]
+        self.groups: Dict[str, str] = {}
+
+        for group, skills in taxonomy.items():
+            for skill, phrases in skills.items():
+                self.groups[skill] = group
+                names = () if skill in ambiguous else (skill.lower(),)
+                for phrase in {*names, *phrases}:
+                    self._add(phrase, skill)
+        self._link()
+
+    def _add(self, phrase: str, skill: str) -> None:
+        """
+        Add a phrase to the trie.
+        """
+        state = 0
+        for char in phrase:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.outputs[state].append((len(phrase), skill))
+
+    def _link(self) -> None:
+        """
+        Compute failure links breadth first and merge outputs along them.
+        """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find the skills mentioned in a text, as whole words.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            (position, canonical skill name) of each match, in order of position
+        """
+        text = text.lower()
+        matches = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, skill in self.outputs[state]:
+                start = end - length + 1
+                if self._is_word(text, start, end):
+                    matches.append((start, skill))
+        matches.sort()
+        return matches
+
+    def _is_word(self, text: str, start: int, end: int) -> bool:
+        """
+        Whether a match is not part of a longer word.
+        """
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end + 1] if end + 1 < len(text) else ' '
+        # A trailing dot ends a sentence rather than continuing the word
+        if after == '.' and (end + 2 >= len(text) or not text[end + 2].isalnum()):
+            after = ' '
+        return not (before.isalnum() or before in '+#.') and not (after.isalnum() or after in '+#')
+
+
+class LocalJobAnalyzer:
+    """
+    Categorizes jobs from their title and description in microseconds.
+    """
+    def __init__(self, matcher: Optional[SkillMatcher] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            matcher: Skill matcher, or None to compile the default taxonomy
+        """
+        self.matcher = matcher or SkillMatcher(SKILL_TAXONOMY)
+
+    def analyze(self, title: str, description: str) -> Dict[str, Any]:
+        """
+        Analyze a job.
+
+        Args:
+            title: Job title
+            description: Job description (may be empty)
+
+        Returns:
+            Dictionary with required_skills, experience_level, job_category,
+            key_responsibilities, nice_to_have_skills, confidence and
+            analysis_source ('local')
+        """
+        required: List[str] = []
+        nice_to_have: List[str] = []
+        responsibilities: List[str] = []
+        in_nice_to_have = False
+        in_responsibilities = False
+
+        for line in [title] + description.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # Only known section headings switch sections; short bullet lines look like headings too
+            heading = section_heading(line)
+            is_section = heading is not None and any(
+                heading_matches(heading, headings)
+                for headings in (NICE_TO_HAVE_HEADINGS, RESPONSIBILITY_HEADINGS, SKILL_HEADINGS, BOILERPLATE_HEADINGS)
+            )
+            if is_section:
+                in_nice_to_have = heading_matches(heading, NICE_TO_HAVE_HEADINGS)
+                in_responsibilities = heading_matches(heading, RESPONSIBILITY_HEADINGS)
+
+            optional = in_nice_to_have or bool(NICE_TO_HAVE_LINE.search(line))
+            for _, skill in self.matcher.find(line):
+                target = nice_to_have if optional else required
+                if skill not in required and skill not in target:
+                    target.append(skill)
+
+            if len(responsibilities) < 5 and not is_section and len(line) > 20 and (
+                    in_responsibilities or RESPONSIBILITY_VERBS.match(line)):
+                responsibilities.append(line.lstrip('-*• ').strip())
+
+        nice_to_have = [skill for skill in nice_to_have if skill not in required]
+        level, level_confidence = self._experience_level(title, description)
+        category, category_confidence = self._category(title, required + nice_to_have)
+
+        technical = [skill for skill in required if self.matcher.groups[skill] != 'soft']
+        skill_confidence = min(len(technical) / 4, 1.0)
+        confidence = 0.4 * skill_confidence + 0.3 * level_confidence + 0.3 * category_confidence
+
+        return {
+            'required_skills': required,
+            'experience_level': level,
+            'job_category': category,
+            'key_responsibilities': responsibilities,
+            'nice_to_have_skills': nice_to_have,
+            'confidence': round(confidence, 2),
+            'analysis_source': 'local',
+        }
+
+    def _experience_level(self, title: str, description: str) -> Tuple[str, float]:
+        """
+        Get the experience level of a job and how sure the guess is.
+        """
+        for level, pattern in SENIORITY_TITLES:
+            if pattern.search(title):
+                return level, 1.0
+
+        years = []
+        for match in YEARS_OF_EXPERIENCE.finditer(description):
+            low = int(match.group(1))
+            if low <= 30:
+                years.append(low)
+        if years:
+            minimum = min(years)
+            if minimum < 2:
+                return 'junior', 0.9
+            if minimum < 5:
+                return 'mid', 0.9
+            return 'senior', 0.9
+
+        for level, pattern in SENIORITY_DESCRIPTION:
+            if pattern.search(description):
+                return level, 0.7
+        return 'mid', 0.3
+
+    def _category(self, title: str, skills: List[str]) -> Tuple[str, float]:
+        """
+        Get the job category of a job and how sure the guess is.
+        """
+        title_text = f" {title.lower()} "
+        for category, phrases in TITLE_CATEGORIES.items():
+            if any(re.search(rf'(?<![a-z]){re.escape(phrase)}(?![a-z])', title_text) for phrase in phrases):
+                return category, 1.0
+
+        group_counts: Dict[str, int] = defaultdict(int)
+        for skill in skills:
+            group_counts[self.matcher.groups[skill]] += 1
+        scores = {
+            category: sum(weight * group_counts[group] for group, weight in groups.items())
+            for category, groups in CATEGORY_SKILL_GROUPS.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best, best_score), (second, second_score) = ranked[0], ranked[1]
+        if best_score == 0:
+            return 'general', 0.0
+
+        # Strong frontend and backend signals together make a full stack job
+        if {best, second} == {'frontend', 'backend'} and second_score >= 0.5 * best_score:
+            return 'fullstack', min(best_score / 4, 1.0)
+        margin = (best_score - second_score) / best_score
+        return best, margin * min(best_score / 3, 1.0)
+
+
+# Create a global local job analyzer instance
+local_job_analyzer = LocalJobAnalyzer()
@@ -0,0 +1,198 @@
+"""
+Thompson-sampling platform selection.
+
+Each (query category, platform) pair is an arm of a multi-armed bandit. An
+arm's reward model has two parts: a Beta posterior over the probability
+that a crawl succeeds, and a Gamma posterior over the rate of unique jobs
+per second of crawling. To plan a search, one value of each is sampled per
+arm and the platforms with the highest sampled success * rate are crawled,
+with the detail budget split in proportion to those values. Platforms that
+keep failing are sampled low and so are crawled, and given details, less and
+less, while uncertain arms still get explored now and then.
+
+Arms start from a prior built from the global platform performance and the
+LLM's plan: platforms the LLM ranked higher start with more pseudo-jobs.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import random
+
+from core.config import settings
+from .platform_performance import platform_performance_tracker
+
+
+# Terms that put a query in a category, checked in order
+QUERY_CATEGORIES = {
+    'data': ('data', 'machine learning', 'ml', 'ai', 'analytics', 'analyst', 'scientist', 'statistics'),
+    'devops': ('devops', 'sre', 'cloud', 'aws', 'azure', 'gcp', 'kubernetes', 'infrastructure'),
+    'software': ('developer', 'engineer', 'software', 'python', 'java', 'javascript', 'backend',
+                 'frontend', 'full stack', 'react', 'node', 'golang', 'c++'),
+    'design': ('design', 'designer', 'ux', 'ui'),
+    'management': ('manager', 'management', 'product', 'director', 'lead'),
+    'sales': ('sales', 'marketing', 'account', 'business development'),
+}
+
+
+def query_category(keywords: List[str]) -> str:
+    """
+    Get the category of a search query.
+
+    Args:
+        keywords: Search keywords
+
+    Returns:
+        Category name, or 'general' if no category matches
+    """
+    text = f" {' '.join(keywords).lower()} "
+    for category, terms in QUERY_CATEGORIES.items():
+        if any(f" {term} " in text for term in terms):
+            return category
+    return 'general'
+
+
+class PlatformBandit:
+    """
+    Picks platforms and detail budgets per query category by Thompson sampling.
+    """
+    def __init__(self, prior_seconds: float = 30.0, seed: Optional[int] = None):
+        """
+        Initialize the bandit.
+
+        Args:
+            prior_seconds: Crawl seconds the prior is worth, relative to observed crawls
+            seed: Random seed for reproducible sampling
+        """
+        self.prior_seconds = prior_seconds
+        self.arms: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.random = random.Random(seed)
+
+    def _arm(self, category: str, platform: str) -> Dict[str, float]:
+        """
+        Get the observations of an arm.
+        """
+        key = (category, platform)
+        if key not in self.arms:
+            self.arms[key] = {'successes': 0, 'failures': 0, 'jobs': 0, 'seconds': 0.0}
+        return self.arms[key]
+
+    def _prior(self, platform: str, llm_priority: Optional[int]) -> Dict[str, float]:
+        """
+        Prior pseudo-observations of an arm.
+
+        Args:
+            platform: Platform name
+            llm_priority: Rank the LLM gave the platform (1 is best), or None if not planned
+
+        Returns:
+            Pseudo successes, failures, jobs and seconds
+        """
+        metrics = platform_performance_tracker.snapshot().get(platform, {})
+        success_rate = metrics.get('success_rate', 0.5)
+        rate = metrics.get('avg_results', 0) / max(metrics.get('avg_time', 0), 1.0)
+        boost = 1.0 + 0.5 / llm_priority if llm_priority else 1.0
+        return {
+            'successes': 2 * success_rate,
+            'failures': 2 * (1 - success_rate),
+            'jobs': rate * self.prior_seconds * boost,
+            'seconds': self.prior_seconds,
+        }
+
+    def sample(self, category: str, platform: str, llm_priority: Optional[int] = None) -> float:
+        """
+        Sample the expected unique jobs per second of a platform.
+
+        Args:
+            category: Query category
+            platform: Platform name
+            llm_priority: Rank the LLM gave the platform, or None
+
+        Returns:
+            Sampled success probability times sampled jobs per second
+        """
+        arm = self._arm(category, platform)
+        prior = self._prior(platform, llm_priority)
+        success = self.random.betavariate(
+            1 + prior['successes'] + arm['successes'],
+            1 + prior['failures'] + arm['failures']
+        )
+        rate = self.random.gammavariate(
+            1 + prior['jobs'] + arm['jobs'],
+            1 / (prior['seconds'] + arm['seconds'])
+        )
+        return success * rate
+
+    def plan(
+        self,
+        category: str,
+        candidates: List[str],
+        llm_platforms: List[str],
+        max_platforms: int,
+        detail_budget: int
+    ) -> Dict[str, int]:
+        """
+        Choose the platforms to crawl and their detail fetch limits.
+
+        Args:
+            category: Query category
+            candidates: Platforms that can be crawled
+            llm_platforms: Platforms in the order the LLM ranked them
+            max_platforms: Number of platforms to crawl
+            detail_budget: Detail fetches to share among the chosen platforms
+
+        Returns:
+            Dictionary of platform to detail limit, best platform first
+        """
+        priorities = {platform: rank for rank, platform in enumerate(llm_platforms, 1)}
+        samples = {
+            platform: self.sample(category, platform, priorities.get(platform))
+            for platform in candidates
+        }
+        chosen = sorted(samples, key=samples.get, reverse=True)[:max_platforms]
+        if not chosen:
+            return {}
+
+        # Every chosen platform gets at least one detail fetch if the budget allows, the rest goes by sampled value
+        floor = 1 if detail_budget >= len(chosen) else 0
+        total = sum(samples[platform] for platform in chosen)
+        spare = max(detail_budget - floor * len(chosen), 0)
+        shares = {
+            platform: spare * samples[platform] / total if total else spare / len(chosen)
+            for platform in chosen
+        }
+        limits = {platform: floor + int(shares[platform]) for platform in chosen}
+        # Hand out what rounding down left over, largest remainder first
+        leftover = detail_budget - sum(limits.values())
+        for platform in sorted(chosen, key=lambda p: shares[p] - int(shares[p]), reverse=True)[:max(leftover, 0)]:
+            limits[platform] += 1
+        return limits
+
+    def record(self, category: str, platform: str, success: bool, unique_jobs: int, seconds: float) -> None:
+        """
+        Record the outcome of a crawl.
+
+        Args:
+            category: Query category
+            platform: Platform name
+            success: Whether the crawl completed without errors
+            unique_jobs: Jobs the platform added that no other platform returned
+            seconds: Duration of the crawl
+        """
+        arm = self._arm(category, platform)
+        if success:
+            arm['successes'] += 1
+        else:
+            arm['failures'] += 1
+        arm['jobs'] += unique_jobs
+        arm['seconds'] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Get the observations of every arm, by category and platform.
+        """
+        arms: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (category, platform), arm in self.arms.items():
+            arms.setdefault(category, {})[platform] = dict(arm)
+        return arms
+
+
+# Create a global platform bandit instance
+platform_bandit = PlatformBandit(settings.PLATFORM_BANDIT_PRIOR_SECONDS)
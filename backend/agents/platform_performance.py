@@ -0,0 +1,194 @@
+"""
+Rolling performance of job platforms.
+
+Every crawl of a platform records whether it succeeded, how many jobs it
+returned and how long it took. The tracker keeps exponentially weighted
+moving averages of these (starting from prior estimates, so a platform that
+has never been crawled still gets a sensible ranking) and time buckets
+covering the last window, from which success rate, job counts and latency
+percentiles are reported.
+"""
+from typing import Dict, Any, List, Optional
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+from core.config import settings
+
+
+# Estimates used until a platform has been crawled
+DEFAULT_PERFORMANCE = {
+    'linkedin': {'success_rate': 0.9, 'avg_results': 15, 'avg_time': 10},
+    'indeed': {'success_rate': 0.8, 'avg_results': 20, 'avg_time': 12},
+    'naukri': {'success_rate': 0.7, 'avg_results': 10, 'avg_time': 8},
+    'glassdoor': {'success_rate': 0.6, 'avg_results': 12, 'avg_time': 15},
+}
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class PlatformPerformanceTracker:
+    """
+    Tracks success rate, jobs returned and latency of each platform.
+    """
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        window_seconds: int = 3600,
+        bucket_seconds: int = 60,
+        priors: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            alpha: Weight of the newest crawl in the moving averages
+            window_seconds: Length of the rolling window
+            bucket_seconds: Width of a time bucket within the window
+            priors: Initial estimates per platform (defaults to DEFAULT_PERFORMANCE)
+        """
+        self.alpha = alpha
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.platforms: Dict[str, Dict[str, Any]] = {}
+        for platform, prior in (DEFAULT_PERFORMANCE if priors is None else priors).items():
+            self._platform(platform, prior)
+
+    def _platform(self, platform: str, prior: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Get the state of a platform, creating it from a prior if needed.
+        """
+        state = self.platforms.get(platform)
+        if state is None:
+            prior = prior or {}
+            state = self.platforms[platform] = {
+                'success_rate': float(prior.get('success_rate', 0.5)),
+                'avg_results': float(prior.get('avg_results', 0)),
+                'avg_time': float(prior.get('avg_time', 0)),
+                'total_searches': 0,
+                'total_jobs': 0,
+                'last_crawl_time': None,
+                'buckets': deque(),
+            }
+        return state
+
+    def record(self, platform: str, success: bool, jobs: int, seconds: float) -> None:
+        """
+        Record a crawl of a platform.
+
+        Args:
+            platform: Platform name
+            success: Whether the crawl completed without errors
+            jobs: Number of jobs returned
+            seconds: Duration of the crawl
+        """
+        state = self._platform(platform)
+        alpha = self.alpha
+        state['success_rate'] += alpha * ((1.0 if success else 0.0) - state['success_rate'])
+        state['avg_results'] += alpha * (jobs - state['avg_results'])
+        state['avg_time'] += alpha * (seconds - state['avg_time'])
+        state['total_searches'] += 1
+        state['total_jobs'] += jobs
+        state['last_crawl_time'] = datetime.now()
+
+        now = time.time()
+        bucket_start = now - now % self.bucket_seconds
+        buckets = state['buckets']
+        if not buckets or buckets[-1]['start'] != bucket_start:
+            buckets.append({'start': bucket_start, 'searches': 0, 'successes': 0, 'jobs': 0, 'latencies': []})
+        bucket = buckets[-1]
+        bucket['searches'] += 1
+        bucket['successes'] += 1 if success else 0
+        bucket['jobs'] += jobs
+        bucket['latencies'].append(seconds)
+        self._expire(buckets, now)
+
+    def _expire(self, buckets: deque, now: float) -> None:
+        """
+        Drop buckets that ended before the window.
+        """
+        while buckets and buckets[0]['start'] + self.bucket_seconds <= now - self.window_seconds:
+            buckets.popleft()
+
+    def _window(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize the buckets of a platform within the window.
+        """
+        buckets = state['buckets']
+        self._expire(buckets, time.time())
+        searches = sum(bucket['searches'] for bucket in buckets)
+        latencies = [latency for bucket in buckets for latency in bucket['latencies']]
+        return {
+            'searches': searches,
+            'successes': sum(bucket['successes'] for bucket in buckets),
+            'jobs': sum(bucket['jobs'] for bucket in buckets),
+            'p50_time': _percentile(latencies, 0.5),
+            'p95_time': _percentile(latencies, 0.95),
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current performance of every platform.
+
+        The success_rate, avg_results and avg_time keys are the moving
+        averages used to rank platforms; the window_* keys and latency
+        percentiles cover the rolling window only.
+
+        Returns:
+            Dictionary of platform name to performance metrics
+        """
+        performance = {}
+        for platform, state in self.platforms.items():
+            window = self._window(state)
+            performance[platform] = {
+                'success_rate': state['success_rate'],
+                'avg_results': state['avg_results'],
+                'avg_time': state['avg_time'],
+                'p50_time': window['p50_time'],
+                'p95_time': window['p95_time'],
+                'window_searches': window['searches'],
+                'window_success_rate': window['successes'] / window['searches'] if window['searches'] else None,
+                'window_jobs': window['jobs'],
+                'total_searches': state['total_searches'],
+                'total_jobs': state['total_jobs'],
+                'last_crawl_time': state['last_crawl_time'].isoformat() if state['last_crawl_time'] else None,
+            }
+        return performance
+
+    def reset(self) -> None:
+        """
+        Forget all recorded crawls and go back to the priors.
+        """
+        self.platforms.clear()
+        for platform, prior in DEFAULT_PERFORMANCE.items():
+            self._platform(platform, prior)
+
+
+def expected_jobs_per_second(metrics: Dict[str, Any]) -> float:
+    """
+    Rank value of a platform: jobs returned per second of crawling, discounted by failures.
+
+    Args:
+        metrics: Performance metrics of a platform (success_rate, avg_results, avg_time)
+
+    Returns:
+        Expected jobs per second
+    """
+    return metrics.get('success_rate', 0) * metrics.get('avg_results', 0) / max(metrics.get('avg_time', 0), 1.0)
+
+
+# Create a global platform performance tracker
+platform_performance_tracker = PlatformPerformanceTracker(
+    settings.PLATFORM_STATS_EWMA_ALPHA,
+    settings.PLATFORM_STATS_WINDOW_SECONDS,
+    settings.PLATFORM_STATS_BUCKET_SECONDS
+)
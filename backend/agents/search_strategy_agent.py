@@ -1,13 +1,15 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import sys
 import os
 
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from services.llm_service import groq_service, LLMServiceError
+from services.llm_service import groq_service, LLMServiceError, ResponseParsingError
+from services.llm_schemas import SearchStrategySchema, SearchPlanSchema
 from core.config import settings
 from core.logging import get_logger
+from .platform_performance import expected_jobs_per_second
 
 # Get logger
 logger = get_logger(__name__)
@@ -39,7 +41,8 @@ class SearchStrategyAgent:
         self, 
         keywords: List[str], 
         location: str,
-        platform_performance: Optional[Dict[str, Dict[str, float]]] = None
+        platform_performance: Optional[Dict[str, Dict[str, float]]] = None,
+        fallback: bool = True
     ) -> Dict[str, Any]:
         """
         Determine the optimal search strategy based on keywords, location, and platform performance.
@@ -48,22 +51,24 @@ class SearchStrategyAgent:
             keywords: List of search keywords
             location: Job location
             platform_performance: Dictionary of platform performance metrics
+            fallback: Return the default strategy if the response cannot be parsed
             
         Returns:
             Dictionary with search strategy
             
         Raises:
             LLMServiceError: If there's an error with the LLM service
+            ResponseParsingError: If the response cannot be parsed and fallback is False
         """
         logger.info(f"Optimizing search strategy for keywords={keywords}, location={location}")
         prompt = self._create_strategy_prompt(keywords, location, platform_performance)
         
-        # Call Groq API and extract JSON content
-        response = await self.groq_service.generate_completion(prompt)
-        
+        # Call Groq API, stopping once the JSON object is complete
         try:
-            strategy = self.groq_service.extract_json_content(response)
-        except LLMServiceError:
+            strategy = await self.groq_service.generate_json(prompt, SearchStrategySchema)
+        except ResponseParsingError:
+            if not fallback:
+                raise
             # If JSON parsing fails, return a default strategy
             logger.warning("Failed to parse strategy response, using default strategy")
             strategy = self._get_default_strategy()
@@ -71,14 +76,14 @@ class SearchStrategyAgent:
         # Validate and fix the strategy
         return self._validate_strategy(strategy, platform_performance)
 
-    def _create_strategy_prompt(
-        self, 
-        keywords: List[str], 
+    async def analyze_and_plan(
+        self,
+        keywords: List[str],
         location: str,
         platform_performance: Optional[Dict[str, Dict[str, float]]] = None
-    ) -> str:
+    ) -> Tuple[List[str], Dict[str, Any]]:
         """
-        Create prompt for search strategy.
+        Enhance keywords and determine the search strategy in a single LLM call.
         
         Args:
             keywords: List of search keywords
@@ -86,7 +91,41 @@ class SearchStrategyAgent:
             platform_performance: Dictionary of platform performance metrics
             
         Returns:
-            Prompt string
+            Tuple of (enhanced keywords, validated strategy dictionary)
+            
+        Raises:
+            LLMServiceError: If there's an error with the LLM service
+        """
+        logger.info(f"Analyzing keywords and planning search for keywords={keywords}, location={location}")
+        prompt = self._create_combined_prompt(keywords, location, platform_performance)
+        
+        # Call Groq API, stopping once the JSON object is complete
+        try:
+            plan = await self.groq_service.generate_json(prompt, SearchPlanSchema)
+        except ResponseParsingError:
+            logger.warning("Failed to parse combined planning response, using default strategy")
+            plan = {}
+        if not isinstance(plan, dict):
+            plan = {}
+        
+        # Fall back to the original keywords if the model returned none
+        enhanced_keywords = plan.pop("keywords", None)
+        if not isinstance(enhanced_keywords, list):
+            enhanced_keywords = []
+        enhanced_keywords = [k.strip() for k in enhanced_keywords if isinstance(k, str) and k.strip()]
+        
+        strategy = plan or self._get_default_strategy()
+        return enhanced_keywords or list(keywords), self._validate_strategy(strategy, platform_performance)
+
+    def _format_performance(self, platform_performance: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+        """
+        Format platform performance metrics for a prompt.
+        
+        Args:
+            platform_performance: Dictionary of platform performance metrics
+            
+        Returns:
+            Metrics text, or an empty string if there are none
         """
         performance_info = ""
         if platform_performance:
@@ -94,7 +133,74 @@ class SearchStrategyAgent:
             for platform, metrics in platform_performance.items():
                 performance_info += f"- {platform}: Success rate: {metrics.get('success_rate', 0):.2f}, "
                 performance_info += f"Avg results: {metrics.get('avg_results', 0):.1f}, "
-                performance_info += f"Avg time: {metrics.get('avg_time', 0):.1f}s\n"
+                performance_info += f"Avg time: {metrics.get('avg_time', 0):.1f}s"
+                if metrics.get('window_searches'):
+                    performance_info += f", p95 time: {metrics.get('p95_time', 0):.1f}s"
+                    performance_info += f" over the last {metrics['window_searches']} searches"
+                performance_info += "\n"
+        return performance_info
+
+    def _create_combined_prompt(
+        self,
+        keywords: List[str],
+        location: str,
+        platform_performance: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> str:
+        """
+        Create prompt for combined keyword analysis and search strategy.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            platform_performance: Dictionary of platform performance metrics
+            
+        Returns:
+            Prompt string
+        """
+        performance_info = self._format_performance(platform_performance)
+        
+        return f"""
+        Expand the job search keywords and search strategy for the provided keywords and location.
+
+        Keywords:
+            1. Suggest 10–15 closely related technical skills, modern job titles, and industry-specific terms used in job descriptions.
+            2. Avoid generic terms, synonyms, overly broad concepts, and certifications.
+        Strategy, using the available performance metrics:
+            1. Recommend top 3–5 platforms in priority order.
+            2. Suggest effective job search filters (e.g., recency, job type).
+            3. Propose concise keyword variations that can enhance search accuracy.
+            4. Highlight any special considerations based on the location and industry.
+        Input: Keywords: {keywords} Location: {location} Platform metrics: {performance_info}.
+        Output: Return a well-formatted JSON with these keys:
+                keywords: [enhanced keywords, including the original ones]
+                platforms: [ranked list of platforms]
+                filters: object with filter criteria
+                keywordVariations: [short, meaningful variations]
+                specialConsiderations: [specific notes for better targeting]
+        Return only a valid, minified JSON object.
+        Do not include explanations, markdown formatting, code blocks, or escaped characters.
+        Do not wrap the JSON in quotes. Output must be directly parsable by json.loads().
+        Your output must begin with "{{" and end with "}}".
+        """
+
+    def _create_strategy_prompt(
+        self, 
+        keywords: List[str], 
+        location: str,
+        platform_performance: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> str:
+        """
+        Create prompt for search strategy.
+        
+        Args:
+            keywords: List of search keywords
+            location: Job location
+            platform_performance: Dictionary of platform performance metrics
+            
+        Returns:
+            Prompt string
+        """
+        performance_info = self._format_performance(platform_performance)
         
         return f"""
         Create a targeted job search strategy using the provided keywords and location.
@@ -165,10 +271,10 @@ class SearchStrategyAgent:
         if len(valid_platforms) < 3:
             # Use performance metrics to prioritize if available
             if platform_performance:
-                # Sort platforms by success rate * avg_results
+                # Sort platforms by expected jobs per second of crawling
                 sorted_platforms = sorted(
                     platform_performance.items(),
-                    key=lambda x: x[1].get('success_rate', 0) * x[1].get('avg_results', 0),
+                    key=lambda x: expected_jobs_per_second(x[1]),
                     reverse=True
                 )
                 # Add top performing platforms that aren't already included
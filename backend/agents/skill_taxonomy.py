@@ -0,0 +1,343 @@
+"""
+Skill taxonomy for local job analysis.
+
+Skills are grouped by the job category they point to. Each skill maps its
+canonical name to the lowercase phrases that mention it; the canonical name
+itself (lowercased) matches too, except for the AMBIGUOUS_SKILLS whose names
+are common English words. Skills under 'general' and 'soft' count as skills
+but say nothing about the category.
+"""
+from typing import Dict, FrozenSet, Tuple
+
+
+# Skills whose canonical name is also a common word ("go to meetings", "react to
+# feedback", "R&D"); only their listed phrases, which give context, match
+AMBIGUOUS_SKILLS: FrozenSet[str] = frozenset({
+    'Go', 'React', 'R', 'Rust', 'Swift', 'Express', 'Spring', 'Excel', 'Phoenix', 'Ember.js',
+    'Helm', 'Puppet', 'Chef', 'Sketch', 'Hive',
+})
+
+SKILL_TAXONOMY: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    'frontend': {
+        'JavaScript': ('javascript', 'es6', 'ecmascript', 'vanilla js'),
+        'TypeScript': ('typescript',),
+        'React': ('reactjs', 'react.js', 'react developer', 'react engineer', 'react hooks', 'react components',
+                  'react and redux', 'react/redux', 'react with typescript'),
+        'Angular': ('angular', 'angularjs', 'angular.js'),
+        'Vue.js': ('vue', 'vuejs', 'vue.js'),
+        'Svelte': ('svelte', 'sveltekit'),
+        'Next.js': ('next.js', 'nextjs'),
+        'Nuxt.js': ('nuxt', 'nuxt.js', 'nuxtjs'),
+        'Redux': ('redux',),
+        'HTML': ('html', 'html5'),
+        'CSS': ('css', 'css3'),
+        'Sass': ('sass', 'scss'),
+        'Tailwind CSS': ('tailwind', 'tailwindcss'),
+        'Bootstrap': ('bootstrap',),
+        'Material UI': ('material ui', 'material-ui', 'mui'),
+        'jQuery': ('jquery',),
+        'Webpack': ('webpack',),
+        'Vite': ('vite',),
+        'Babel': ('babel',),
+        'Storybook': ('storybook',),
+        'Web Accessibility': ('accessibility', 'wcag', 'a11y'),
+        'Responsive Design': ('responsive design', 'responsive web design'),
+        'Three.js': ('three.js', 'threejs', 'webgl'),
+        'D3.js': ('d3', 'd3.js'),
+        'Ember.js': ('ember.js', 'emberjs'),
+        'Backbone.js': ('backbone.js',),
+        'Micro Frontends': ('micro frontends', 'micro-frontends'),
+    },
+    'backend': {
+        'Python': ('python', 'python3'),
+        'Java': ('java',),
+        'Go': ('golang', 'go developer', 'go engineer', 'go programming', 'go language', 'go lang'),
+        'Rust': ('rust developer', 'rust engineer', 'rust programming', 'rust language', 'rustlang'),
+        'C#': ('c#', 'csharp'),
+        'C++': ('c++', 'cpp'),
+        'Ruby': ('ruby',),
+        'PHP': ('php',),
+        'Scala': ('scala',),
+        'Elixir': ('elixir',),
+        'Erlang': ('erlang',),
+        'Node.js': ('nodejs', 'node.js'),
+        'Express': ('express.js', 'expressjs'),
+        'NestJS': ('nestjs', 'nest.js'),
+        'Django': ('django',),
+        'Flask': ('flask',),
+        'FastAPI': ('fastapi',),
+        'Spring': ('spring boot', 'springboot', 'spring framework', 'spring mvc'),
+        'Hibernate': ('hibernate',),
+        '.NET': ('.net', 'dotnet', 'asp.net', '.net core'),
+        'Ruby on Rails': ('rails', 'ruby on rails', 'ror'),
+        'Laravel': ('laravel',),
+        'Symfony': ('symfony',),
+        'Phoenix': ('phoenix framework',),
+        'REST APIs': ('restful', 'rest api', 'rest apis', 'restful apis', 'rest services'),
+        'GraphQL': ('graphql',),
+        'gRPC': ('grpc',),
+        'Microservices': ('microservices', 'microservice', 'service-oriented architecture', 'soa'),
+        'Kafka': ('kafka', 'apache kafka'),
+        'RabbitMQ': ('rabbitmq',),
+        'Celery': ('celery',),
+        'Redis': ('redis',),
+        'Memcached': ('memcached',),
+        'Elasticsearch': ('elasticsearch', 'elastic search', 'opensearch'),
+        'WebSockets': ('websockets', 'websocket'),
+        'OAuth': ('oauth', 'oauth2', 'openid connect', 'oidc'),
+        'Distributed Systems': ('distributed systems',),
+        'System Design': ('system design',),
+        'Event-Driven Architecture': ('event-driven', 'event driven architecture', 'event sourcing', 'cqrs'),
+        'Message Queues': ('message queues', 'message queue', 'sqs', 'pub/sub'),
+        'Asyncio': ('asyncio',),
+        'SQLAlchemy': ('sqlalchemy',),
+        'Kotlin': ('kotlin',),
+        'Perl': ('perl',),
+        'Clojure': ('clojure',),
+        'Haskell': ('haskell',),
+    },
+    'database': {
+        'SQL': ('sql', 't-sql', 'pl/sql', 'plsql'),
+        'PostgreSQL': ('postgresql', 'postgres'),
+        'MySQL': ('mysql', 'mariadb'),
+        'SQL Server': ('sql server', 'mssql'),
+        'Oracle': ('oracle', 'oracle db'),
+        'SQLite': ('sqlite',),
+        'MongoDB': ('mongodb', 'mongo'),
+        'Cassandra': ('cassandra',),
+        'DynamoDB': ('dynamodb',),
+        'Neo4j': ('neo4j',),
+        'CouchDB': ('couchdb', 'couchbase'),
+        'NoSQL': ('nosql',),
+        'Database Design': ('database design', 'data modeling', 'data modelling', 'schema design'),
+        'Firebase': ('firebase', 'firestore'),
+        'Supabase': ('supabase',),
+        'CockroachDB': ('cockroachdb',),
+    },
+    'mobile': {
+        'iOS': ('ios',),
+        'Android': ('android',),
+        'Swift': ('swiftui', 'swift developer', 'swift programming', 'swift language', 'swift and objective-c'),
+        'Objective-C': ('objective-c', 'objective c'),
+        'React Native': ('react native',),
+        'Flutter': ('flutter',),
+        'Dart': ('dart',),
+        'Xamarin': ('xamarin',),
+        'Jetpack Compose': ('jetpack compose',),
+        'Mobile Development': ('mobile development', 'mobile apps', 'mobile app development'),
+        'Ionic': ('ionic',),
+    },
+    'data': {
+        'Pandas': ('pandas',),
+        'NumPy': ('numpy',),
+        'Spark': ('spark', 'apache spark', 'pyspark'),
+        'Hadoop': ('hadoop', 'hdfs', 'mapreduce'),
+        'Hive': ('apache hive', 'hiveql', 'hive sql'),
+        'Airflow': ('airflow', 'apache airflow'),
+        'dbt': ('dbt',),
+        'ETL': ('etl', 'elt', 'data pipelines', 'data pipeline'),
+        'Data Warehousing': ('data warehouse', 'data warehousing', 'data lake', 'lakehouse'),
+        'Snowflake': ('snowflake',),
+        'BigQuery': ('bigquery',),
+        'Redshift': ('redshift',),
+        'Databricks': ('databricks',),
+        'Tableau': ('tableau',),
+        'Power BI': ('power bi', 'powerbi'),
+        'Looker': ('looker',),
+        'Excel': ('microsoft excel', 'ms excel', 'advanced excel', 'excel spreadsheets', 'excel vba'),
+        'R': ('r programming', 'r language', 'rstudio', 'tidyverse', 'ggplot2'),
+        'Statistics': ('statistics', 'statistical analysis', 'statistical modeling', 'a/b testing'),
+        'Data Analysis': ('data analysis', 'data analytics'),
+        'Data Visualization': ('data visualization', 'data visualisation', 'dashboards'),
+        'Matplotlib': ('matplotlib', 'seaborn', 'plotly'),
+        'Jupyter': ('jupyter', 'jupyter notebooks'),
+        'Flink': ('flink', 'apache flink'),
+        'Kinesis': ('kinesis',),
+        'SAS': ('sas',),
+        'SPSS': ('spss',),
+    },
+    'machine learning': {
+        'Machine Learning': ('machine learning', 'ml'),
+        'Deep Learning': ('deep learning', 'neural networks', 'neural network'),
+        'TensorFlow': ('tensorflow',),
+        'PyTorch': ('pytorch',),
+        'Keras': ('keras',),
+        'scikit-learn': ('scikit-learn', 'sklearn', 'scikit learn'),
+        'XGBoost': ('xgboost', 'lightgbm', 'catboost'),
+        'NLP': ('nlp', 'natural language processing'),
+        'Computer Vision': ('computer vision', 'opencv', 'image recognition'),
+        'LLMs': ('llm', 'llms', 'large language models', 'generative ai', 'genai'),
+        'Transformers': ('transformers', 'hugging face', 'huggingface'),
+        'LangChain': ('langchain', 'llamaindex'),
+        'RAG': ('rag', 'retrieval-augmented generation', 'retrieval augmented generation'),
+        'Prompt Engineering': ('prompt engineering',),
+        'MLOps': ('mlops', 'mlflow', 'kubeflow', 'model deployment'),
+        'Reinforcement Learning': ('reinforcement learning',),
+        'Recommender Systems': ('recommender systems', 'recommendation systems'),
+        'Time Series': ('time series', 'forecasting'),
+        'Vector Databases': ('vector database', 'vector databases', 'pinecone', 'weaviate', 'faiss'),
+        'AI': ('artificial intelligence', 'ai'),
+        'Data Science': ('data science',),
+        'SageMaker': ('sagemaker',),
+        'Vertex AI': ('vertex ai',),
+    },
+    'devops': {
+        'Docker': ('docker', 'containers', 'containerization'),
+        'Kubernetes': ('kubernetes', 'k8s', 'eks', 'gke', 'aks'),
+        'Helm': ('helm charts', 'helm chart', 'kubernetes helm'),
+        'Terraform': ('terraform',),
+        'Ansible': ('ansible',),
+        'Puppet': ('puppet enterprise', 'puppet modules', 'puppet manifests'),
+        'Chef': ('chef infra', 'opscode chef', 'chef cookbooks'),
+        'Pulumi': ('pulumi',),
+        'CloudFormation': ('cloudformation',),
+        'CI/CD': ('ci/cd', 'ci cd', 'continuous integration', 'continuous delivery', 'continuous deployment'),
+        'Jenkins': ('jenkins',),
+        'GitHub Actions': ('github actions',),
+        'GitLab CI': ('gitlab ci', 'gitlab-ci'),
+        'CircleCI': ('circleci',),
+        'ArgoCD': ('argocd', 'argo cd', 'gitops'),
+        'Linux': ('linux', 'unix', 'ubuntu', 'centos', 'rhel'),
+        'Bash': ('bash', 'shell scripting'),
+        'Prometheus': ('prometheus',),
+        'Grafana': ('grafana',),
+        'Datadog': ('datadog',),
+        'ELK Stack': ('elk', 'logstash', 'kibana'),
+        'Observability': ('observability', 'monitoring', 'opentelemetry'),
+        'Nginx': ('nginx',),
+        'Infrastructure as Code': ('infrastructure as code', 'iac'),
+        'SRE': ('sre', 'site reliability'),
+        'Networking': ('networking', 'tcp/ip', 'dns', 'load balancing'),
+        'Istio': ('istio', 'service mesh'),
+        'Vagrant': ('vagrant',),
+    },
+    'cloud': {
+        'AWS': ('aws', 'amazon web services', 'ec2', 's3', 'aws lambda', 'ecs', 'cloudwatch'),
+        'Azure': ('azure', 'microsoft azure'),
+        'GCP': ('gcp', 'google cloud', 'google cloud platform'),
+        'Serverless': ('serverless',),
+        'Cloud Architecture': ('cloud architecture', 'cloud native', 'cloud-native'),
+        'Heroku': ('heroku',),
+        'DigitalOcean': ('digitalocean',),
+        'OpenStack': ('openstack',),
+        'Vercel': ('vercel', 'netlify'),
+    },
+    'qa': {
+        'Test Automation': ('test automation', 'automated testing', 'automation testing'),
+        'Selenium': ('selenium', 'webdriver'),
+        'Cypress': ('cypress',),
+        'Playwright': ('playwright',),
+        'Jest': ('jest',),
+        'Mocha': ('mocha', 'chai'),
+        'pytest': ('pytest',),
+        'JUnit': ('junit', 'testng'),
+        'Unit Testing': ('unit testing', 'unit tests', 'tdd', 'test-driven development'),
+        'Integration Testing': ('integration testing', 'end-to-end testing', 'e2e testing'),
+        'Performance Testing': ('performance testing', 'load testing', 'jmeter', 'locust', 'k6'),
+        'Manual Testing': ('manual testing', 'test cases', 'test plans'),
+        'Appium': ('appium',),
+        'Postman': ('postman',),
+        'Cucumber': ('cucumber', 'bdd', 'gherkin'),
+        'QA': ('quality assurance',),
+    },
+    'security': {
+        'Application Security': ('application security', 'appsec', 'secure coding'),
+        'Penetration Testing': ('penetration testing', 'pentesting', 'pen testing', 'ethical hacking'),
+        'OWASP': ('owasp',),
+        'SIEM': ('siem', 'splunk'),
+        'IAM': ('iam', 'identity and access management'),
+        'Cryptography': ('cryptography', 'encryption', 'pki', 'tls'),
+        'Threat Modeling': ('threat modeling', 'threat modelling'),
+        'Vulnerability Management': ('vulnerability management', 'vulnerability assessment'),
+        'Incident Response': ('incident response',),
+        'Network Security': ('network security', 'firewalls', 'ids/ips'),
+        'SOC 2': ('soc 2', 'soc2', 'iso 27001'),
+        'Burp Suite': ('burp suite', 'burp'),
+        'Zero Trust': ('zero trust',),
+    },
+    'design': {
+        'Figma': ('figma',),
+        'Sketch': ('sketch app', 'sketchapp', 'figma and sketch', 'sketch and figma', 'figma, sketch'),
+        'Adobe XD': ('adobe xd',),
+        'Photoshop': ('photoshop',),
+        'Illustrator': ('illustrator',),
+        'InVision': ('invision',),
+        'UX Design': ('ux', 'user experience', 'ux design'),
+        'UI Design': ('ui design', 'user interface design', 'visual design'),
+        'Prototyping': ('prototyping', 'wireframing', 'wireframes'),
+        'User Research': ('user research', 'usability testing'),
+        'Design Systems': ('design systems', 'design system'),
+        'Interaction Design': ('interaction design',),
+    },
+    'management': {
+        'Product Management': ('product management', 'product roadmap', 'roadmapping'),
+        'Project Management': ('project management', 'pmp', 'prince2'),
+        'Agile': ('agile', 'scrum', 'kanban', 'sprint planning'),
+        'Stakeholder Management': ('stakeholder management',),
+        'People Management': ('people management', 'team management', 'managing engineers'),
+        'Jira': ('jira', 'confluence'),
+        'OKRs': ('okrs', 'okr', 'kpis'),
+        'Budgeting': ('budgeting', 'budget management'),
+    },
+    'general': {
+        'Git': ('git', 'github', 'gitlab', 'bitbucket', 'version control'),
+        'Object-Oriented Programming': ('object-oriented', 'object oriented', 'oop'),
+        'Design Patterns': ('design patterns',),
+        'Data Structures': ('data structures', 'algorithms'),
+        'Functional Programming': ('functional programming',),
+        'Code Review': ('code review', 'code reviews'),
+        'Debugging': ('debugging', 'troubleshooting'),
+        'Performance Optimization': ('performance optimization', 'performance tuning', 'profiling'),
+        'Software Architecture': ('software architecture', 'architecture design', 'clean architecture'),
+        'API Design': ('api design', 'api development', 'openapi', 'swagger'),
+        'Technical Writing': ('technical writing', 'documentation'),
+        'Blockchain': ('blockchain', 'solidity', 'web3', 'smart contracts'),
+        'Embedded Systems': ('embedded systems', 'firmware', 'rtos'),
+        'Game Development': ('unity', 'unreal engine', 'game development'),
+        'SAP': ('sap', 'abap'),
+        'Salesforce': ('salesforce', 'apex'),
+        'MATLAB': ('matlab',),
+    },
+    'soft': {
+        'Communication': ('communication', 'communication skills', 'written and verbal communication'),
+        'Teamwork': ('teamwork', 'team player', 'collaboration', 'collaborative'),
+        'Leadership': ('leadership', 'mentoring', 'mentorship', 'coaching'),
+        'Problem Solving': ('problem solving', 'problem-solving', 'analytical skills', 'critical thinking'),
+        'Time Management': ('time management', 'prioritization', 'organizational skills'),
+        'Adaptability': ('adaptability', 'fast-paced environment'),
+        'Ownership': ('ownership', 'self-starter', 'self-motivated', 'proactive'),
+        'Attention to Detail': ('attention to detail', 'detail-oriented', 'detail oriented'),
+        'Customer Focus': ('customer focus', 'customer-focused', 'customer obsession'),
+        'Presentation Skills': ('presentation skills', 'public speaking'),
+        'English': ('fluent english', 'english proficiency'),
+    },
+}
+
+# Title phrases that name a job category outright
+TITLE_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    'fullstack': ('full stack', 'full-stack', 'fullstack'),
+    'frontend': ('frontend', 'front-end', 'front end', 'ui engineer', 'ui developer', 'web developer'),
+    'backend': ('backend', 'back-end', 'back end', 'api engineer', 'server engineer'),
+    'mobile': ('mobile', 'ios', 'android', 'flutter', 'react native'),
+    'machine learning': ('machine learning', 'ml engineer', 'ai engineer', 'data scientist', 'nlp', 'computer vision'),
+    'data': ('data engineer', 'data analyst', 'analytics', 'bi developer', 'business intelligence', 'etl'),
+    'devops': ('devops', 'sre', 'site reliability', 'platform engineer', 'infrastructure', 'cloud engineer'),
+    'qa': ('qa', 'quality assurance', 'test engineer', 'sdet', 'tester'),
+    'security': ('security', 'appsec', 'penetration', 'soc analyst', 'cyber'),
+    'design': ('designer', 'ux', 'ui/ux', 'product design'),
+    'management': ('manager', 'product owner', 'scrum master', 'head of', 'director'),
+}
+
+# Skill groups that contribute to a category's score, with their weight
+CATEGORY_SKILL_GROUPS: Dict[str, Dict[str, float]] = {
+    'frontend': {'frontend': 1.0},
+    'backend': {'backend': 1.0, 'database': 0.5},
+    'mobile': {'mobile': 1.0},
+    'data': {'data': 1.0, 'database': 0.3},
+    'machine learning': {'machine learning': 1.0, 'data': 0.3},
+    'devops': {'devops': 1.0, 'cloud': 0.7},
+    'qa': {'qa': 1.0},
+    'security': {'security': 1.0},
+    'design': {'design': 1.0},
+    'management': {'management': 1.0},
+}
@@ -0,0 +1,277 @@
+"""
+Local search strategy planner.
+
+Plans searches from rules instead of an LLM call: regional job boards for
+the location (e.g. Naukri for India), the remaining platforms ranked by
+their recent performance, and keyword variations remembered from earlier
+LLM plans. The result goes through SearchStrategyAgent._validate_strategy,
+so it has the same structure as an LLM strategy.
+
+The LLM planner still runs, but in the background: the first search for a
+keyword set and location is served from the rules while the LLM plan is
+requested, and later searches get the cached LLM plan. Cached plans older
+than the TTL are served while being refreshed.
+"""
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import LLM_CACHE
+from services.llm_scheduler import llm_priority, PRIORITY_BACKGROUND
+from .platform_performance import expected_jobs_per_second
+from .search_strategy_agent import SearchStrategyAgent
+
+# Get logger
+logger = get_logger(__name__)
+
+
+# Job boards that only serve one region
+REGIONAL_PLATFORMS = {
+    'india': ('naukri',),
+}
+
+# Location terms that identify a region
+REGION_MARKERS = {
+    'india': (
+        'india', 'bengaluru', 'bangalore', 'mumbai', 'delhi', 'new delhi', 'hyderabad', 'pune',
+        'chennai', 'kolkata', 'noida', 'gurgaon', 'gurugram', 'ahmedabad', 'kochi',
+    ),
+}
+
+# Notes added to plans for a region
+REGION_CONSIDERATIONS = {
+    'india': ["Naukri is the largest job board in India; prefer it alongside LinkedIn"],
+}
+
+
+def location_region(location: str) -> Optional[str]:
+    """
+    Get the region of a location.
+
+    Args:
+        location: Job location
+
+    Returns:
+        Region name, or None if the location is not in a known region
+    """
+    parts = {part.strip() for part in location.lower().replace(';', ',').split(',')}
+    text = f" {location.lower()} "
+    for region, markers in REGION_MARKERS.items():
+        if any(marker in parts or f" {marker} " in text for marker in markers):
+            return region
+    return None
+
+
+def region_platforms(location: str, platforms: List[str]) -> List[str]:
+    """
+    Leave out the platforms that only serve a region other than the location's.
+
+    Args:
+        location: Job location
+        platforms: Platform names
+
+    Returns:
+        Platforms that can have jobs in the location, in their original order
+    """
+    region = location_region(location)
+    other_regions = {p for r, boards in REGIONAL_PLATFORMS.items() if r != region for p in boards}
+    return [platform for platform in platforms if platform not in other_regions]
+
+
+def _keywords_key(keywords: List[str]) -> str:
+    """
+    Cache key of a keyword set, independent of order and case.
+    """
+    return '|'.join(sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()}))
+
+
+class LocalStrategyPlanner:
+    """
+    Rule-based search strategy planner with background LLM refinement.
+    """
+    def __init__(
+        self,
+        strategy_agent: SearchStrategyAgent,
+        max_plans: int = 1000,
+        ttl_seconds: int = 86400
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            strategy_agent: Agent used to validate plans and to request LLM plans
+            max_plans: Maximum number of cached LLM plans
+            ttl_seconds: Age after which a cached LLM plan is refreshed
+        """
+        self.strategy_agent = strategy_agent
+        self.max_plans = max_plans
+        self.ttl_seconds = ttl_seconds
+        self.plans: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self.keyword_variations: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.refreshing: Set[Tuple[str, str]] = set()
+        self.tasks: Set[asyncio.Task] = set()
+
+    def plan(
+        self,
+        keywords: List[str],
+        location: str,
+        platforms: List[str],
+        platform_performance: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Plan a search without waiting for the LLM.
+
+        Returns the cached LLM plan when there is one, otherwise a rule-based
+        plan. Missing or stale LLM plans are requested in the background.
+
+        Args:
+            keywords: Search keywords (as enhanced by keyword analysis)
+            location: Job location
+            platforms: Platforms that can be crawled
+            platform_performance: Current performance metrics of each platform
+
+        Returns:
+            Validated strategy dictionary
+        """
+        key = (_keywords_key(keywords), location.strip().lower())
+        cached = self.plans.get(key)
+        if cached is not None:
+            self.plans.move_to_end(key)
+            if time.time() - cached['planned_at'] > self.ttl_seconds:
+                self._refine(key, keywords, location, platform_performance)
+            LLM_CACHE.inc(call='strategy', result='hit')
+            return cached['strategy']
+
+        LLM_CACHE.inc(call='strategy', result='miss')
+        self._refine(key, keywords, location, platform_performance)
+        return self.strategy_agent._validate_strategy(
+            self.rule_based_strategy(keywords, location, platforms, platform_performance),
+            platform_performance
+        )
+
+    def rule_based_strategy(
+        self,
+        keywords: List[str],
+        location: str,
+        platforms: List[str],
+        platform_performance: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build a raw strategy (before validation) from rules.
+
+        Args:
+            keywords: Search keywords
+            location: Job location
+            platforms: Platforms that can be crawled
+            platform_performance: Current performance metrics of each platform
+
+        Returns:
+            Strategy with platforms, filters, keywordVariations and specialConsiderations
+        """
+        region = location_region(location)
+        regional = [p for p in REGIONAL_PLATFORMS.get(region, ()) if p in platforms]
+
+        # Regional boards first, then the general boards by expected jobs per second
+        performance = platform_performance or {}
+        general = sorted(
+            (p for p in region_platforms(location, platforms) if p not in regional),
+            key=lambda p: expected_jobs_per_second(performance.get(p, {})),
+            reverse=True
+        )
+
+        return {
+            'platforms': (regional + general)[:3],
+            'filters': {'datePosted': 'past week'},
+            'keywordVariations': self._variations(keywords),
+            'specialConsiderations': list(REGION_CONSIDERATIONS.get(region, [])),
+        }
+
+    def _variations(self, keywords: List[str]) -> List[str]:
+        """
+        Keyword variations for a keyword set, preferring ones from LLM plans.
+        """
+        cached = self.keyword_variations.get(_keywords_key(keywords))
+        if cached:
+            return list(cached)
+
+        variations = []
+        if len(keywords) > 1:
+            variations.append(' '.join(keywords[:2]))
+        for keyword in keywords:
+            if keyword and keyword not in variations:
+                variations.append(keyword)
+        return variations[:5]
+
+    def _refine(
+        self,
+        key: Tuple[str, str],
+        keywords: List[str],
+        location: str,
+        platform_performance: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Request an LLM plan in the background, unless one is already underway.
+        """
+        if key in self.refreshing:
+            return
+        self.refreshing.add(key)
+
+        # Run outside the current trace so the refinement does not outlive the request's spans
+        coro = self._refine_plan(key, list(keywords), location, platform_performance)
+        task = contextvars.Context().run(asyncio.create_task, coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _refine_plan(
+        self,
+        key: Tuple[str, str],
+        keywords: List[str],
+        location: str,
+        platform_performance: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        """
+        Ask the LLM planner for a strategy and cache it.
+
+        An unparseable response is not replaced with the default strategy
+        here: caching that would override the rule-based plan until it expires.
+        """
+        try:
+            with llm_priority(PRIORITY_BACKGROUND):
+                strategy = await self.strategy_agent.optimize_search_strategy(
+                    keywords, location, platform_performance, fallback=False
+                )
+            self._store(key, strategy)
+            logger.info(f"Cached LLM search strategy for {keywords} in {location}")
+        except Exception as e:
+            logger.error(f"Error refining search strategy: {e}")
+        finally:
+            self.refreshing.discard(key)
+
+    def _store(self, key: Tuple[str, str], strategy: Dict[str, Any]) -> None:
+        """
+        Cache an LLM plan and remember its keyword variations.
+        """
+        self.plans[key] = {'strategy': strategy, 'planned_at': time.time()}
+        self.plans.move_to_end(key)
+        while len(self.plans) > self.max_plans:
+            self.plans.popitem(last=False)
+
+        for platform in strategy.get('platforms', []):
+            variations = [v for v in (strategy.get(platform) or {}).get('keywords', []) if v]
+            if variations:
+                self.keyword_variations[key[0]] = variations
+                self.keyword_variations.move_to_end(key[0])
+                while len(self.keyword_variations) > self.max_plans:
+                    self.keyword_variations.popitem(last=False)
+                break
+
+    async def drain(self) -> None:
+        """
+        Wait for background refinements to finish (e.g. at shutdown or in benchmarks).
+        """
+        if self.tasks:
+            await asyncio.gather(*list(self.tasks), return_exceptions=True)
@@ -3,7 +3,8 @@ API router configuration.
 """
 from fastapi import APIRouter
 
-from api.routes import agent
+from api.routes import agent, traces
 
 api_router = APIRouter()
-api_router.include_router(agent.router, prefix="/agents", tags=["agents"])
\ No newline at end of file
+api_router.include_router(agent.router, prefix="/agents", tags=["agents"])
+api_router.include_router(traces.router, prefix="/traces", tags=["traces"])
\ No newline at end of file
@@ -1,23 +1,75 @@
 """
 Middleware for the API.
 """
+import re
 import time
 import logging
-from typing import Callable
+from typing import Callable, Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from core.logging import get_logger
+from core.tracing import tracer
+from core.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION
 
 
 # Get access logger
 access_logger = get_logger("access")
 
+# Path parameter placeholder in a route path, e.g. {trace_id} or {path:path}
+PATH_PARAM_PATTERN = re.compile(r"{(\w+)(?::\w+)?}")
+
+
+def route_template(request: Request) -> Optional[str]:
+    """
+    Get the full path template of the route that handled a request.
+    
+    Routes of included routers only know the path below their prefix, so the
+    prefix is taken from the concrete request path.
+    
+    Args:
+        request: Request that has been routed
+        
+    Returns:
+        Path template such as /api/v1/traces/{trace_id}, or None if no route matched
+    """
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", None)
+    if route_path is None:
+        return None
+    
+    params = request.scope.get("path_params") or {}
+    concrete = PATH_PARAM_PATTERN.sub(lambda m: str(params.get(m.group(1), m.group(0))), route_path)
+    path = request.url.path
+    if not concrete:
+        # A route declared with path "" is the router's prefix itself
+        return path
+    if path.endswith(concrete):
+        return path[:len(path) - len(concrete)] + route_path
+    return route_path
+
+
+def _record_request(request: Request, status: str, process_time: float) -> None:
+    """
+    Record a handled request in the HTTP metrics.
+    
+    Requests that matched no route share one label value so unknown paths
+    cannot grow the number of series.
+    
+    Args:
+        request: Request that has been handled
+        status: Response status code, or "error" if the app raised
+        process_time: Processing time in seconds
+    """
+    route = route_template(request) or "unmatched"
+    HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+    HTTP_REQUEST_DURATION.observe(process_time, method=request.method, route=route)
+
 
 class LoggingMiddleware(BaseHTTPMiddleware):
     """
-    Middleware to log all requests and responses.
+    Middleware to log all requests and responses and record HTTP metrics.
     """
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
@@ -50,6 +102,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             access_logger.info(
                 f"{client_host} - {method} {url} {response.status_code} - {process_time:.4f}s"
             )
+            _record_request(request, str(response.status_code), process_time)
             
             return response
         except Exception as e:
@@ -58,6 +111,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             access_logger.error(
                 f"{client_host} - {method} {url} ERROR - {process_time:.4f}s - {str(e)}"
             )
+            _record_request(request, "error", process_time)
             raise
 
 
@@ -89,4 +143,40 @@ class APIKeyLoggingMiddleware(BaseHTTPMiddleware):
                 f"Invalid API key used: {api_key[:5]}... from {request.client.host if request.client else 'unknown'}"
             )
         
-        return response
\ No newline at end of file
+        return response
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to open the root tracing span of each request.
+    
+    The trace ID is returned in the X-Trace-Id response header so the trace
+    can be fetched from the traces endpoint.
+    """
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """
+        Process the request inside a root span.
+        
+        Args:
+            request: The incoming request
+            call_next: The next middleware to call
+            
+        Returns:
+            The response from the next middleware, with an X-Trace-Id header
+        """
+        with tracer.span(
+            f"{request.method} {request.url.path}",
+            **{'http.method': request.method, 'http.target': request.url.path}
+        ) as span:
+            response = await call_next(request)
+            
+            if span:
+                # Name the trace after the route template once routing has run
+                template = route_template(request)
+                if template:
+                    span.name = f"{request.method} {template}"
+                span.set_attribute('http.status_code', response.status_code)
+                response.headers["X-Trace-Id"] = span.trace_id
+            
+            return response
@@ -7,11 +7,13 @@ including job discovery, keyword analysis, and search strategy optimization.
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
 
 from core.config import settings
 from core.logging import get_logger
 from agents.job_discovery import JobDiscoveryAgent
+from services.search_executor import search_executor, SearchQueueFullError, FINISHED_STATES
+from services.admission_control import admission_controller, AdmissionRejectedError
 from api.deps import verify_api_key
 
 # Get logger
@@ -117,7 +119,6 @@ class JobSearchResponse(BaseModel):
     response_model=JobSearchResponse,
     status_code=status.HTTP_200_OK,
     summary="Search for jobs",
-    dependencies=[Depends(verify_api_key)],
     description="""
     Search for jobs using the Job Discovery Agent.
     
@@ -133,16 +134,23 @@ class JobSearchResponse(BaseModel):
     - Query Refinement
     - Distributed Crawling
     - Rate Limiting
+    
+    Searches wait for one of a limited number of crawl slots. When the
+    server is overloaded the search is turned away with 503, and when the
+    API key already has too many searches with 429, both with a
+    Retry-After header.
     """
 )
 async def search_jobs(
-    request: JobSearchRequest
+    request: JobSearchRequest,
+    api_key: str = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """
     Search for jobs using the Job Discovery Agent.
     
     Args:
         request: Job search request with keywords and location
+        api_key: API key of the request, for its concurrency limit
         
     Returns:
         Dictionary with search results
@@ -150,11 +158,12 @@ async def search_jobs(
     logger.info(f"Job search request received: keywords={request.keywords}, location={request.location}")
     
     try:
-        # Execute job search
-        jobs = await job_discovery_agent.search_jobs(
-            keywords=request.keywords,
-            location=request.location
-        )
+        # Execute job search once it has a crawl slot
+        async with admission_controller.admit(api_key):
+            jobs = await job_discovery_agent.search_jobs(
+                keywords=request.keywords,
+                location=request.location
+            )
         
         logger.info(f"Job search completed successfully: found {len(jobs)} jobs")
         
@@ -163,6 +172,12 @@ async def search_jobs(
             "count": len(jobs),
             "jobs": jobs
         }
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Error searching jobs: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -171,12 +186,210 @@ async def search_jobs(
         )
 
 
+class SearchSubmitResponse(BaseModel):
+    """Background search submission response model."""
+    search_id: str = Field(..., description="ID of the search, for polling")
+    status: str = Field(..., description="Search status (queued, running, completed, failed)")
+    status_url: str = Field(..., description="URL of the search status")
+    results_url: str = Field(..., description="URL of the search results")
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "search_id": "5f0c6f7e2b7d4c1f9a3e8d2b1c0a9f8e",
+                "status": "queued",
+                "status_url": "/api/v1/agents/job-discovery/searches/5f0c6f7e2b7d4c1f9a3e8d2b1c0a9f8e",
+                "results_url": "/api/v1/agents/job-discovery/searches/5f0c6f7e2b7d4c1f9a3e8d2b1c0a9f8e/results"
+            }
+        }
+
+
+class SearchStatusResponse(BaseModel):
+    """Background search status response model."""
+    search_id: str = Field(..., description="ID of the search")
+    status: str = Field(..., description="Search status (queued, running, completed, failed)")
+    stage: Optional[str] = Field(None, description="Stage of a running search (crawling, analyzing)")
+    keywords: List[str] = Field(..., description="Search keywords")
+    location: str = Field(..., description="Search location")
+    count: int = Field(..., description="Number of jobs found so far")
+    queue_position: Optional[int] = Field(None, description="Searches ahead of a queued search")
+    submitted_at: float = Field(..., description="Submission time as a Unix timestamp")
+    started_at: Optional[float] = Field(None, description="Start time as a Unix timestamp")
+    finished_at: Optional[float] = Field(None, description="Finish time as a Unix timestamp")
+    expires_at: Optional[float] = Field(None, description="Time the results are deleted, once finished")
+    trace_id: Optional[str] = Field(None, description="Trace ID of the search, for the traces endpoint")
+    error: Optional[str] = Field(None, description="Error of a failed search")
+
+
+class SearchResultsResponse(BaseModel):
+    """Background search results response model."""
+    search_id: str = Field(..., description="ID of the search")
+    status: str = Field(..., description="Search status (queued, running, completed, failed)")
+    complete: bool = Field(..., description="Whether these are the final results")
+    total: int = Field(..., description="Number of jobs found so far")
+    offset: int = Field(..., description="Offset of the first job returned")
+    limit: int = Field(..., description="Maximum number of jobs returned")
+    jobs: List[Dict[str, Any]] = Field(..., description="Page of jobs")
+
+
+def _search_urls(search_id: str) -> Dict[str, str]:
+    """
+    Build the status and results URLs of a background search.
+    """
+    status_url = f"{settings.API_V1_STR}/agents/job-discovery/searches/{search_id}"
+    return {"status_url": status_url, "results_url": f"{status_url}/results"}
+
+
+async def _get_search_or_404(search_id: str, api_key: str) -> Dict[str, Any]:
+    """
+    Get a background search, or raise a 404 if it is unknown, expired or
+    was submitted with another API key.
+    """
+    record = await search_executor.get(search_id, api_key)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Search {search_id} not found or expired"
+        )
+    return record
+
+
+@router.post(
+    "/job-discovery/searches",
+    response_model=SearchSubmitResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit a background job search",
+    description="""
+    Queue a job search and return its ID at once.
+    
+    The search runs in the background. Poll the status URL for its progress
+    and fetch (partial, then final) results from the results URL. Results are
+    kept for SEARCH_RESULT_TTL_SECONDS after the search finishes. Returns 503
+    with a Retry-After header when too many searches are already queued, and
+    429 when the API key already has too many searches waiting or running.
+    """
+)
+async def submit_search(
+    request: JobSearchRequest,
+    response: Response,
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Queue a job search.
+    
+    Args:
+        request: Job search request with keywords and location
+        response: Response, for the Location header
+        api_key: API key of the request, for its concurrency limit
+        
+    Returns:
+        Dictionary with the search ID and its URLs
+    """
+    logger.info(f"Background job search submitted: keywords={request.keywords}, location={request.location}")
+    try:
+        record = await search_executor.submit(
+            job_discovery_agent.search_jobs, request.keywords, request.location, key=api_key
+        )
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except SearchQueueFullError as e:
+        logger.warning(f"Background job search refused: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Too many searches queued: {e}",
+            headers={"Retry-After": str(search_executor.retry_after())}
+        )
+    
+    urls = _search_urls(record["search_id"])
+    response.headers["Location"] = urls["status_url"]
+    return {"search_id": record["search_id"], "status": record["status"], **urls}
+
+
+@router.get(
+    "/job-discovery/searches/{search_id}",
+    response_model=SearchStatusResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the status of a background job search",
+)
+async def get_search_status(
+    search_id: str,
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Get the status of a background job search.
+    
+    Args:
+        search_id: Search ID returned on submission
+        api_key: API key of the request, which must have submitted the search
+        
+    Returns:
+        Dictionary with the search status
+    """
+    record = await _get_search_or_404(search_id, api_key)
+    return {
+        **{key: value for key, value in record.items() if key not in ("jobs", "owner")},
+        "count": len(record["jobs"]),
+        "queue_position": search_executor.queue_position(record),
+    }
+
+
+@router.get(
+    "/job-discovery/searches/{search_id}/results",
+    response_model=SearchResultsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the results of a background job search",
+    description="""
+    Get a page of the jobs a background search has found. While the search
+    runs these are partial results (crawled jobs, before analysis);
+    `complete` is true once they are final.
+    """
+)
+async def get_search_results(
+    search_id: str,
+    offset: int = Query(0, ge=0, description="Offset of the first job"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of jobs"),
+    api_key: str = Depends(verify_api_key)
+) -> Dict[str, Any]:
+    """
+    Get a page of the results of a background job search.
+    
+    Args:
+        search_id: Search ID returned on submission
+        offset: Offset of the first job
+        limit: Maximum number of jobs
+        api_key: API key of the request, which must have submitted the search
+        
+    Returns:
+        Dictionary with the page of jobs
+    """
+    record = await _get_search_or_404(search_id, api_key)
+    jobs = record["jobs"]
+    return {
+        "search_id": search_id,
+        "status": record["status"],
+        "complete": record["status"] in FINISHED_STATES,
+        "total": len(jobs),
+        "offset": offset,
+        "limit": limit,
+        "jobs": jobs[offset:offset + limit],
+    }
+
+
 class PlatformStats(BaseModel):
     """Platform statistics model."""
     success_rate: float = Field(..., description="Success rate of the platform")
     avg_response_time: float = Field(..., description="Average response time in seconds")
     job_count: int = Field(..., description="Number of jobs found")
     last_crawl_time: Optional[str] = Field(None, description="Last time the platform was crawled")
+    searches: int = Field(0, description="Number of searches crawled")
+    avg_results: float = Field(0.0, description="Average number of jobs returned per search")
+    p50_response_time: float = Field(0.0, description="Median search time in seconds over the rolling window")
+    p95_response_time: float = Field(0.0, description="95th percentile search time in seconds over the rolling window")
+    window_success_rate: Optional[float] = Field(None, description="Success rate over the rolling window")
     
     class Config:
         schema_extra = {
@@ -184,7 +397,12 @@ class PlatformStats(BaseModel):
                 "success_rate": 0.95,
                 "avg_response_time": 2.3,
                 "job_count": 150,
-                "last_crawl_time": "2023-05-15T14:30:00Z"
+                "last_crawl_time": "2023-05-15T14:30:00Z",
+                "searches": 12,
+                "avg_results": 14.2,
+                "p50_response_time": 2.1,
+                "p95_response_time": 4.8,
+                "window_success_rate": 1.0
             }
         }
 
@@ -226,10 +444,10 @@ class StatsResponse(BaseModel):
     Get statistics about the job discovery process.
     
     Returns performance metrics for each job platform, including:
-    - Success rate
-    - Average response time
+    - Success rate and average response time (moving averages over recent searches)
     - Number of jobs found
     - Last crawl time
+    - Response time percentiles and success rate over the rolling window
     
     This information is used by the Adaptive Crawling technique to optimize platform selection.
     """
@@ -0,0 +1,99 @@
+"""
+Trace routes for the API.
+
+This module exposes the recent request traces kept by the in-process tracer,
+so the time a slow request spent in each stage can be inspected.
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from fastapi import APIRouter, HTTPException, status, Query, Depends
+
+from core.tracing import tracer
+from api.deps import verify_api_key
+
+router = APIRouter()
+
+
+class SpanResponse(BaseModel):
+    """Span model."""
+    name: str = Field(..., description="Span name")
+    span_id: str = Field(..., description="Span ID")
+    parent_id: Optional[str] = Field(None, description="ID of the parent span")
+    start_time: float = Field(..., description="Start time as a Unix timestamp")
+    duration_ms: Optional[float] = Field(None, description="Duration in milliseconds")
+    attributes: Dict[str, Any] = Field(..., description="Span attributes")
+    error: Optional[str] = Field(None, description="Error raised inside the span")
+
+
+class TraceResponse(BaseModel):
+    """Trace response model."""
+    trace_id: str = Field(..., description="Trace ID")
+    name: str = Field(..., description="Name of the root span")
+    start_time: float = Field(..., description="Start time as a Unix timestamp")
+    duration_ms: Optional[float] = Field(None, description="Duration in milliseconds, None while running")
+    spans: List[SpanResponse] = Field(..., description="Spans ordered by start time")
+
+
+class TraceSummary(BaseModel):
+    """Trace summary model."""
+    trace_id: str = Field(..., description="Trace ID")
+    name: str = Field(..., description="Name of the root span")
+    start_time: float = Field(..., description="Start time as a Unix timestamp")
+    duration_ms: Optional[float] = Field(None, description="Duration in milliseconds, None while running")
+    span_count: int = Field(..., description="Number of finished spans")
+
+
+@router.get(
+    "",
+    response_model=List[TraceSummary],
+    status_code=status.HTTP_200_OK,
+    summary="List recent traces",
+    dependencies=[Depends(verify_api_key)],
+)
+async def list_traces(
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of traces")
+) -> List[Dict[str, Any]]:
+    """
+    List the most recent request traces, newest first.
+    
+    Args:
+        limit: Maximum number of traces
+        
+    Returns:
+        List of trace summaries
+    """
+    return tracer.recent_traces(limit)
+
+
+@router.get(
+    "/{trace_id}",
+    response_model=TraceResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get a trace",
+    dependencies=[Depends(verify_api_key)],
+    description="""
+    Get the spans of a recent request by the trace ID returned in its
+    X-Trace-Id response header.
+    """
+)
+async def get_trace(trace_id: str) -> Dict[str, Any]:
+    """
+    Get a recent request trace.
+    
+    Args:
+        trace_id: Trace ID
+        
+    Returns:
+        Trace with its spans
+        
+    Raises:
+        HTTPException: If the trace is unknown or has been evicted
+    """
+    trace = tracer.get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trace {trace_id} not found"
+        )
+    return trace
@@ -4,14 +4,17 @@ Main application entry point for the Agentic AI Job Application System backend.
 import logging
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security.api_key import APIKeyHeader
 from fastapi.openapi.models import SecuritySchemeType
 
 from core.config import settings
 from core.logging import get_logger
+from core.metrics import metrics
 from api.api import api_router
 from api.deps import verify_api_key
-from api.middleware import LoggingMiddleware, APIKeyLoggingMiddleware
+from api.middleware import LoggingMiddleware, APIKeyLoggingMiddleware, TracingMiddleware
+from agents.crawlers import AiohttpCrawler
 
 # Get logger
 logger = get_logger(__name__)
@@ -52,6 +55,9 @@ app.add_middleware(
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(APIKeyLoggingMiddleware)
 
+# Add tracing middleware (added last so the root span covers the other middleware)
+app.add_middleware(TracingMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -67,6 +73,7 @@ async def startup_event():
 async def shutdown_event():
     """Log when the application shuts down."""
     logger.info("Application shutdown")
+    await AiohttpCrawler.close_session()
 
 # Root endpoint
 @app.get("/")
@@ -87,6 +94,12 @@ async def health():
         "api_version": "0.1.0"
     }
 
+# Metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
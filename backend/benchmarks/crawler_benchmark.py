@@ -0,0 +1,216 @@
+"""
+Crawler throughput benchmark.
+
+Runs each crawler against the local fake job board and reports pages/s,
+jobs/s, p50/p95 search latency and peak RSS. Human-like delays, backoffs
+and the per-domain rate limit are switched off so the numbers reflect the
+crawler itself.
+
+Run from the backend directory:
+    python -m benchmarks.crawler_benchmark --platforms linkedin indeed --runs 5
+"""
+from typing import List, Dict, Any
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from core.config import settings
+from core import mongodb
+from agents.crawlers import (
+    AiohttpCrawler, LinkedInAiohttpCrawler, LinkedInCrawler, IndeedCrawler, GlassdoorCrawler
+)
+from agents.crawlers.crawl_recorder import load_recorded_pages
+from agents.crawlers.detail_cache import detail_cache
+from agents.crawlers.rate_limiter import rate_limiter
+from .fake_job_board import FakeJobBoard, synthetic_pages
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Benchmark name -> (crawler class, fixture platform)
+CRAWLERS = {
+    'linkedin': (LinkedInAiohttpCrawler, 'linkedin'),
+    'linkedin-browser': (LinkedInCrawler, 'linkedin'),
+    'indeed': (IndeedCrawler, 'indeed'),
+    'glassdoor': (GlassdoorCrawler, 'glassdoor'),
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Get a percentile by linear interpolation.
+
+    Args:
+        values: Samples
+        fraction: Percentile as a fraction (e.g. 0.95)
+
+    Returns:
+        Percentile value, or 0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of this process and its finished children.
+
+    Returns:
+        Peak RSS in MB, or 0 where the resource module is unavailable
+    """
+    if resource is None:
+        return 0.0
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def reset_crawl_state() -> None:
+    """
+    Forget watermarks, cached details and stored jobs so the next run is cold.
+    """
+    mongodb.crawl_watermarks.clear()
+    mongodb.job_detail_cache.clear()
+    mongodb.job_listings.clear()
+    mongodb.jobs_by_external_id.clear()
+    detail_cache.entries.clear()
+
+
+async def benchmark_crawler(
+    name: str,
+    board: FakeJobBoard,
+    keywords: List[str],
+    location: str,
+    runs: int,
+    max_results: int,
+    warm: bool
+) -> Dict[str, Any]:
+    """
+    Run one crawler repeatedly against the fake job board.
+
+    Args:
+        name: Benchmark name of the crawler
+        board: Running fake job board
+        keywords: Search keywords
+        location: Search location
+        runs: Number of searches
+        max_results: Jobs requested per search
+        warm: Keep watermarks and the detail cache between runs
+
+    Returns:
+        Dictionary of results
+    """
+    crawler_class, source = CRAWLERS[name]
+    durations = []
+    job_counts = []
+    page_counts = []
+
+    for _ in range(runs):
+        if not warm:
+            reset_crawl_state()
+        rate_limiter.backoff_until.clear()
+        board.reset_counts()
+
+        crawler = crawler_class()
+        started = time.perf_counter()
+        jobs = await crawler.search(keywords, location, max_results)
+        durations.append(time.perf_counter() - started)
+        job_counts.append(len(jobs))
+        page_counts.append(board.request_counts[source])
+
+    total_time = sum(durations) or 1e-9
+    return {
+        'crawler': name,
+        'runs': runs,
+        'pages': sum(page_counts),
+        'jobs': sum(job_counts),
+        'pages_per_second': sum(page_counts) / total_time,
+        'jobs_per_second': sum(job_counts) / total_time,
+        'p50_seconds': percentile(durations, 0.5),
+        'p95_seconds': percentile(durations, 0.95),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """
+    Print benchmark results as a table.
+    """
+    header = f"{'crawler':<18}{'runs':>6}{'pages':>8}{'jobs':>8}{'pages/s':>10}{'jobs/s':>10}{'p50 s':>9}{'p95 s':>9}{'peak RSS MB':>13}"
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        print(
+            f"{result['crawler']:<18}{result['runs']:>6}{result['pages']:>8}{result['jobs']:>8}"
+            f"{result['pages_per_second']:>10.1f}{result['jobs_per_second']:>10.1f}"
+            f"{result['p50_seconds']:>9.2f}{result['p95_seconds']:>9.2f}{result['peak_rss_mb']:>13.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Start the fake job board and benchmark the selected crawlers.
+    """
+    sources = sorted({CRAWLERS[name][1] for name in args.platforms})
+    fixtures = []
+    for source in sources:
+        recorded = load_recorded_pages(args.fixtures, source) if args.fixtures else []
+        fixtures.extend(recorded or synthetic_pages(source, args.pages))
+
+    board = FakeJobBoard(
+        fixtures,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    settings.CRAWLER_SITE_OVERRIDES = await board.start()
+    settings.CRAWLER_DELAY_SCALE = 0.0
+    rate_limiter.requests_per_minute = args.requests_per_minute
+    rate_limiter.interval = 60 / args.requests_per_minute
+
+    results = []
+    try:
+        for name in args.platforms:
+            results.append(await benchmark_crawler(
+                name, board, args.keywords, args.location, args.runs, args.max_results, args.warm
+            ))
+    finally:
+        await AiohttpCrawler.close_session()
+        await board.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark crawlers against a local fake job board")
+    parser.add_argument('--platforms', nargs='+', choices=sorted(CRAWLERS), default=['linkedin', 'indeed', 'glassdoor'])
+    parser.add_argument('--fixtures', help="Directory of recorded pages (synthetic pages if omitted)")
+    parser.add_argument('--pages', type=int, default=5, help="Synthetic search pages per endpoint")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-results', type=int, default=settings.CRAWLER_MAX_RESULTS)
+    parser.add_argument('--keywords', nargs='+', default=['python', 'developer'])
+    parser.add_argument('--location', default='New York')
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=25.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--requests-per-minute', type=int, default=60000, help="Per-domain rate limit during the run")
+    parser.add_argument('--warm', action='store_true', help="Keep watermarks and cached details between runs")
+    parser.add_argument('--seed', type=int, default=None)
+    print_report(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,358 @@
+"""
+Local fake job board for crawler benchmarks.
+
+Serves recorded pages (see agents/crawlers/crawl_recorder.py) or generated
+synthetic pages for each platform from its own local port, with configurable
+latency, server errors and 429 responses. Point the crawlers at it with
+CRAWLER_SITE_OVERRIDES.
+
+Run standalone with:
+    python -m benchmarks.fake_job_board --fixtures fixtures/ --latency-ms 80
+"""
+from typing import List, Dict, Any, Optional, Tuple
+import argparse
+import asyncio
+import random
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs
+
+from aiohttp import web
+
+from agents.crawlers.crawl_recorder import load_recorded_pages
+
+
+# Origins of the real sites, rewritten to the fake board's origin in served pages
+SITE_ORIGINS = {
+    'linkedin': 'https://www.linkedin.com',
+    'indeed': 'https://www.indeed.com',
+    'glassdoor': 'https://www.glassdoor.com',
+}
+
+# Query parameters the platforms paginate search results with
+PAGE_PARAMS = ('start', 'p')
+
+# Search pages generated per platform: (path, page param, first value, step, jobs per page)
+SYNTHETIC_SEARCH_PAGES = {
+    'linkedin': [
+        ('/jobs-guest/jobs/api/seeMoreJobPostings/search', 'start', 0, 10, 10),
+        ('/jobs/search', 'start', 0, 25, 25),
+    ],
+    'indeed': [('/jobs', 'start', 0, 10, 10)],
+    'glassdoor': [('/Job/jobs.htm', 'p', 1, 1, 30)],
+}
+
+TITLES = ['Python Developer', 'Backend Engineer', 'Data Engineer', 'Machine Learning Engineer', 'DevOps Engineer']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli']
+PARAGRAPH = (
+    "<p>We are looking for an engineer to build and operate services in Python. "
+    "You will work with FastAPI, PostgreSQL, Docker and AWS, and collaborate with "
+    "product and data teams.</p>"
+)
+
+
+def _card_html(source: str, job_id: int, index: int) -> str:
+    """
+    Build the HTML of one synthetic job card.
+
+    Args:
+        source: Platform name
+        job_id: Numeric job ID
+        index: Position used to vary titles and companies
+
+    Returns:
+        Card HTML matching the platform's search selector spec
+    """
+    title = TITLES[index % len(TITLES)]
+    company = COMPANIES[index % len(COMPANIES)]
+    slug = title.lower().replace(' ', '-')
+    posted = (datetime.now() - timedelta(hours=index)).strftime('%Y-%m-%d')
+
+    if source == 'linkedin':
+        return (
+            f'<li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+            f'<a class="base-card__full-link" href="{SITE_ORIGINS[source]}/jobs/view/{slug}-{job_id}?trk=public_jobs"></a>'
+            f'<h3 class="base-search-card__title">{title}</h3>'
+            f'<h4 class="base-search-card__subtitle">{company}</h4>'
+            f'<span class="job-search-card__location">New York, NY</span>'
+            f'<time datetime="{posted}">{index} hours ago</time></div></li>'
+        )
+    if source == 'indeed':
+        return (
+            f'<div class="job_seen_beacon"><h2 class="jobTitle">'
+            f'<a class="jcs-JobTitle" data-jk="{job_id:x}" href="/viewjob?jk={job_id:x}">{title}</a></h2>'
+            f'<span class="companyName">{company}</span>'
+            f'<div class="companyLocation">New York, NY</div>'
+            f'<div class="salary-snippet-container">$120,000 - $150,000 a year</div></div>'
+        )
+    return (
+        f'<li class="react-job-listing" data-id="{job_id}">'
+        f'<a href="/job-listing/{slug}?jl={job_id}"><div class="job-title">{title}</div></a>'
+        f'<div class="employer-name">{company}</div><div class="location">New York, NY</div>'
+        f'<span class="salary-estimate">$120K - $150K</span></li>'
+    )
+
+
+def _detail_html(source: str, index: int) -> str:
+    """
+    Build the HTML of one synthetic job posting.
+
+    Args:
+        source: Platform name
+        index: Position used to vary the description length
+
+    Returns:
+        Detail page HTML matching the platform's detail selector spec
+    """
+    description = PARAGRAPH * (3 + index % 5)
+    if source == 'linkedin':
+        return (
+            f'<section class="description"><div class="description__text">'
+            f'<div class="show-more-less-html__markup">{description}</div></div>'
+            f'<ul><li class="description__job-criteria-item"><h3>Employment type</h3>'
+            f'<span>Full-time</span></li></ul></section>'
+        )
+    if source == 'indeed':
+        return f'<div id="jobDescriptionText">{description}</div>'
+    return (
+        f'<div class="jobDescriptionContent">{description}</div>'
+        f'<div><span>Employment Type</span><span>Full-time</span></div>'
+    )
+
+
+def synthetic_pages(source: str, pages: int = 5, detail_pages: int = 10) -> List[Dict[str, Any]]:
+    """
+    Generate fixture pages for a platform without recording the real site.
+
+    Args:
+        source: Platform name
+        pages: Number of search result pages per search endpoint
+        detail_pages: Number of distinct job postings
+
+    Returns:
+        List of fixture dictionaries in the recorded-page format
+    """
+    origin = SITE_ORIGINS[source]
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    fixtures = []
+
+    for endpoint, (path, param, first, step, per_page) in enumerate(SYNTHETIC_SEARCH_PAGES[source]):
+        for page in range(pages):
+            cards = ''.join(
+                _card_html(source, 4000000000 + endpoint * 100000 + page * 1000 + n, page * per_page + n)
+                for n in range(per_page)
+            )
+            fixtures.append({
+                'url': f"{origin}{path}?{param}={first + page * step}",
+                'source': source,
+                'kind': 'search',
+                'status': 200,
+                'headers': headers,
+                'html': f'<html><body><ul class="jobs-search__results-list">{cards}</ul></body></html>',
+            })
+
+    for index in range(detail_pages):
+        fixtures.append({
+            'url': f"{origin}/synthetic/job/{index}",
+            'source': source,
+            'kind': 'detail',
+            'status': 200,
+            'headers': {**headers, 'ETag': f'"synthetic-{index}"'},
+            'html': f'<html><body>{_detail_html(source, index)}</body></html>',
+        })
+
+    return fixtures
+
+
+def _page_key(path: str, query: Dict[str, List[str]]) -> Tuple[str, Optional[str]]:
+    """
+    Get the lookup key of a search page: its path and pagination value.
+    """
+    page = next((query[param][0] for param in PAGE_PARAMS if param in query), None)
+    return path.rstrip('/') or '/', page
+
+
+class FakeJobBoard:
+    """
+    Replays job board pages on local ports, one per platform.
+
+    Search pages are matched by path and pagination parameter; requests past
+    the last recorded page get an empty results page. Any other path is
+    treated as a job posting and served from the platform's detail pages,
+    by exact URL when recorded and otherwise by a stable hash of the path.
+    """
+    def __init__(
+        self,
+        fixtures: List[Dict[str, Any]],
+        latency_ms: float = 50.0,
+        latency_jitter_ms: float = 25.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        host: str = '127.0.0.1',
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.host = host
+        self.random = random.Random(seed)
+        self.search_pages: Dict[str, Dict[Tuple[str, Optional[str]], Dict[str, Any]]] = defaultdict(dict)
+        self.detail_pages: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.search_paths: Dict[str, set] = defaultdict(set)
+        self.runners: List[web.AppRunner] = []
+        self.origins: Dict[str, str] = {}
+        self.request_counts: Dict[str, int] = defaultdict(int)
+        self.status_counts: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+        for fixture in fixtures:
+            parsed = urlparse(fixture['url'])
+            if fixture['kind'] == 'search':
+                key = _page_key(parsed.path, parse_qs(parsed.query))
+                self.search_pages[fixture['source']][key] = fixture
+                self.search_paths[fixture['source']].add(key[0])
+            else:
+                self.detail_pages[fixture['source']][f"{parsed.path}?{parsed.query}"] = fixture
+
+    @property
+    def sources(self) -> List[str]:
+        """
+        Platforms with fixtures.
+        """
+        return sorted(set(self.search_pages) | set(self.detail_pages))
+
+    async def start(self) -> str:
+        """
+        Start serving every platform on its own port.
+
+        Returns:
+            Value for CRAWLER_SITE_OVERRIDES pointing the crawlers at the board
+        """
+        for source in self.sources:
+            app = web.Application()
+            app['source'] = source
+            app.router.add_route('GET', '/{tail:.*}', self._handle)
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, self.host, 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            self.runners.append(runner)
+            self.origins[source] = f"http://{self.host}:{port}"
+
+        return ','.join(f"{source}={origin}" for source, origin in self.origins.items())
+
+    async def stop(self) -> None:
+        """
+        Stop all platform servers.
+        """
+        for runner in self.runners:
+            await runner.cleanup()
+        self.runners = []
+
+    def reset_counts(self) -> None:
+        """
+        Reset the request and status counters.
+        """
+        self.request_counts.clear()
+        self.status_counts.clear()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """
+        Serve one request with the configured latency and failure injection.
+        """
+        source = request.app['source']
+        self.request_counts[source] += 1
+
+        delay = max(0.0, self.random.gauss(self.latency_ms, self.latency_jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        draw = self.random.random()
+        if draw < self.throttle_rate:
+            return self._respond(source, web.Response(status=429, headers={'Retry-After': '1'}))
+        if draw < self.throttle_rate + self.error_rate:
+            return self._respond(source, web.Response(status=500, text='Internal Server Error'))
+
+        fixture = self._find_fixture(source, request)
+        if fixture is None:
+            return self._respond(source, web.Response(
+                status=200, text='<html><body></body></html>', content_type='text/html'
+            ))
+
+        headers = {
+            key: value for key, value in fixture.get('headers', {}).items()
+            if key.lower() != 'content-type'
+        }
+        body = fixture['html'].replace(SITE_ORIGINS.get(source, ''), self.origins[source])
+        return self._respond(source, web.Response(
+            status=fixture.get('status', 200), text=body, content_type='text/html', headers=headers
+        ))
+
+    def _find_fixture(self, source: str, request: web.Request) -> Optional[Dict[str, Any]]:
+        """
+        Find the fixture to serve for a request.
+
+        Returns:
+            Fixture dictionary, or None for an empty results page
+        """
+        key = _page_key(request.path, parse_qs(request.query_string))
+        if key[0] in self.search_paths[source]:
+            return self.search_pages[source].get(key)
+
+        details = self.detail_pages[source]
+        if not details:
+            return None
+        exact = details.get(f"{request.path}?{request.query_string}")
+        if exact:
+            return exact
+        ordered = sorted(details)
+        return details[ordered[zlib.crc32(request.path_qs.encode('utf-8')) % len(ordered)]]
+
+    def _respond(self, source: str, response: web.Response) -> web.Response:
+        """
+        Count a response by status before returning it.
+        """
+        self.status_counts[source][response.status] += 1
+        return response
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """
+    Run the fake job board until interrupted.
+    """
+    fixtures = load_recorded_pages(args.fixtures) if args.fixtures else []
+    if not fixtures:
+        fixtures = [page for source in SITE_ORIGINS for page in synthetic_pages(source, args.pages)]
+
+    board = FakeJobBoard(
+        fixtures,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    overrides = await board.start()
+    print(f"CRAWLER_SITE_OVERRIDES={overrides}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await board.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve job board fixtures locally")
+    parser.add_argument('--fixtures', help="Directory of recorded pages (synthetic pages if omitted)")
+    parser.add_argument('--pages', type=int, default=5, help="Synthetic search pages per endpoint")
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=25.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
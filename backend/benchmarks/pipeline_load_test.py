@@ -0,0 +1,295 @@
+"""
+End-to-end load test of the job search endpoint.
+
+Starts the stub LLM server and the fake job board, points the app at them
+and drives POST /api/v1/agents/job-discovery/search concurrently through
+the ASGI app in-process. Reports throughput, latency percentiles and a
+per-stage breakdown (keyword analysis, strategy, each crawler,
+categorization and raw LLM calls).
+
+Run from the backend directory:
+    python -m benchmarks.pipeline_load_test --requests 50 --concurrency 10
+"""
+from typing import List, Dict, Any, Callable
+import argparse
+import asyncio
+import functools
+import time
+from collections import defaultdict
+
+import httpx
+
+from core.config import settings
+from agents.crawlers import AiohttpCrawler
+from agents.crawlers.rate_limiter import rate_limiter
+from .crawler_benchmark import percentile, peak_rss_mb, reset_crawl_state
+from .fake_job_board import FakeJobBoard, SITE_ORIGINS, synthetic_pages
+from .stub_llm_server import StubLLMServer
+
+
+class StageTimings:
+    """
+    Collects wall-clock durations of pipeline stages by wrapping agent methods.
+    """
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.failures: Dict[str, int] = defaultdict(int)
+
+    def wrap(self, obj: Any, method_name: str, stage: str) -> None:
+        """
+        Replace an instance's coroutine method with a timed wrapper.
+
+        Args:
+            obj: Object whose method to time
+            method_name: Name of the coroutine method
+            stage: Stage name to record durations under
+        """
+        method: Callable = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            except Exception:
+                self.failures[stage] += 1
+                raise
+            finally:
+                self.durations[stage].append(time.perf_counter() - started)
+
+        setattr(obj, method_name, timed)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the recorded stages.
+
+        Returns:
+            One dictionary per stage, slowest total first
+        """
+        rows = []
+        for stage, durations in self.durations.items():
+            rows.append({
+                'stage': stage,
+                'calls': len(durations),
+                'failures': self.failures.get(stage, 0),
+                'p50_seconds': percentile(durations, 0.5),
+                'p95_seconds': percentile(durations, 0.95),
+                'total_seconds': sum(durations),
+            })
+        return sorted(rows, key=lambda row: row['total_seconds'], reverse=True)
+
+
+def instrument(agent: Any, timings: StageTimings) -> None:
+    """
+    Time the stages of a JobDiscoveryAgent.
+
+    Args:
+        agent: JobDiscoveryAgent serving the endpoint
+        timings: Collector to record into
+    """
+    timings.wrap(agent.job_analyzer, 'analyze_keywords', 'keyword_analysis')
+    timings.wrap(agent.strategy_agent, 'optimize_search_strategy', 'strategy')
+    timings.wrap(agent.strategy_agent, 'analyze_and_plan', 'combined_plan')
+    timings.wrap(agent.job_analyzer, 'categorize_jobs', 'batch_categorization')
+    timings.wrap(agent.job_analyzer, 'categorize_job', 'categorization')
+    timings.wrap(agent.groq_service, 'generate_list', 'llm_call')
+    timings.wrap(agent.groq_service, 'generate_json', 'llm_call')
+    for source, crawler in agent.crawlers.items():
+        timings.wrap(crawler, 'search', f"crawl:{source}")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Start the fakes, run the load test and collect results.
+    """
+    llm = StubLLMServer(
+        median_ms=args.llm_median_ms,
+        sigma=args.llm_sigma,
+        tokens_per_second=args.llm_tokens_per_second,
+        error_rate=args.llm_error_rate,
+        throttle_rate=args.llm_throttle_rate,
+        requests_per_minute=args.llm_rpm_limit,
+        malformed_json_rate=args.llm_malformed_json_rate,
+        seed=args.seed,
+    )
+    board = FakeJobBoard(
+        [page for source in SITE_ORIGINS for page in synthetic_pages(source, args.pages)],
+        latency_ms=args.board_latency_ms,
+        error_rate=args.board_error_rate,
+        throttle_rate=args.board_throttle_rate,
+        seed=args.seed,
+    )
+    settings.GROQ_API_BASE_URL = await llm.start()
+    # Optional second stub, routed to as the local (Ollama) provider
+    local_llm = None
+    if args.local_llm_median_ms is not None:
+        local_llm = StubLLMServer(
+            median_ms=args.local_llm_median_ms,
+            sigma=args.llm_sigma,
+            tokens_per_second=args.llm_tokens_per_second,
+            seed=args.seed,
+        )
+        settings.OLLAMA_API_BASE_URL = await local_llm.start()
+        settings.LLM_PROVIDERS = 'groq,ollama'
+    settings.LLM_HEDGING = args.hedge
+    settings.LLM_STREAMING = not args.no_stream
+    settings.LLM_JSON_MODE = not args.no_json_mode
+    # Client-side Groq budget; off unless asked for, so other runs measure the pipeline alone
+    settings.GROQ_REQUESTS_PER_MINUTE = args.client_rpm
+    settings.GROQ_TOKENS_PER_MINUTE = args.client_tpm
+    # Admission control; as many crawl slots as requests in flight unless asked for.
+    # All requests share one API key, so its limit is off unless asked for too.
+    settings.ADMISSION_MAX_CONCURRENT = args.max_concurrent_searches or args.concurrency
+    settings.ADMISSION_MAX_QUEUED = args.admission_max_queued
+    settings.ADMISSION_MAX_QUEUE_SECONDS = args.admission_max_queue_seconds
+    settings.ADMISSION_MAX_PER_KEY = args.max_searches_per_key
+    settings.CRAWLER_SITE_OVERRIDES = await board.start()
+    settings.CRAWLER_DELAY_SCALE = 0.0
+    rate_limiter.requests_per_minute = args.requests_per_minute
+    rate_limiter.interval = 60 / args.requests_per_minute
+
+    # Imported after the settings above, since the agents and crawlers read them on creation
+    from app import app
+    from api.routes.agent import job_discovery_agent
+
+    timings = StageTimings()
+    instrument(job_discovery_agent, timings)
+
+    latencies: List[float] = []
+    ok_latencies: List[float] = []
+    statuses: Dict[int, int] = defaultdict(int)
+    job_counts: List[int] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_request(client: httpx.AsyncClient, index: int) -> None:
+        async with semaphore:
+            if not args.warm:
+                reset_crawl_state()
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    f"{settings.API_V1_STR}/agents/job-discovery/search",
+                    json={'keywords': args.keywords, 'location': args.location},
+                    headers={'X-API-Key': settings.API_KEY},
+                )
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    job_counts.append(response.json().get('count', 0))
+                    ok_latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                statuses[0] += 1
+                print(f"Request {index} failed: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=app)
+    started = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=None) as client:
+            await asyncio.gather(*(one_request(client, i) for i in range(args.requests)))
+        wall_time = time.perf_counter() - started
+        # Let background strategy refinements finish before the stub LLM goes away
+        await job_discovery_agent.strategy_planner.drain()
+    finally:
+        await AiohttpCrawler.close_session()
+        await board.stop()
+        await llm.stop()
+        if local_llm:
+            await local_llm.stop()
+
+    return {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'wall_seconds': wall_time,
+        'throughput_rps': args.requests / wall_time if wall_time else 0.0,
+        'request_seconds': sum(latencies),
+        'p50_seconds': percentile(latencies, 0.5),
+        'p95_seconds': percentile(latencies, 0.95),
+        'p99_seconds': percentile(latencies, 0.99),
+        'ok_p50_seconds': percentile(ok_latencies, 0.5),
+        'ok_p95_seconds': percentile(ok_latencies, 0.95),
+        'statuses': dict(statuses),
+        'avg_jobs': sum(job_counts) / len(job_counts) if job_counts else 0.0,
+        'llm_requests': dict(llm.request_counts),
+        'llm_statuses': dict(llm.status_counts),
+        'llm_completion_tokens': llm.completion_tokens,
+        'local_llm_requests': dict(local_llm.request_counts) if local_llm else {},
+        'board_requests': dict(board.request_counts),
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': timings.report(),
+    }
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    """
+    Print load test results.
+    """
+    print(
+        f"{results['requests']} requests at concurrency {results['concurrency']} "
+        f"in {results['wall_seconds']:.2f}s: {results['throughput_rps']:.2f} req/s"
+    )
+    print(
+        f"latency p50 {results['p50_seconds']:.2f}s  p95 {results['p95_seconds']:.2f}s  "
+        f"p99 {results['p99_seconds']:.2f}s  statuses {results['statuses']}  "
+        f"avg jobs {results['avg_jobs']:.1f}  peak RSS {results['peak_rss_mb']:.1f} MB"
+    )
+    print(f"successful requests latency p50 {results['ok_p50_seconds']:.2f}s  p95 {results['ok_p95_seconds']:.2f}s")
+    print(
+        f"LLM requests {results['llm_requests']}  statuses {results['llm_statuses']}  "
+        f"completion tokens {results['llm_completion_tokens']}"
+    )
+    if results['local_llm_requests']:
+        print(f"local LLM requests {results['local_llm_requests']}")
+    print(f"job board requests {results['board_requests']}")
+    print()
+
+    header = f"{'stage':<22}{'calls':>7}{'failed':>8}{'p50 s':>9}{'p95 s':>9}{'total s':>10}{'share':>8}"
+    print(header)
+    print('-' * len(header))
+    # Stages overlap (crawlers run concurrently, LLM calls sit inside other stages),
+    # so shares are of the summed request time and do not add up to 100%
+    for row in results['stages']:
+        share = row['total_seconds'] / results['request_seconds'] if results['request_seconds'] else 0.0
+        print(
+            f"{row['stage']:<22}{row['calls']:>7}{row['failures']:>8}{row['p50_seconds']:>9.3f}"
+            f"{row['p95_seconds']:>9.3f}{row['total_seconds']:>10.2f}{share:>8.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the job search endpoint against local fakes")
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--keywords', nargs='+', default=['python', 'developer'])
+    parser.add_argument('--location', default='New York')
+    parser.add_argument('--pages', type=int, default=5, help="Synthetic search pages per endpoint")
+    parser.add_argument('--llm-median-ms', type=float, default=300.0)
+    parser.add_argument('--llm-sigma', type=float, default=0.5)
+    parser.add_argument('--llm-tokens-per-second', type=float, default=500.0)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-throttle-rate', type=float, default=0.0)
+    parser.add_argument('--local-llm-median-ms', type=float, default=None,
+                        help="Also route to a second stub LLM as the local provider")
+    parser.add_argument('--hedge', action='store_true', help="Hedge slow LLM requests on the other provider")
+    parser.add_argument('--llm-malformed-json-rate', type=float, default=0.0, help="Share of JSON answers the stub corrupts")
+    parser.add_argument('--no-json-mode', action='store_true', help="Do not ask the LLM for JSON objects")
+    parser.add_argument('--no-stream', action='store_true', help="Wait for whole LLM responses instead of streaming")
+    parser.add_argument('--llm-rpm-limit', type=int, default=0, help="Stub LLM answers requests over this rate with 429")
+    parser.add_argument('--client-rpm', type=int, default=0, help="Client-side Groq requests per minute budget (0 for none)")
+    parser.add_argument('--client-tpm', type=int, default=0, help="Client-side Groq tokens per minute budget (0 for none)")
+    parser.add_argument('--max-concurrent-searches', type=int, default=0,
+                        help="Crawl slots of the admission controller (default: --concurrency)")
+    parser.add_argument('--admission-max-queued', type=int, default=16, help="Searches that can wait for a crawl slot")
+    parser.add_argument('--admission-max-queue-seconds', type=float, default=30.0,
+                        help="Longest a search may wait for a crawl slot")
+    parser.add_argument('--max-searches-per-key', type=int, default=0, help="Searches per API key (0 for no limit)")
+    parser.add_argument('--board-latency-ms', type=float, default=50.0)
+    parser.add_argument('--board-error-rate', type=float, default=0.0)
+    parser.add_argument('--board-throttle-rate', type=float, default=0.0)
+    parser.add_argument('--requests-per-minute', type=int, default=60000, help="Per-domain crawl rate limit during the run")
+    parser.add_argument('--warm', action='store_true', help="Keep watermarks and cached details between requests")
+    parser.add_argument('--seed', type=int, default=None)
+    print_report(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == '__main__':
+    main()
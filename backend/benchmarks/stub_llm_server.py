@@ -0,0 +1,410 @@
+"""
+Local Groq/OpenAI-compatible stub LLM server.
+
+Answers chat completion requests with canned keyword, strategy and job
+categorization responses, after a configurable latency (log-normal around a
+median, plus output tokens at a fixed token rate), and injects 500s and 429s
+in the Groq error format. Requests with "stream": true are answered with
+server-sent events, a token at a time, ending with Groq's x_groq usage;
+clients that close the stream early stop the generation. JSON answers can
+be corrupted (truncated or with a trailing comma) at a configurable rate; in
+JSON mode (response_format json_object) these come back as Groq's 400
+json_validate_failed error with the failed_generation. Point the app at it
+by setting GROQ_API_BASE_URL to the printed URL.
+
+Run standalone with:
+    python -m benchmarks.stub_llm_server --median-ms 300 --tokens-per-second 500
+"""
+from typing import Deque, Dict, Any, Optional, Tuple
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from collections import defaultdict, deque
+
+from aiohttp import web
+
+
+# Explanation models tend to add after the JSON they were asked for
+STRATEGY_COMMENTARY = (
+    "\n\nThis strategy focuses on the platforms with the most relevant postings for the keywords "
+    "and location. LinkedIn and Indeed have the largest share of backend roles, while Glassdoor adds "
+    "salary information. Limiting the search to the past week keeps the results fresh, and the keyword "
+    "variations cover the most common titles used for this kind of role."
+)
+
+# Canned response content per prompt kind
+CANNED_RESPONSES: Dict[str, str] = {
+    'keywords': (
+        "python, backend engineer, software engineer, django, fastapi, flask, "
+        "rest api, microservices, postgresql, aws, docker, kubernetes"
+    ),
+    'strategy': json.dumps({
+        "platforms": ["linkedin", "indeed", "glassdoor"],
+        "filters": {"datePosted": "past week", "jobType": "full-time"},
+        "keywordVariations": ["python developer", "backend engineer", "software engineer python"],
+        "specialConsiderations": ["Prefer postings from the last week"],
+    }) + STRATEGY_COMMENTARY,
+    'plan': json.dumps({
+        "keywords": ["python", "backend engineer", "software engineer", "django", "fastapi", "flask",
+                     "rest api", "microservices", "postgresql", "aws", "docker", "kubernetes"],
+        "platforms": ["linkedin", "indeed", "glassdoor"],
+        "filters": {"datePosted": "past week", "jobType": "full-time"},
+        "keywordVariations": ["python developer", "backend engineer", "software engineer python"],
+        "specialConsiderations": ["Prefer postings from the last week"],
+    }) + STRATEGY_COMMENTARY,
+    'categorization': json.dumps({
+        "required_skills": ["Python", "FastAPI", "PostgreSQL", "Docker", "Communication"],
+        "experience_level": "mid",
+        "job_category": "backend",
+        "key_responsibilities": ["Build and operate Python services", "Collaborate with product teams"],
+        "nice_to_have_skills": ["AWS", "Kubernetes"],
+    }),
+    'default': "OK",
+}
+
+
+def classify_prompt(prompt: str) -> str:
+    """
+    Work out which agent call a prompt belongs to.
+
+    Args:
+        prompt: User message content
+
+    Returns:
+        Key of CANNED_RESPONSES
+    """
+    text = prompt.lower()
+    if 'keywords and search strategy' in text:
+        return 'plan'
+    if 'job search strategy' in text:
+        return 'strategy'
+    if 'job search keywords' in text:
+        return 'keywords'
+    if 'each of these job descriptions' in text:
+        return 'batch_categorization'
+    if 'job description' in text:
+        return 'categorization'
+    return 'default'
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the token count of a text (about four characters per token).
+    """
+    return max(1, len(text) // 4)
+
+
+class StubLLMServer:
+    """
+    OpenAI-compatible chat completions endpoint with simulated latency and failures.
+    """
+    def __init__(
+        self,
+        median_ms: float = 300.0,
+        sigma: float = 0.5,
+        tokens_per_second: float = 500.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        requests_per_minute: int = 0,
+        malformed_json_rate: float = 0.0,
+        responses: Optional[Dict[str, str]] = None,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.requests_per_minute = requests_per_minute
+        self.malformed_json_rate = malformed_json_rate
+        self.accepted: Deque[float] = deque()
+        self.responses = {**CANNED_RESPONSES, **(responses or {})}
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        self.runner: Optional[web.AppRunner] = None
+        self.url: Optional[str] = None
+        self.request_counts: Dict[str, int] = defaultdict(int)
+        self.status_counts: Dict[int, int] = defaultdict(int)
+        self.completion_tokens = 0
+
+    async def start(self) -> str:
+        """
+        Start the server.
+
+        Returns:
+            Chat completions URL, for GROQ_API_BASE_URL
+        """
+        app = web.Application()
+        app.router.add_post('/openai/v1/chat/completions', self._handle)
+        app.router.add_post('/v1/chat/completions', self._handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.url = f"http://{self.host}:{port}/openai/v1/chat/completions"
+        return self.url
+
+    async def stop(self) -> None:
+        """
+        Stop the server.
+        """
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def reset_counts(self) -> None:
+        """
+        Reset the request and status counters.
+        """
+        self.request_counts.clear()
+        self.status_counts.clear()
+        self.completion_tokens = 0
+
+    def _latency_seconds(self, completion_tokens: int) -> float:
+        """
+        Draw the time to answer a request: time to first token plus generation time.
+        """
+        first_token = self.median_ms * math.exp(self.random.gauss(0, self.sigma)) / 1000
+        generation = completion_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        return first_token + generation
+
+    def _content(self, kind: str, prompt: str) -> str:
+        """
+        Response content for a prompt; batch categorizations get one entry per job ID.
+        """
+        if kind == 'batch_categorization':
+            analysis = json.loads(self.responses['categorization'])
+            job_ids = re.findall(r'^\s*\[job (\w+)\]', prompt, re.MULTILINE)
+            return json.dumps({'jobs': [{'id': job_id, **analysis} for job_id in job_ids]})
+        return self.responses[kind]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """
+        Answer one chat completion request.
+        """
+        body = await request.json()
+        prompt = ''.join(message.get('content', '') for message in body.get('messages', []))
+        kind = classify_prompt(prompt)
+        self.request_counts[kind] += 1
+
+        allowed, limit_headers = self._rate_limit()
+        if not allowed:
+            return self._error(429, 'rate_limit_exceeded', 'Rate limit reached, please try again later', {
+                **limit_headers,
+                'Retry-After': limit_headers['x-ratelimit-reset-requests'].rstrip('s'),
+            })
+
+        draw = self.random.random()
+        if draw < self.throttle_rate:
+            await asyncio.sleep(self.median_ms / 4000)
+            return self._error(429, 'rate_limit_exceeded', 'Rate limit reached, please try again later', {
+                'Retry-After': '1',
+                'x-ratelimit-remaining-requests': '0',
+                'x-ratelimit-reset-requests': '1s',
+            })
+        if draw < self.throttle_rate + self.error_rate:
+            await asyncio.sleep(self.median_ms / 1000)
+            return self._error(500, 'internal_server_error', 'Internal server error')
+
+        content = self._content(kind, prompt)
+        json_mode = (body.get('response_format') or {}).get('type') == 'json_object'
+        if content.startswith('{'):
+            if json_mode:
+                # JSON mode answers with the object alone
+                content = json.dumps(json.JSONDecoder().raw_decode(content)[0])
+            if self.malformed_json_rate and self.random.random() < self.malformed_json_rate:
+                content = self._corrupt(content)
+                if json_mode:
+                    await asyncio.sleep(self._latency_seconds(count_tokens(content)))
+                    return self._error(
+                        400, 'json_validate_failed',
+                        "Failed to generate JSON. Please adjust your prompt. See 'failed_generation' for more details.",
+                        extra={'failed_generation': content}
+                    )
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        if body.get('stream'):
+            return await self._stream(request, body, content, prompt_tokens, limit_headers)
+        await asyncio.sleep(self._latency_seconds(completion_tokens))
+
+        self.status_counts[200] += 1
+        self.completion_tokens += completion_tokens
+        return web.json_response({
+            'id': f"chatcmpl-stub-{time.time_ns()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }, headers=limit_headers)
+
+    async def _stream(
+        self,
+        request: web.Request,
+        body: Dict[str, Any],
+        content: str,
+        prompt_tokens: int,
+        headers: Optional[Dict[str, str]]
+    ) -> web.StreamResponse:
+        """
+        Stream a completion as server-sent events, one four-character token at a time.
+        """
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', **(headers or {})})
+        await response.prepare(request)
+        self.status_counts[200] += 1
+        completion_id = f"chatcmpl-stub-{time.time_ns()}"
+        tokens = [content[i:i + 4] for i in range(0, len(content), 4)]
+
+        def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> bytes:
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': body.get('model', 'stub'),
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        await asyncio.sleep(self._latency_seconds(0))
+        sent = 0
+        try:
+            await response.write(event({'role': 'assistant', 'content': ''}))
+            # Tokens go out in groups every 20ms rather than one sleep per token
+            per_write = max(1, int(self.tokens_per_second * 0.02)) if self.tokens_per_second > 0 else len(tokens)
+            for start in range(0, len(tokens), per_write):
+                if self.tokens_per_second > 0:
+                    await asyncio.sleep(per_write / self.tokens_per_second)
+                await response.write(event({'content': ''.join(tokens[start:start + per_write])}))
+                sent = min(start + per_write, len(tokens))
+            usage = {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': len(tokens),
+                'total_tokens': prompt_tokens + len(tokens),
+            }
+            await response.write(event({}, 'stop', x_groq={'id': completion_id, 'usage': usage}))
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client closed the stream; generation stops here
+            self.request_counts['stream_stopped'] += 1
+        except asyncio.CancelledError:
+            self.request_counts['stream_stopped'] += 1
+            raise
+        finally:
+            self.completion_tokens += sent
+        return response
+
+    def _rate_limit(self) -> Tuple[bool, Optional[Dict[str, str]]]:
+        """
+        Count a request against the per-minute limit and build Groq-style rate limit headers.
+
+        Returns:
+            Tuple of (whether the request is within the limit, headers or None if there is no limit)
+        """
+        if not self.requests_per_minute:
+            return True, None
+        now = time.monotonic()
+        while self.accepted and self.accepted[0] <= now - 60:
+            self.accepted.popleft()
+        allowed = len(self.accepted) < self.requests_per_minute
+        if allowed:
+            self.accepted.append(now)
+        remaining = self.requests_per_minute - len(self.accepted)
+        reset = self.accepted[0] + 60 - now if remaining == 0 else 60 / self.requests_per_minute
+        return allowed, {
+            'x-ratelimit-limit-requests': str(self.requests_per_minute),
+            'x-ratelimit-remaining-requests': str(remaining),
+            'x-ratelimit-reset-requests': f"{reset:.2f}s",
+        }
+
+    def _corrupt(self, content: str) -> str:
+        """
+        Break a JSON answer the way models do: cut it off, or leave a trailing comma.
+        """
+        self.request_counts['malformed_json'] += 1
+        if self.random.random() < 0.5:
+            return content[:int(len(content) * 0.8)]
+        return content[:content.rindex('}')] + ',}'
+
+    def _error(
+        self,
+        status: int,
+        code: str,
+        message: str,
+        headers: Optional[Dict[str, str]] = None,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> web.Response:
+        """
+        Build an error response in the Groq error format.
+        """
+        self.status_counts[status] += 1
+        return web.json_response(
+            {'error': {'message': message, 'type': code, 'code': code, **(extra or {})}},
+            status=status,
+            headers=headers,
+        )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """
+    Run the stub LLM server until interrupted.
+    """
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding='utf-8') as f:
+            responses = json.load(f)
+
+    server = StubLLMServer(
+        median_ms=args.median_ms,
+        sigma=args.sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        requests_per_minute=args.requests_per_minute,
+        malformed_json_rate=args.malformed_json_rate,
+        responses=responses,
+        port=args.port,
+    )
+    print(f"GROQ_API_BASE_URL={await server.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a Groq-compatible stub LLM locally")
+    parser.add_argument('--port', type=int, default=8790)
+    parser.add_argument('--median-ms', type=float, default=300.0, help="Median time to first token")
+    parser.add_argument('--sigma', type=float, default=0.5, help="Log-normal spread of the time to first token")
+    parser.add_argument('--tokens-per-second', type=float, default=500.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument('--malformed-json-rate', type=float, default=0.0, help="Share of JSON answers to corrupt")
+    parser.add_argument('--requests-per-minute', type=int, default=0, help="Answer requests over this rate with 429")
+    parser.add_argument('--responses', help="JSON file overriding canned responses by kind")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -41,11 +41,86 @@ class Settings(BaseSettings):
     GROQ_API_BASE_URL: str = os.getenv("GROQ_API_BASE_URL", "https://api.groq.com/openai/v1/chat/completions")
     DEFAULT_LLM_MODEL: str = os.getenv("DEFAULT_LLM_MODEL", "llama3-8b-8192")
     FALLBACK_LLM_MODEL: str = os.getenv("FALLBACK_LLM_MODEL", "llama3-70b-8192")
+    LLM_PROVIDERS: str = os.getenv("LLM_PROVIDERS", "groq")  # Comma-separated: groq, ollama
+    OLLAMA_API_BASE_URL: str = os.getenv("OLLAMA_API_BASE_URL", "http://ollama:11434/v1/chat/completions")
+    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3")
+    GROQ_MAX_CONCURRENCY: int = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
+    OLLAMA_MAX_CONCURRENCY: int = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+    GROQ_REQUESTS_PER_MINUTE: int = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))  # Per model, 0 for no limit
+    GROQ_TOKENS_PER_MINUTE: int = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))  # Per model; Groq's headers override it
+    LLM_HEDGING: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"  # Resend slow requests to a second provider
+    LLM_HEDGE_DELAY_SECONDS: float = float(os.getenv("LLM_HEDGE_DELAY_SECONDS", "2.0"))  # Until a provider's p90 is known
+    LLM_STREAMING: bool = os.getenv("LLM_STREAMING", "true").lower() == "true"  # Stream lists and JSON, stop once complete
+    LLM_JSON_MODE: bool = os.getenv("LLM_JSON_MODE", "true").lower() == "true"  # Ask providers for JSON objects
+    LLM_JSON_REASKS: int = int(os.getenv("LLM_JSON_REASKS", "1"))  # Re-asks for JSON that cannot be repaired or validated
+    
+    # Background search settings
+    SEARCH_WORKERS: int = int(os.getenv("SEARCH_WORKERS", "4"))  # Background searches run at once
+    SEARCH_MAX_QUEUED: int = int(os.getenv("SEARCH_MAX_QUEUED", "100"))  # Waiting searches before 503s
+    SEARCH_RESULT_TTL_SECONDS: int = int(os.getenv("SEARCH_RESULT_TTL_SECONDS", "3600"))  # Results kept after finishing
+
+    # Admission control settings (crawling searches, synchronous and background)
+    ADMISSION_MAX_CONCURRENT: int = int(os.getenv("ADMISSION_MAX_CONCURRENT", "4"))  # Searches crawling at once
+    ADMISSION_MAX_QUEUED: int = int(os.getenv("ADMISSION_MAX_QUEUED", "16"))  # Synchronous searches waiting before 503s
+    ADMISSION_MAX_QUEUE_SECONDS: float = float(os.getenv("ADMISSION_MAX_QUEUE_SECONDS", "30"))  # Longest wait before 503s
+    ADMISSION_MAX_PER_KEY: int = int(os.getenv("ADMISSION_MAX_PER_KEY", "8"))  # Searches per API key before 429s (0 for no limit)
     
     # Database settings
     MONGODB_URI: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     MONGODB_DB: str = os.getenv("MONGODB_DB", "agentic_ai_job_system")
     
+    # Crawler settings
+    HTTP_CRAWLER_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CRAWLER_MAX_CONNECTIONS", "100"))
+    HTTP_CRAWLER_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_CRAWLER_MAX_CONNECTIONS_PER_HOST", "4"))
+    HTTP_CRAWLER_TIMEOUT: float = float(os.getenv("HTTP_CRAWLER_TIMEOUT", "20"))
+    CRAWLER_EXTRACTION_MODE: str = os.getenv("CRAWLER_EXTRACTION_MODE", "offline")  # "offline" or "live"
+    CRAWLER_STORE_SNAPSHOTS: bool = os.getenv("CRAWLER_STORE_SNAPSHOTS", "false").lower() == "true"
+    HTML_PARSER_WORKERS: int = int(os.getenv("HTML_PARSER_WORKERS", "4"))
+    CRAWLER_REQUESTS_PER_MINUTE: int = int(os.getenv("CRAWLER_REQUESTS_PER_MINUTE", "10"))
+    CRAWLER_MAX_RESULTS: int = int(os.getenv("CRAWLER_MAX_RESULTS", "50"))
+    CRAWLER_MAX_PAGES: int = int(os.getenv("CRAWLER_MAX_PAGES", "10"))
+    CRAWLER_PAGE_CONCURRENCY: int = int(os.getenv("CRAWLER_PAGE_CONCURRENCY", "3"))
+    CRAWLER_RECENCY_SECONDS: int = int(os.getenv("CRAWLER_RECENCY_SECONDS", "86400"))
+    CRAWLER_WATERMARK_MAX_IDS: int = int(os.getenv("CRAWLER_WATERMARK_MAX_IDS", "500"))
+    CRAWLER_KNOWN_STOP_RATIO: float = float(os.getenv("CRAWLER_KNOWN_STOP_RATIO", "0.5"))
+    DETAIL_CACHE_MAX_ENTRIES: int = int(os.getenv("DETAIL_CACHE_MAX_ENTRIES", "5000"))
+    DETAIL_CACHE_TTL_SECONDS: int = int(os.getenv("DETAIL_CACHE_TTL_SECONDS", "259200"))
+    CRAWLER_DELAY_SCALE: float = float(os.getenv("CRAWLER_DELAY_SCALE", "1.0"))  # 0 disables human-like delays and backoffs
+    CRAWLER_SITE_OVERRIDES: str = os.getenv("CRAWLER_SITE_OVERRIDES", "")  # e.g. "linkedin=http://127.0.0.1:8701,indeed=..."
+    CRAWL_RECORD_DIR: str = os.getenv("CRAWL_RECORD_DIR", "")  # Save crawled pages here as replayable fixtures
+    
+    # Platform performance settings
+    PLATFORM_STATS_EWMA_ALPHA: float = float(os.getenv("PLATFORM_STATS_EWMA_ALPHA", "0.2"))
+    PLATFORM_STATS_WINDOW_SECONDS: int = int(os.getenv("PLATFORM_STATS_WINDOW_SECONDS", "3600"))
+    PLATFORM_STATS_BUCKET_SECONDS: int = int(os.getenv("PLATFORM_STATS_BUCKET_SECONDS", "60"))
+    PLATFORM_BANDIT_ENABLED: bool = os.getenv("PLATFORM_BANDIT_ENABLED", "true").lower() == "true"
+    PLATFORM_BANDIT_MAX_PLATFORMS: int = int(os.getenv("PLATFORM_BANDIT_MAX_PLATFORMS", "3"))
+    PLATFORM_BANDIT_PRIOR_SECONDS: float = float(os.getenv("PLATFORM_BANDIT_PRIOR_SECONDS", "30"))
+    STRATEGY_PLANNER: str = os.getenv("STRATEGY_PLANNER", "local")  # "local" (rules, LLM refines in background), "llm" or "combined" (keywords and strategy in one call)
+    STRATEGY_PLAN_CACHE_SIZE: int = int(os.getenv("STRATEGY_PLAN_CACHE_SIZE", "1000"))
+    STRATEGY_PLAN_TTL_SECONDS: int = int(os.getenv("STRATEGY_PLAN_TTL_SECONDS", "86400"))
+    SPECULATIVE_CRAWL: bool = os.getenv("SPECULATIVE_CRAWL", "false").lower() == "true"  # Crawl raw keywords while the LLM plans
+    SPECULATIVE_CRAWL_PLATFORMS: int = int(os.getenv("SPECULATIVE_CRAWL_PLATFORMS", "2"))
+    CRAWLER_DETAIL_BUDGET: int = int(os.getenv("CRAWLER_DETAIL_BUDGET", "15"))  # Detail fetches per search, across platforms
+    
+    # Job categorization settings
+    CATEGORIZATION_BATCH_SIZE: int = int(os.getenv("CATEGORIZATION_BATCH_SIZE", "5"))  # 1 sends one request per job
+    CATEGORIZATION_BATCH_TOKENS: int = int(os.getenv("CATEGORIZATION_BATCH_TOKENS", "4000"))
+    LOCAL_ANALYSIS_ENABLED: bool = os.getenv("LOCAL_ANALYSIS_ENABLED", "true").lower() == "true"  # Analyze every job locally first
+    LOCAL_ANALYSIS_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_ANALYSIS_MIN_CONFIDENCE", "0.6"))  # Below this, ask the LLM
+    LOCAL_ANALYSIS_MAX_ESCALATIONS: int = int(os.getenv("LOCAL_ANALYSIS_MAX_ESCALATIONS", "10"))  # LLM categorizations per search
+    KEYWORD_GRAPH_ENABLED: bool = os.getenv("KEYWORD_GRAPH_ENABLED", "true").lower() == "true"  # Expand known keywords without the LLM
+    KEYWORD_GRAPH_MIN_COUNT: int = int(os.getenv("KEYWORD_GRAPH_MIN_COUNT", "3"))  # Jobs a term must appear in to be expanded locally
+    KEYWORD_GRAPH_MAX_NODES: int = int(os.getenv("KEYWORD_GRAPH_MAX_NODES", "20000"))
+    KEYWORD_GRAPH_FILE: str = os.getenv("KEYWORD_GRAPH_FILE", "")  # Load and save the graph here
+    DESCRIPTION_TOKEN_BUDGET: int = int(os.getenv("DESCRIPTION_TOKEN_BUDGET", "600"))  # Per description, after boilerplate removal
+    DESCRIPTION_BOILERPLATE_THRESHOLD: int = int(os.getenv("DESCRIPTION_BOILERPLATE_THRESHOLD", "3"))  # Postings a paragraph must repeat in
+    
+    # Tracing settings
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+    TRACE_EXPORT_FILE: str = os.getenv("TRACE_EXPORT_FILE", "")  # Append OTLP/JSON traces to this file
+    
     # API Security
     API_KEY: str = os.getenv("API_KEY", "agentic-ai-job-system-api-key-2024")
     
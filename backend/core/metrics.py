@@ -0,0 +1,324 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and fixed-bucket histograms keep their values in plain
+dictionaries keyed by label values. Updates happen on the event loop thread
+and take no lock, so recording a metric costs a dictionary lookup and an
+addition. The registry renders everything for the /metrics endpoint.
+"""
+from typing import Dict, Any, List, Optional, Tuple, Callable, Sequence
+import time
+import math
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+# Latency buckets in seconds, from fast in-process work to slow crawls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value for the exposition format.
+    """
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metric:
+    """
+    Base class of a named metric with optional labels.
+    """
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        Get the label values of a sample, in label name order.
+        """
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        """
+        Format label values as {name="value",...}.
+        """
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def samples(self) -> List[str]:
+        """
+        Get the sample lines of the metric.
+        """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """
+        Render the metric with its HELP and TYPE lines.
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count.
+    """
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add
+            **labels: Label values
+        """
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels: Any) -> float:
+        """
+        Get the current count.
+        """
+        return self.values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in self.values.items()]
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down, or be read from a function at scrape time.
+    """
+    type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: Any) -> None:
+        """
+        Set the gauge.
+        """
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Increase the gauge.
+        """
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        """
+        Decrease the gauge.
+        """
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        Read the (unlabelled) gauge from a function whenever metrics are rendered.
+
+        Args:
+            function: Function returning the current value
+        """
+        self.function = function
+
+    def samples(self) -> List[str]:
+        if self.function is not None:
+            try:
+                return [f"{self.name} {_format_value(self.function())}"]
+            except Exception:
+                return []
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in self.values.items()]
+
+
+class Histogram(Metric):
+    """
+    Distribution of observations over fixed buckets.
+    """
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [count per bucket (non-cumulative, last is +Inf), sum, count]
+        self.values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (e.g. seconds)
+            **labels: Label values
+        """
+        key = self._key(labels)
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any):
+        """
+        Observe the duration of a with block in seconds.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{self._labels(key, {'le': _format_value(bound)})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together.
+    """
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Register a metric, returning the existing one if the name is taken.
+        """
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        Create and register a counter.
+        """
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        Create and register a gauge.
+        """
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """
+        Create and register a histogram.
+        """
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        return '\n'.join(metric.render() for metric in self.metrics.values()) + '\n'
+
+
+# Create a global metrics registry
+metrics = MetricsRegistry()
+
+# HTTP API
+HTTP_REQUESTS = metrics.counter(
+    'http_requests_total', 'HTTP requests handled, by route and status', ('method', 'route', 'status'))
+HTTP_REQUEST_DURATION = metrics.histogram(
+    'http_request_duration_seconds', 'HTTP request latency, by route', ('method', 'route'))
+
+# Crawlers
+CRAWLER_REQUESTS = metrics.counter(
+    'crawler_requests_total', 'Crawler navigations and fetches, by domain and outcome', ('domain', 'outcome'))
+CRAWLER_REQUEST_DURATION = metrics.histogram(
+    'crawler_request_duration_seconds', 'Crawler navigation and fetch latency, by domain', ('domain',))
+CRAWLER_DETAIL_CACHE = metrics.counter(
+    'crawler_detail_cache_total', 'Job detail cache lookups, by result', ('result',))
+RATE_LIMITER_WAIT = metrics.histogram(
+    'rate_limiter_wait_seconds', 'Time spent waiting for a rate limiter slot, by domain', ('domain',))
+RATE_LIMITER_BACKOFFS = metrics.counter(
+    'rate_limiter_backoffs_total', 'Rate limiter backoffs started, by domain and reason', ('domain', 'reason'))
+
+# LLM
+LLM_REQUEST_DURATION = metrics.histogram(
+    'llm_request_duration_seconds', 'LLM completion latency, by model and outcome', ('model', 'outcome'))
+LLM_TOKENS = metrics.counter(
+    'llm_tokens_total', 'LLM tokens used, by model and kind (prompt or completion)', ('model', 'kind'))
+LLM_RETRIES = metrics.counter(
+    'llm_retries_total', 'LLM completion retries', ('model',))
+LLM_PROVIDER_DURATION = metrics.histogram(
+    'llm_provider_request_duration_seconds', 'LLM provider request latency, by provider and outcome',
+    ('provider', 'outcome'))
+LLM_HEDGES = metrics.counter(
+    'llm_hedged_requests_total', 'Hedged LLM requests sent, and which request answered first', ('result',))
+LLM_SCHEDULER_WAIT = metrics.histogram(
+    'llm_scheduler_wait_seconds', 'Time LLM calls waited for rate limit budget, by provider and priority',
+    ('provider', 'priority'))
+LLM_JSON_PARSE = metrics.counter(
+    'llm_json_parse_total', 'JSON completions parsed, by call schema and result (valid, repaired, invalid, reasked)',
+    ('call', 'result'))
+LLM_CACHE = metrics.counter(
+    'llm_cache_total', 'Lookups of cached LLM results, by call and result', ('call', 'result'))
+
+# Job analysis
+JOB_ANALYSES = metrics.counter(
+    'job_analyses_total', 'Job analyses returned, by source (local or llm)', ('source',))
+
+# Background searches
+SEARCHES = metrics.counter(
+    'searches_total', 'Background searches by status (queued, completed, failed, rejected)', ('status',))
+SEARCH_QUEUE_DEPTH = metrics.gauge('search_queue_depth', 'Background searches waiting for a worker')
+
+# Admission control
+ADMISSIONS = metrics.counter(
+    'admission_requests_total',
+    'Searches asking for a crawl slot, by result (admitted, key_limit, queue_full, shed, timeout)', ('result',))
+ADMISSION_QUEUE_WAIT = metrics.histogram(
+    'admission_queue_wait_seconds', 'Time searches waited for a crawl slot')
+ADMISSION_ACTIVE = metrics.gauge('admission_active', 'Searches holding a crawl slot')
+ADMISSION_QUEUE_DEPTH = metrics.gauge('admission_queue_depth', 'Searches waiting for a crawl slot')
+
+# Storage
+JOB_STORE_SIZE = metrics.gauge('job_store_size', 'Jobs in the job store')
+VECTOR_INDEX_SIZE = metrics.gauge('vector_index_size', 'Jobs in the vector index')
+DETAIL_CACHE_SIZE = metrics.gauge('detail_cache_entries', 'Job detail entries in the in-memory cache')
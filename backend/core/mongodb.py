@@ -4,19 +4,29 @@ MongoDB configuration and connection management.
 This module is modified to work without an actual MongoDB connection for development purposes.
 In a production environment, this would connect to a real MongoDB instance.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import os
 import json
 from datetime import datetime
 import uuid
 
 from core.config import settings
+from core.tracing import traced
+from core.metrics import JOB_STORE_SIZE
 
 # In-memory storage for development
 job_listings = []
+jobs_by_external_id = {}
 crawl_stats = {}
+crawl_watermarks = {}
+job_detail_cache = {}
+page_snapshots = {}
+searches = {}
 
+JOB_STORE_SIZE.set_function(lambda: len(job_listings))
 
+
+@traced('storage.store_jobs')
 async def store_job_listings(jobs: List[Dict[str, Any]]) -> List[str]:
     """
     Store job listings in memory.
@@ -40,6 +50,7 @@ async def store_job_listings(jobs: List[Dict[str, Any]]) -> List[str]:
         
         # Store in memory
         job_listings.append(job)
+        jobs_by_external_id[(job.get('source'), job['external_id'])] = job
     
     return inserted_ids
 
@@ -64,6 +75,24 @@ async def get_job_listings_by_query(query: Dict[str, Any], limit: int = 100) ->
     return job_listings[:limit]
 
 
+async def get_jobs_by_external_ids(source: str, external_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stored job listings of a platform by external ID.
+    
+    Args:
+        source: Source of the jobs (e.g., 'linkedin')
+        external_ids: External IDs to look up
+        
+    Returns:
+        Dictionary of external ID to the most recently stored job listing
+    """
+    return {
+        external_id: jobs_by_external_id[(source, external_id)]
+        for external_id in external_ids
+        if (source, external_id) in jobs_by_external_id
+    }
+
+
 async def update_crawl_stats(source: str, success_count: int, error_count: int, keywords: List[str]) -> None:
     """
     Update crawl statistics.
@@ -98,4 +127,151 @@ async def get_crawl_stats(source: str = None) -> List[Dict[str, Any]]:
     """
     if source:
         return [crawl_stats.get(source, {"source": source, "total_crawls": 0, "success_count": 0, "error_count": 0})]
-    return list(crawl_stats.values())
\ No newline at end of file
+    return list(crawl_stats.values())
+
+
+async def get_cached_job_detail(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached job detail entry.
+    
+    Args:
+        key: Cache key (external ID or canonical URL)
+        
+    Returns:
+        Cache entry, or None if not cached
+    """
+    return job_detail_cache.get(key)
+
+
+async def store_cached_job_detail(entry: Dict[str, Any]) -> None:
+    """
+    Store a job detail cache entry.
+    
+    Args:
+        entry: Cache entry with a 'key' field
+    """
+    job_detail_cache[entry["key"]] = dict(entry)
+
+
+def _watermark_key(source: str, keywords: List[str], location: str) -> str:
+    """
+    Build the watermark key for a normalized (platform, query, location).
+    """
+    query = ' '.join(sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()}))
+    return f"{source}|{query}|{location.strip().lower()}"
+
+
+async def get_crawl_watermark(source: str, keywords: List[str], location: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the crawl watermark for a query.
+    
+    Args:
+        source: Source of the crawl (e.g., 'linkedin')
+        keywords: Keywords used for the crawl
+        location: Location used for the crawl
+        
+    Returns:
+        Watermark dictionary, or None if the query has not been crawled
+    """
+    return crawl_watermarks.get(_watermark_key(source, keywords, location))
+
+
+async def update_crawl_watermark(
+    source: str,
+    keywords: List[str],
+    location: str,
+    external_ids: List[str]
+) -> None:
+    """
+    Record the newest postings seen by a crawl.
+    
+    Args:
+        source: Source of the crawl (e.g., 'linkedin')
+        keywords: Keywords used for the crawl
+        location: Location used for the crawl
+        external_ids: External IDs seen by the crawl, newest first
+    """
+    key = _watermark_key(source, keywords, location)
+    previous = crawl_watermarks.get(key, {})
+    
+    # Keep the most recent IDs first, without duplicates
+    seen_ids = list(dict.fromkeys(external_ids + previous.get("external_ids", [])))
+    
+    crawl_watermarks[key] = {
+        "source": source,
+        "query": key.split("|")[1],
+        "location": key.split("|")[2],
+        "external_ids": seen_ids[:settings.CRAWLER_WATERMARK_MAX_IDS],
+        "last_crawl_time": datetime.now().isoformat()
+    }
+
+
+async def store_page_snapshot(source: str, kind: str, url: str, html: str) -> None:
+    """
+    Store the raw HTML of a crawled page so it can be re-parsed later.
+    
+    Args:
+        source: Source of the page (e.g., 'linkedin')
+        kind: Page kind ('search' or 'detail')
+        url: URL of the page
+        html: Page HTML
+    """
+    page_snapshots[url] = {
+        "source": source,
+        "kind": kind,
+        "url": url,
+        "html": html,
+        "crawl_time": datetime.now().isoformat()
+    }
+
+
+async def get_page_snapshots(source: str = None, kind: str = None) -> List[Dict[str, Any]]:
+    """
+    Get stored page snapshots.
+    """
+    return [
+        snapshot for snapshot in page_snapshots.values()
+        if (source is None or snapshot["source"] == source) and (kind is None or snapshot["kind"] == kind)
+    ]
+
+
+async def store_search(record: Dict[str, Any]) -> None:
+    """
+    Store the state and results of a background search.
+    
+    Args:
+        record: Search record with a 'search_id' field
+    """
+    searches[record["search_id"]] = dict(record)
+
+
+async def get_search(search_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a background search.
+    
+    Args:
+        search_id: Search ID
+        
+    Returns:
+        Search record, or None if unknown
+    """
+    return searches.get(search_id)
+
+
+async def delete_expired_searches(now: float) -> int:
+    """
+    Delete finished background searches past their expiry time.
+    
+    Args:
+        now: Current Unix time
+        
+    Returns:
+        Number of searches deleted
+    """
+    expired = [
+        search_id for search_id, record in searches.items()
+        if record.get("expires_at") is not None and record["expires_at"] <= now
+    ]
+    for search_id in expired:
+        del searches[search_id]
+    return len(expired)
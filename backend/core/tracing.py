@@ -0,0 +1,313 @@
+"""
+Lightweight request tracing.
+
+Spans are opened with `tracer.span(name, **attributes)` (or the `traced`
+decorator) and nest through a context variable, so spans opened in tasks
+created inside another span become its children. When the root span of a
+trace ends, the trace is kept in an in-memory ring buffer of recent traces
+and, if TRACE_EXPORT_FILE is set, appended to that file as one OTLP/JSON
+ExportTraceServiceRequest per line.
+"""
+from typing import Dict, Any, List, Optional, Callable
+import os
+import json
+import time
+import threading
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from core.config import settings
+from core.logging import get_logger
+
+# Get logger
+logger = get_logger(__name__)
+
+
+class Span:
+    """
+    A timed operation within a trace.
+    """
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """
+        Duration of the span in milliseconds, or None while it is open.
+        """
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Set an attribute on the span.
+
+        Args:
+            key: Attribute name
+            value: Attribute value (str, int, float or bool)
+        """
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the span to a dictionary for the trace API.
+        """
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        Convert the span to the OTLP/JSON span format.
+        """
+        otlp = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(int(self.start_time * 1e9)),
+            'endTimeUnixNano': str(int((self.end_time or self.start_time) * 1e9)),
+            'attributes': [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1},
+        }
+        if self.parent_id:
+            otlp['parentSpanId'] = self.parent_id
+        return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """
+    Convert an attribute to an OTLP key/value pair.
+    """
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+# Span of the code currently running, if any
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """
+    Records spans and keeps the most recent traces in a ring buffer.
+    """
+    def __init__(self, buffer_size: int = 200, export_file: str = "", enabled: bool = True):
+        self.buffer_size = buffer_size
+        self.export_file = export_file
+        self.enabled = enabled
+        self.traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._export_lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any):
+        """
+        Open a span for the duration of a with block.
+
+        Starts a new trace when there is no current span.
+
+        Args:
+            name: Span name (e.g. 'crawler.navigate')
+            **attributes: Span attributes
+
+        Yields:
+            The open span, or None when tracing is disabled
+        """
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error)
+
+    def start_span(self, name: str, **attributes: Any) -> Optional[Span]:
+        """
+        Open a span without making it the current span.
+
+        For async generators, which must not hold the current span across a
+        yield: the consumer's code would run inside it. Close it with end_span().
+
+        Args:
+            name: Span name
+            **attributes: Span attributes
+
+        Returns:
+            The open span, or None when tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        if parent is None:
+            span = Span(name, os.urandom(16).hex(), attributes=attributes)
+            self._start_trace(span)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None) -> None:
+        """
+        Close a span opened with start_span().
+
+        Args:
+            span: The span, or None when tracing is disabled
+            error: Exception the spanned operation failed with, if any
+        """
+        if span is None:
+            return
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        span.end_time = time.time()
+        self._finish_span(span, is_root=span.parent_id is None)
+
+    def current_span(self) -> Optional[Span]:
+        """
+        Get the span of the code currently running.
+        """
+        return _current_span.get()
+
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a recent trace.
+
+        Args:
+            trace_id: Trace ID (as returned in the X-Trace-Id header)
+
+        Returns:
+            Trace dictionary with its spans ordered by start time, or None if
+            the trace is unknown or has been evicted
+        """
+        trace = self.traces.get(trace_id)
+        if trace is None:
+            return None
+        spans = sorted(trace['spans'], key=lambda span: span.start_time)
+        return {
+            'trace_id': trace_id,
+            'name': trace['name'],
+            'start_time': trace['start_time'],
+            'duration_ms': trace['duration_ms'],
+            'spans': [span.to_dict() for span in spans],
+        }
+
+    def recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Get summaries of the most recent traces, newest first.
+
+        Args:
+            limit: Maximum number of traces
+
+        Returns:
+            List of trace summaries
+        """
+        summaries = []
+        for trace_id, trace in reversed(self.traces.items()):
+            summaries.append({
+                'trace_id': trace_id,
+                'name': trace['name'],
+                'start_time': trace['start_time'],
+                'duration_ms': trace['duration_ms'],
+                'span_count': len(trace['spans']),
+            })
+            if len(summaries) >= limit:
+                break
+        return summaries
+
+    def _start_trace(self, root: Span) -> None:
+        """
+        Register a new trace, evicting the oldest beyond the buffer size.
+        """
+        self.traces[root.trace_id] = {
+            'name': root.name,
+            'start_time': root.start_time,
+            'duration_ms': None,
+            'spans': [],
+        }
+        while len(self.traces) > self.buffer_size:
+            self.traces.popitem(last=False)
+
+    def _finish_span(self, span: Span, is_root: bool) -> None:
+        """
+        Add a finished span to its trace, completing the trace at its root.
+        """
+        trace = self.traces.get(span.trace_id)
+        if trace is None:
+            return
+        trace['spans'].append(span)
+
+        if is_root:
+            # The root may have been renamed once known (e.g. to the matched route)
+            trace['name'] = span.name
+            trace['duration_ms'] = span.duration_ms
+            if self.export_file:
+                self._export(trace['spans'])
+
+    def _export(self, spans: List[Span]) -> None:
+        """
+        Append a trace to the export file as an OTLP/JSON line.
+        """
+        request = {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', settings.PROJECT_NAME)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'core.tracing'},
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+        try:
+            with self._export_lock, open(self.export_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(request) + '\n')
+        except OSError as e:
+            logger.error(f"Error exporting trace: {e}")
+
+
+def traced(name: str, **attributes: Any) -> Callable:
+    """
+    Decorator that runs a coroutine function inside a span.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(name, **attributes):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Create a global tracer instance
+tracer = Tracer(settings.TRACE_BUFFER_SIZE, settings.TRACE_EXPORT_FILE, settings.TRACING_ENABLED)
@@ -7,9 +7,14 @@ In a production environment, this would connect to a real vector database like P
 from typing import Dict, Any, List, Optional, Tuple
 import random
 
+from core.tracing import traced
+from core.metrics import VECTOR_INDEX_SIZE
+
 # In-memory storage for development
 indexed_jobs = []
 
+VECTOR_INDEX_SIZE.set_function(lambda: len(indexed_jobs))
+
 
 def get_embedding(text: str) -> List[float]:
     """
@@ -116,6 +121,7 @@ async def semantic_job_search(
         return []
 
 
+@traced('storage.index_jobs')
 async def batch_index_jobs(jobs: List[Dict[str, Any]]) -> Tuple[int, int]:
     """
     Mock function to simulate batch indexing of jobs.
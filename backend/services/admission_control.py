@@ -0,0 +1,210 @@
+"""
+Admission control for searches that crawl job platforms.
+
+Every search launches crawlers, some with a headless browser, so running
+too many at once exhausts memory. Searches take one of a fixed number of
+crawl slots while they run; the rest wait in a bounded first-in, first-out
+queue. Synchronous searches are turned away with a 503 rather than queued
+when the queue is full or their expected wait is longer than
+ADMISSION_MAX_QUEUE_SECONDS, and each API key can have at most
+ADMISSION_MAX_PER_KEY searches waiting or running before it gets 429s.
+"""
+from typing import Dict, Optional, AsyncIterator
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import math
+import time
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import ADMISSIONS, ADMISSION_QUEUE_WAIT, ADMISSION_ACTIVE, ADMISSION_QUEUE_DEPTH
+
+# Get logger
+logger = get_logger(__name__)
+
+
+class AdmissionRejectedError(Exception):
+    """Exception raised when a search is turned away instead of queued."""
+    def __init__(self, message: str, reason: str, status_code: int, retry_after: int):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message
+            reason: Why the search was turned away (key_limit, queue_full, shed, timeout)
+            status_code: HTTP status to answer with (429 for the API key's limit, 503 for overload)
+            retry_after: Seconds after which the client should retry
+        """
+        super().__init__(message)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Crawl slots shared by all searches, with a bounded queue and per-API-key limits.
+    """
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_queued: int = 16,
+        max_queue_seconds: float = 30.0,
+        max_per_key: int = 8
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            max_concurrent: Searches that can crawl at once
+            max_queued: Searches that can wait for a slot before new ones are turned away
+            max_queue_seconds: Longest a search may wait for a slot
+            max_per_key: Searches an API key can have waiting or running (0 for no limit)
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_queue_seconds = max_queue_seconds
+        self.max_per_key = max_per_key
+        self.active = 0
+        self.waiters: deque = deque()
+        self.held_by_key: Dict[str, int] = {}
+        # Moving average of how long searches hold a slot, until searches have been timed
+        self.average_seconds = 15.0
+
+        ADMISSION_ACTIVE.set_function(lambda: self.active)
+        ADMISSION_QUEUE_DEPTH.set_function(lambda: len(self.waiters))
+
+    def estimated_wait(self) -> float:
+        """
+        Seconds a search starting to wait now would likely wait for a slot.
+        """
+        if self.active < self.max_concurrent and not self.waiters:
+            return 0.0
+        return (len(self.waiters) + 1) / self.max_concurrent * self.average_seconds
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the searches waiting now have likely been admitted.
+        """
+        return max(1, math.ceil(self.estimated_wait()))
+
+    def hold(self, key: Optional[str]) -> None:
+        """
+        Count a search against its API key's limit, until release_hold().
+
+        Args:
+            key: API key of the search, or None if it is not limited
+
+        Raises:
+            AdmissionRejectedError: If the key already has max_per_key searches
+        """
+        if key is None:
+            return
+        held = self.held_by_key.get(key, 0)
+        if self.max_per_key and held >= self.max_per_key:
+            ADMISSIONS.inc(result='key_limit')
+            raise AdmissionRejectedError(
+                f"{held} searches already waiting or running for this API key",
+                'key_limit', 429, max(1, math.ceil(self.average_seconds))
+            )
+        self.held_by_key[key] = held + 1
+
+    def release_hold(self, key: Optional[str]) -> None:
+        """
+        Stop counting a search against its API key's limit.
+        """
+        if key is None:
+            return
+        held = self.held_by_key.get(key, 0) - 1
+        if held > 0:
+            self.held_by_key[key] = held
+        else:
+            self.held_by_key.pop(key, None)
+
+    @asynccontextmanager
+    async def admit(self, key: Optional[str] = None, shed: bool = True) -> AsyncIterator[None]:
+        """
+        Hold a crawl slot for the duration of the block.
+
+        Args:
+            key: API key of the search, counted against its limit, or None
+            shed: Turn the search away when the queue is full or the wait too long.
+                Background workers pass False: they are few and can wait.
+
+        Raises:
+            AdmissionRejectedError: If the search is turned away
+        """
+        self.hold(key)
+        try:
+            await self._acquire(shed)
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self.average_seconds = 0.8 * self.average_seconds + 0.2 * (time.monotonic() - started)
+                self._release()
+        finally:
+            self.release_hold(key)
+
+    async def _acquire(self, shed: bool) -> None:
+        """
+        Take a free slot, or wait in the queue for one.
+        """
+        if self.active < self.max_concurrent and not self.waiters:
+            self.active += 1
+            ADMISSIONS.inc(result='admitted')
+            ADMISSION_QUEUE_WAIT.observe(0.0)
+            return
+
+        if shed:
+            if len(self.waiters) >= self.max_queued:
+                self._reject('queue_full', f"{len(self.waiters)} searches are already waiting for a crawl slot")
+            if self.estimated_wait() > self.max_queue_seconds:
+                self._reject('shed', f"Expected wait for a crawl slot is {self.estimated_wait():.0f}s")
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_seconds if shed else None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended
+                self._release()
+            elif waiter in self.waiters:
+                self.waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject('timeout', f"No crawl slot within {self.max_queue_seconds:.0f}s")
+        ADMISSIONS.inc(result='admitted')
+        ADMISSION_QUEUE_WAIT.observe(time.monotonic() - started)
+
+    def _release(self) -> None:
+        """
+        Hand the slot to the longest-waiting search, or free it.
+        """
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                # The slot passes straight to the waiter, so active is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _reject(self, reason: str, message: str) -> None:
+        """
+        Turn a search away with a 503.
+        """
+        ADMISSIONS.inc(result=reason)
+        logger.warning(f"Search turned away ({reason}): {message}")
+        raise AdmissionRejectedError(message, reason, 503, self.retry_after())
+
+
+# Create a global admission controller instance
+admission_controller = AdmissionController(
+    settings.ADMISSION_MAX_CONCURRENT,
+    settings.ADMISSION_MAX_QUEUED,
+    settings.ADMISSION_MAX_QUEUE_SECONDS,
+    settings.ADMISSION_MAX_PER_KEY
+)
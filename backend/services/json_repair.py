@@ -0,0 +1,192 @@
+"""
+Local repair of malformed JSON from LLM completions.
+
+Models asked for JSON sometimes wrap it in a code block or prose, leave
+trailing commas, use single quotes or Python literals, or get cut off at the
+token limit. These are fixed here, without another LLM round trip.
+"""
+from typing import Any, List, Optional, Tuple
+import json
+import re
+
+
+# Fenced code block, possibly unterminated when the completion was cut off
+CODE_BLOCK = re.compile(r'```(?:json)?\s*(.*?)(?:```|$)', re.DOTALL | re.IGNORECASE)
+
+# Python literals where JSON literals belong
+PYTHON_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+
+CLOSERS = {'{': '}', '[': ']'}
+
+
+def extract_json_text(content: str) -> Optional[str]:
+    """
+    Cut the JSON out of a completion: a code block's content, or the text from the first brace or bracket.
+
+    Args:
+        content: Completion text
+
+    Returns:
+        The JSON text, or None if there is no object or array in it
+    """
+    block = CODE_BLOCK.search(content)
+    if block and re.search(r'[{\[]', block.group(1)):
+        content = block.group(1)
+    starts = [index for index in (content.find('{'), content.find('[')) if index >= 0]
+    if not starts:
+        return None
+    return content[min(starts):].strip()
+
+
+def _normalize_tokens(text: str) -> str:
+    """
+    Rewrite single-quoted strings, bare object keys and Python literals outside double-quoted strings.
+    """
+    out: List[str] = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == '"':
+            # Copy a double-quoted string as is
+            end = index + 1
+            while end < len(text) and text[end] != '"':
+                end += 2 if text[end] == '\\' else 1
+            out.append(text[index:end + 1])
+            index = end + 1
+        elif char == "'":
+            end = index + 1
+            while end < len(text) and text[end] != "'":
+                end += 2 if text[end] == '\\' else 1
+            inner = text[index + 1:end].replace("\\'", "'").replace('"', '\\"')
+            out.append(f'"{inner}"' if end < len(text) else f'"{inner}')
+            index = end + 1
+        elif char.isalpha() or char == '_':
+            end = index
+            while end < len(text) and (text[end].isalnum() or text[end] == '_'):
+                end += 1
+            word = text[index:end]
+            previous = text[:index].rstrip()[-1:]
+            if previous in ('{', ',') and text[end:].lstrip().startswith(':'):
+                word = f'"{word}"'
+            out.append(PYTHON_LITERALS.get(word, word))
+            index = end
+        else:
+            out.append(char)
+            index += 1
+    return ''.join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """
+    Cut an incomplete trailing token (an unterminated string, a partial
+    literal, a key without its value) and close the arrays and objects left
+    open, as when a completion hit its token limit.
+    """
+    stack: List[List[Any]] = []  # [opener, whether a key comes next]
+    in_string = False
+    escaped = False
+    string_is_key = False
+    token_start: Optional[int] = None
+    # Where the text can be cut: after the last complete value or opener
+    safe = 0
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if string_is_key:
+                    stack[-1][1] = False
+                else:
+                    safe = index + 1
+            continue
+        if token_start is not None and (char in ',:}]' or char.isspace()):
+            if _is_literal(text[token_start:index]):
+                safe = index
+            token_start = None
+        if char == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1][0] == '{' and stack[-1][1]
+        elif char in CLOSERS:
+            stack.append([char, char == '{'])
+            safe = index + 1
+        elif char in '}]':
+            if stack:
+                stack.pop()
+            safe = index + 1
+            if not stack:
+                # Anything after the outermost value is commentary
+                return text[:index + 1]
+        elif char == ',':
+            if stack and stack[-1][0] == '{':
+                stack[-1][1] = True
+        elif char != ':' and not char.isspace() and token_start is None:
+            token_start = index
+    if not stack:
+        return text
+    if token_start is not None and not in_string and _is_literal(text[token_start:]):
+        # The text ends with a whole number or literal; only its closing bracket is missing
+        safe = len(text)
+    return text[:safe].rstrip().rstrip(',') + ''.join(CLOSERS[opener] for opener, _ in reversed(stack))
+
+
+def _is_literal(token: str) -> bool:
+    """
+    Whether a token is a complete JSON number, true, false or null.
+    """
+    try:
+        json.loads(token)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+def repair_json(content: str) -> Optional[str]:
+    """
+    Repair the JSON in a completion.
+
+    Args:
+        content: Completion text
+
+    Returns:
+        JSON text that json.loads() accepts, or None if it could not be repaired
+    """
+    text = extract_json_text(content)
+    if text is None:
+        return None
+    text = _close_truncated(_normalize_tokens(text))
+    # Trailing commas before a closing brace or bracket
+    text = re.sub(r',\s*([}\]])', r'\1', text)
+    try:
+        json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return text
+
+
+def parse_json_lenient(content: str) -> Tuple[Any, bool]:
+    """
+    Parse the JSON in a completion, repairing it if needed.
+
+    Args:
+        content: Completion text
+
+    Returns:
+        Tuple of (parsed value, whether it had to be repaired)
+
+    Raises:
+        ValueError: If the completion holds no JSON that could be repaired
+    """
+    text = extract_json_text(content)
+    if text is not None:
+        try:
+            # Commentary after the value is not a reason to repair it
+            return json.JSONDecoder().raw_decode(text)[0], False
+        except json.JSONDecodeError:
+            pass
+    repaired = repair_json(content)
+    if repaired is None:
+        raise ValueError("No valid JSON in the completion")
+    return json.loads(repaired), True
@@ -0,0 +1,33 @@
+"""
+Exceptions raised by the LLM service and its providers.
+"""
+from typing import Optional
+
+
+class LLMServiceError(Exception):
+    """Base exception for LLM service errors."""
+    pass
+
+class APIConnectionError(LLMServiceError):
+    """Exception raised when connection to LLM API fails."""
+    pass
+
+class APIResponseError(LLMServiceError):
+    """Exception raised when LLM API returns an error."""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class ModelNotFoundError(APIResponseError):
+    """Exception raised when the LLM API does not know the requested model."""
+    pass
+
+class ResponseParsingError(LLMServiceError):
+    """Exception raised when parsing the LLM API response fails."""
+    pass
+
+class JSONGenerationError(APIResponseError):
+    """Exception raised when the LLM API rejects its own output in JSON mode."""
+    def __init__(self, message: str, status_code: Optional[int] = None, failed_generation: str = ""):
+        super().__init__(message, status_code)
+        self.failed_generation = failed_generation
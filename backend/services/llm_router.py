@@ -0,0 +1,607 @@
+"""
+LLM provider routing.
+
+Chat completions can be served by several OpenAI-compatible providers: Groq,
+and a local Ollama server (as run by docker-compose). Each provider tracks
+its recent latency and error rate, and limits its own concurrency. The
+router sends a request to the provider with the lowest expected latency,
+penalized by its error rate and current load, and fails over to the next
+provider when a request fails.
+
+With hedging enabled, if the chosen provider has not answered within its
+90th percentile latency, the same request is sent to the next provider and
+whichever answers first is used; the other request is cancelled.
+
+Streamed completions (server-sent events) fail over only until the first
+text arrives, and are not hedged.
+"""
+from typing import AsyncIterator, Dict, Any, List, Optional
+import asyncio
+import contextlib
+import json
+import math
+import time
+from collections import deque
+
+import httpx
+
+from core.config import settings
+from core.logging import get_logger
+from core.tracing import tracer
+from core.metrics import LLM_PROVIDER_DURATION, LLM_HEDGES
+from .llm_errors import (
+    LLMServiceError, APIConnectionError, APIResponseError, ModelNotFoundError, JSONGenerationError, ResponseParsingError
+)
+from .llm_scheduler import RateLimitScheduler
+
+# Get logger
+logger = get_logger(__name__)
+
+
+# Successful latencies needed before a provider's own p90 is used as hedge delay
+MIN_HEDGE_SAMPLES = 20
+
+# Seconds for a provider's error rate to halve once it stops failing
+ERROR_HALF_LIFE_SECONDS = 60.0
+
+# Errors caused by the request rather than the provider, which other providers would repeat
+REQUEST_ERRORS = (ModelNotFoundError, JSONGenerationError)
+
+
+class LLMProvider:
+    """
+    OpenAI-compatible chat completions endpoint with latency and error tracking.
+    """
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: str = "",
+        model: Optional[str] = None,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        expected_latency: float = 1.0,
+        alpha: float = 0.2,
+        scheduler: Optional[RateLimitScheduler] = None
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Provider name (e.g. 'groq', 'ollama')
+            base_url: Chat completions URL
+            api_key: Bearer token, or "" for none
+            model: Model to use for every request, or None to use the requested model
+            max_concurrency: Maximum requests in flight to this provider
+            timeout: Request timeout in seconds
+            expected_latency: Latency assumed before the first response
+            alpha: Weight of the newest observation in the moving averages
+            scheduler: Rate limit scheduler, or None for a provider without rate limits
+        """
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.alpha = alpha
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.latency = expected_latency
+        self.error_rate = 0.0
+        self.last_error = 0.0
+        self.latencies: deque = deque(maxlen=200)
+        self.scheduler = scheduler or RateLimitScheduler(name)
+
+    def model_for(self, model: str) -> str:
+        """
+        Model name to send to this provider for a requested model.
+        """
+        return self.model or model
+
+    def current_error_rate(self) -> float:
+        """
+        Error rate, decayed by the time since the last error.
+        """
+        if not self.error_rate:
+            return 0.0
+        return self.error_rate * 0.5 ** ((time.time() - self.last_error) / ERROR_HALF_LIFE_SECONDS)
+
+    def score(self) -> float:
+        """
+        Expected cost of sending a request here (lower is better).
+        """
+        load = self.in_flight / self.max_concurrency
+        return self.latency * (1 + load) / max(1 - self.current_error_rate(), 0.05)
+
+    def hedge_delay(self) -> float:
+        """
+        Seconds to wait for this provider before hedging: its p90 latency once known.
+        """
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return settings.LLM_HEDGE_DELAY_SECONDS
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.9 * len(ordered)) - 1)]
+
+    def _record(self, seconds: float, success: bool) -> None:
+        """
+        Update the moving averages with the outcome of a request.
+        """
+        self.error_rate = self.current_error_rate() * (1 - self.alpha) + (0.0 if success else self.alpha)
+        if success:
+            self.latency = self.latency * (1 - self.alpha) + seconds * self.alpha
+            self.latencies.append(seconds)
+        else:
+            self.last_error = time.time()
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send a chat completion request once the rate limit budget allows.
+
+        Args:
+            prompt: User message
+            model: Requested model
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Scheduling priority, or None for the current context's priority
+            json_mode: Whether to ask for a JSON object (response_format json_object)
+
+        Returns:
+            Response JSON
+
+        Raises:
+            APIConnectionError: If connection to the provider fails
+            ModelNotFoundError: If the provider does not know the model
+            JSONGenerationError: If the provider rejected the model's output in JSON mode
+            APIResponseError: If the provider returns an error
+            ResponseParsingError: If the response is not valid JSON
+        """
+        model = self.model_for(model)
+        # Prompt at about four characters per token, plus a share of the completion allowance
+        tokens = len(prompt) // 4 + max_tokens // 4
+        self.in_flight += 1
+        try:
+            reservation = await self.scheduler.acquire(model, tokens, priority)
+            async with self.semaphore:
+                return await self._post(prompt, model, temperature, max_tokens, reservation, json_mode)
+        finally:
+            self.in_flight -= 1
+
+    async def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion once the rate limit budget allows.
+
+        Closing the generator early closes the connection, which stops generation.
+
+        Args:
+            prompt: User message
+            model: Requested model
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Scheduling priority, or None for the current context's priority
+
+        Yields:
+            Pieces of the completion text as they arrive
+
+        Raises:
+            APIConnectionError: If connection to the provider fails
+            ModelNotFoundError: If the provider does not know the model
+            APIResponseError: If the provider returns an error
+            ResponseParsingError: If an event is not valid JSON
+        """
+        model = self.model_for(model)
+        tokens = len(prompt) // 4 + max_tokens // 4
+        self.in_flight += 1
+        try:
+            reservation = await self.scheduler.acquire(model, tokens, priority)
+            async with self.semaphore:
+                started = time.perf_counter()
+                outcome = 'error'
+                headers = None
+                status_code = None
+                streamed_chars = 0
+                total_tokens = None
+                # Opened without becoming the current span, which would leak into the consumer's code at each yield
+                span = tracer.start_span('llm.provider', provider=self.name, model=model, stream=True)
+                error = None
+                try:
+                    async with httpx.AsyncClient() as client:
+                        async with client.stream(
+                            'POST',
+                            self.base_url,
+                            headers=self.headers,
+                            json={
+                                "model": model,
+                                "messages": [{"role": "user", "content": prompt}],
+                                "temperature": temperature,
+                                "max_tokens": max_tokens,
+                                "stream": True
+                            },
+                            timeout=self.timeout
+                        ) as response:
+                            headers = response.headers
+                            status_code = response.status_code
+                            if span:
+                                span.set_attribute('http.status_code', status_code)
+                            if status_code >= 400:
+                                body = await response.aread()
+                                self._raise_for_error(status_code, body)
+
+                            async for line in response.aiter_lines():
+                                if not line.startswith('data:'):
+                                    continue
+                                data = line[5:].strip()
+                                if data == '[DONE]':
+                                    break
+                                event = json.loads(data)
+                                if "error" in event:
+                                    self._raise_for_error(status_code, data.encode())
+                                # Groq reports usage in its last event under x_groq, OpenAI under usage
+                                usage = event.get("usage") or (event.get("x_groq") or {}).get("usage")
+                                if isinstance(usage, dict):
+                                    total_tokens = usage.get("total_tokens")
+                                for choice in event.get("choices") or []:
+                                    text = (choice.get("delta") or {}).get("content")
+                                    if text:
+                                        streamed_chars += len(text)
+                                        yield text
+                    outcome = 'success'
+                except ModelNotFoundError as e:
+                    # The request, not the provider, is at fault
+                    outcome = 'model_error'
+                    error = e
+                    raise
+                except APIResponseError as e:
+                    if e.status_code == 429:
+                        outcome = 'throttled'
+                    error = e
+                    raise
+                except httpx.RequestError as e:
+                    error = APIConnectionError(f"Error connecting to {self.name} API: {str(e)}")
+                    raise error
+                except json.JSONDecodeError as e:
+                    error = ResponseParsingError(f"Error parsing {self.name} API response: {str(e)}")
+                    raise error
+                except (asyncio.CancelledError, GeneratorExit):
+                    # Closed by the caller once it had what it needed
+                    outcome = 'stopped'
+                    raise
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    seconds = time.perf_counter() - started
+                    LLM_PROVIDER_DURATION.observe(seconds, provider=self.name, outcome=outcome)
+                    if outcome not in ('stopped', 'model_error'):
+                        self._record(seconds, outcome == 'success')
+                    if total_tokens is None and status_code == 200:
+                        total_tokens = len(prompt) // 4 + streamed_chars // 4
+                    tracer.end_span(span, error)
+                    await self.scheduler.release(model, reservation, headers, total_tokens, status_code)
+        finally:
+            self.in_flight -= 1
+
+    def _raise_for_error(self, status_code: int, body: bytes) -> None:
+        """
+        Raise the error in an error response or event body.
+        """
+        try:
+            error = json.loads(body).get("error")
+        except (ValueError, AttributeError):
+            error = body.decode(errors='replace')[:200]
+        error_message = error.get("message", "Unknown API error") if isinstance(error, dict) else str(error)
+        if status_code != 429 and ("model" in error_message.lower() or "not found" in error_message.lower()):
+            raise ModelNotFoundError(f"{self.name} API error: {error_message}", status_code)
+        raise APIResponseError(f"{self.name} API error: {error_message}", status_code)
+
+    async def _post(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        reservation: list,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Post a request and record its latency, outcome and rate limit usage.
+        """
+        started = time.perf_counter()
+        outcome = 'error'
+        response = None
+        total_tokens = None
+        body = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if json_mode:
+            body["response_format"] = {"type": "json_object"}
+        with tracer.span('llm.provider', provider=self.name, model=model) as span:
+            try:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(
+                        self.base_url,
+                        headers=self.headers,
+                        json=body,
+                        timeout=self.timeout
+                    )
+                if span:
+                    span.set_attribute('http.status_code', response.status_code)
+                response_json = response.json()
+
+                if "error" in response_json:
+                    error = response_json.get("error")
+                    error_message = error.get("message", "Unknown API error") if isinstance(error, dict) else str(error)
+                    if response.status_code == 429:
+                        outcome = 'throttled'
+                    elif isinstance(error, dict) and error.get("code") == "json_validate_failed":
+                        # The model's output was not valid JSON; the caller can repair it
+                        outcome = 'json_error'
+                        raise JSONGenerationError(
+                            f"{self.name} API error: {error_message}",
+                            response.status_code,
+                            error.get("failed_generation") or ""
+                        )
+                    elif "model" in error_message.lower() or "not found" in error_message.lower():
+                        # The request, not the provider, is at fault
+                        outcome = 'model_error'
+                        raise ModelNotFoundError(f"{self.name} API error: {error_message}", response.status_code)
+                    raise APIResponseError(f"{self.name} API error: {error_message}", response.status_code)
+
+                usage = response_json.get("usage")
+                if isinstance(usage, dict):
+                    total_tokens = usage.get("total_tokens")
+                outcome = 'success'
+                return response_json
+            except httpx.RequestError as e:
+                raise APIConnectionError(f"Error connecting to {self.name} API: {str(e)}")
+            except json.JSONDecodeError as e:
+                raise ResponseParsingError(f"Error parsing {self.name} API response: {str(e)}")
+            except asyncio.CancelledError:
+                outcome = 'cancelled'
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                LLM_PROVIDER_DURATION.observe(seconds, provider=self.name, outcome=outcome)
+                if outcome not in ('cancelled', 'model_error', 'json_error'):
+                    self._record(seconds, outcome == 'success')
+                await self.scheduler.release(
+                    model,
+                    reservation,
+                    response.headers if response is not None else None,
+                    total_tokens,
+                    response.status_code if response is not None else None
+                )
+
+
+class LLMRouter:
+    """
+    Routes completions to the best provider, with failover and optional hedging.
+    """
+    def __init__(self, providers: List[LLMProvider], hedging: bool = False):
+        """
+        Initialize the router.
+
+        Args:
+            providers: Providers to route between, in order of preference
+            hedging: Whether to hedge slow requests on a second provider
+        """
+        self.providers = providers
+        self.hedging = hedging
+
+    def ranked(self) -> List[LLMProvider]:
+        """
+        Providers from best to worst expected cost (ties keep configured order).
+        """
+        return sorted(self.providers, key=lambda provider: provider.score())
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get a chat completion from the best available provider.
+
+        Args:
+            prompt: User message
+            model: Requested model
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Scheduling priority, or None for the current context's priority
+            json_mode: Whether to ask for a JSON object
+
+        Returns:
+            Response JSON
+
+        Raises:
+            ModelNotFoundError: If the chosen provider does not know the model
+            JSONGenerationError: If the chosen provider rejected the model's output in JSON mode
+            LLMServiceError: If every provider failed (the first provider's error)
+        """
+        providers = self.ranked()
+        if not providers:
+            raise APIConnectionError("No LLM providers configured")
+        if self.hedging and len(providers) > 1:
+            return await self._hedged(providers, prompt, model, temperature, max_tokens, priority, json_mode)
+        return await self._failover(providers, prompt, model, temperature, max_tokens, priority, json_mode)
+
+    async def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from the best available provider.
+
+        A provider that fails before sending any text is replaced by the next
+        one; once text has arrived, errors are raised to the caller.
+
+        Args:
+            prompt: User message
+            model: Requested model
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Scheduling priority, or None for the current context's priority
+
+        Yields:
+            Pieces of the completion text as they arrive
+
+        Raises:
+            ModelNotFoundError: If the chosen provider does not know the model
+            LLMServiceError: If every provider failed (the first provider's error)
+        """
+        providers = self.ranked()
+        if not providers:
+            raise APIConnectionError("No LLM providers configured")
+        first_error: Optional[LLMServiceError] = None
+        for provider in providers:
+            started = False
+            try:
+                async with contextlib.aclosing(provider.stream(prompt, model, temperature, max_tokens, priority)) as pieces:
+                    async for text in pieces:
+                        started = True
+                        yield text
+                return
+            except ModelNotFoundError:
+                raise
+            except LLMServiceError as e:
+                if started:
+                    raise
+                logger.warning(f"LLM provider {provider.name} failed: {e}")
+                first_error = first_error or e
+        raise first_error
+
+    async def _failover(
+        self,
+        providers: List[LLMProvider],
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Try providers in turn until one answers.
+        """
+        first_error: Optional[LLMServiceError] = None
+        for provider in providers:
+            try:
+                return await provider.complete(prompt, model, temperature, max_tokens, priority, json_mode)
+            except REQUEST_ERRORS:
+                raise
+            except LLMServiceError as e:
+                logger.warning(f"LLM provider {provider.name} failed: {e}")
+                first_error = first_error or e
+        raise first_error
+
+    async def _hedged(
+        self,
+        providers: List[LLMProvider],
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send to the best provider and, if it is slow, to the next one as well.
+        """
+        primary, backup = providers[0], providers[1]
+        first = asyncio.ensure_future(primary.complete(prompt, model, temperature, max_tokens, priority, json_mode))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=primary.hedge_delay())
+        except BaseException:
+            first.cancel()
+            raise
+        if done:
+            try:
+                return first.result()
+            except REQUEST_ERRORS:
+                raise
+            except LLMServiceError as e:
+                logger.warning(f"LLM provider {primary.name} failed: {e}")
+                return await self._failover(providers[1:], prompt, model, temperature, max_tokens, priority, json_mode)
+
+        LLM_HEDGES.inc(result='sent')
+        hedge = asyncio.ensure_future(backup.complete(prompt, model, temperature, max_tokens, priority, json_mode))
+        pending = {first, hedge}
+        errors: Dict[asyncio.Future, BaseException] = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        LLM_HEDGES.inc(result='hedge_won' if task is hedge else 'primary_won')
+                        return task.result()
+                    errors[task] = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise errors.get(first) or errors[hedge]
+
+
+def build_router(api_key: str) -> LLMRouter:
+    """
+    Build the router for the providers listed in LLM_PROVIDERS.
+
+    Args:
+        api_key: Groq API key
+
+    Returns:
+        LLM router
+    """
+    providers = []
+    for name in (name.strip().lower() for name in settings.LLM_PROVIDERS.split(',')):
+        if name == 'groq':
+            providers.append(LLMProvider(
+                'groq',
+                settings.GROQ_API_BASE_URL,
+                api_key,
+                max_concurrency=settings.GROQ_MAX_CONCURRENCY,
+                scheduler=RateLimitScheduler(
+                    'groq',
+                    settings.GROQ_REQUESTS_PER_MINUTE,
+                    settings.GROQ_TOKENS_PER_MINUTE
+                )
+            ))
+        elif name == 'ollama':
+            providers.append(LLMProvider(
+                'ollama',
+                settings.OLLAMA_API_BASE_URL,
+                model=settings.OLLAMA_MODEL,
+                max_concurrency=settings.OLLAMA_MAX_CONCURRENCY,
+                timeout=120.0,
+                expected_latency=3.0
+            ))
+        elif name:
+            logger.warning(f"Unknown LLM provider {name!r} in LLM_PROVIDERS")
+    return LLMRouter(providers, settings.LLM_HEDGING)
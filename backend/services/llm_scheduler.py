@@ -0,0 +1,301 @@
+"""
+Client-side LLM rate limit scheduling.
+
+Groq limits requests and tokens per minute per model, and answers requests
+over the limit with 429s. Rather than sending requests and backing off after
+429s, calls wait here until the model's budget has room for them:
+
+- a sliding one-minute window of the requests and tokens sent, checked
+  against the requests-per-minute and tokens-per-minute limits (the limits
+  in Groq's x-ratelimit-limit-* headers override the configured ones),
+- the remaining requests and tokens and their reset times from Groq's
+  x-ratelimit-remaining-* and x-ratelimit-reset-* headers,
+- a hold until retry-after once a 429 does come back.
+
+Waiting calls are served by priority, so keyword and strategy calls on the
+critical path of a search go ahead of background categorizations.
+"""
+from typing import Dict, Any, Iterator, Optional
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import re
+import time
+from collections import deque
+
+from core.metrics import LLM_SCHEDULER_WAIT
+
+
+# Call priorities (lower is served first)
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {PRIORITY_CRITICAL: 'critical', PRIORITY_NORMAL: 'normal', PRIORITY_BACKGROUND: 'background'}
+
+# Priority of LLM calls made in the current context, unless a call passes its own
+current_priority: contextvars.ContextVar = contextvars.ContextVar('llm_priority', default=PRIORITY_NORMAL)
+
+# Groq reset durations, e.g. "2m59.56s", "7.66s", "120ms"
+DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_SECONDS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+@contextlib.contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """
+    Run the LLM calls in a block at a priority.
+
+    Args:
+        priority: PRIORITY_CRITICAL, PRIORITY_NORMAL or PRIORITY_BACKGROUND
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit reset or retry-after value into seconds.
+
+    Args:
+        value: Header value, either plain seconds ("1", "0.5") or a Groq duration ("1m2.5s")
+
+    Returns:
+        Seconds, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    """
+    Integer value of a header, or None.
+    """
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelBudget:
+    """
+    Request and token budget of one model, and the calls waiting for it.
+    """
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize the budget.
+
+        Args:
+            requests_per_minute: Request limit, 0 for none
+            tokens_per_minute: Token limit, 0 for none
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window: deque = deque()  # [sent_at, tokens] of requests in the last minute
+        self.tokens_in_window = 0
+        self.remaining_requests: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.remaining_tokens: Optional[int] = None
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+        self.waiting: list = []
+        self.condition = asyncio.Condition()
+
+    def _expire(self, now: float) -> None:
+        """
+        Drop requests older than a minute from the window.
+        """
+        while self.window and self.window[0][0] <= now - 60:
+            _, tokens = self.window.popleft()
+            self.tokens_in_window -= tokens
+
+    def delay(self, tokens: int) -> float:
+        """
+        Seconds until a call of an estimated size fits the budget (0 if it fits now).
+        """
+        now = time.time()
+        self._expire(now)
+        delays = [self.blocked_until - now]
+        if self.requests_per_minute and len(self.window) >= self.requests_per_minute:
+            delays.append(self.window[0][0] + 60 - now)
+        # A call larger than the whole limit still goes once the window is empty
+        if self.tokens_per_minute and self.window and self.tokens_in_window + tokens > self.tokens_per_minute:
+            delays.append(self.window[0][0] + 60 - now)
+        if self.remaining_requests is not None and self.remaining_requests < 1:
+            delays.append(self.requests_reset_at - now)
+        if self.remaining_tokens is not None and self.remaining_tokens < tokens:
+            delays.append(self.tokens_reset_at - now)
+        return max(max(delays), 0.0)
+
+    def reserve(self, tokens: int) -> list:
+        """
+        Count a call against the budget.
+
+        Returns:
+            Window entry of the call, for correcting its token count later
+        """
+        entry = [time.time(), tokens]
+        self.window.append(entry)
+        self.tokens_in_window += tokens
+        if self.remaining_requests is not None:
+            self.remaining_requests -= 1
+        if self.remaining_tokens is not None:
+            self.remaining_tokens -= tokens
+        return entry
+
+
+class RateLimitScheduler:
+    """
+    Holds LLM calls until their model's rate limit budget has room, by priority.
+    """
+    def __init__(self, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            name: Provider name, for metrics
+            requests_per_minute: Default request limit per model, 0 for none
+            tokens_per_minute: Default token limit per model, 0 for none
+        """
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.budgets: Dict[str, ModelBudget] = {}
+        self.sequence = itertools.count()
+
+    def _budget(self, model: str) -> ModelBudget:
+        """
+        Get the budget of a model.
+        """
+        if model not in self.budgets:
+            self.budgets[model] = ModelBudget(self.requests_per_minute, self.tokens_per_minute)
+        return self.budgets[model]
+
+    async def acquire(self, model: str, tokens: int, priority: Optional[int] = None) -> list:
+        """
+        Wait until a call fits the model's budget and no higher priority call is waiting.
+
+        Args:
+            model: Model the call goes to
+            tokens: Estimated tokens of the call (prompt and completion)
+            priority: Call priority, or None for the current context's priority
+
+        Returns:
+            Reservation to pass to release()
+        """
+        priority = current_priority.get() if priority is None else priority
+        budget = self._budget(model)
+        ticket = (priority, next(self.sequence))
+        started = time.perf_counter()
+        async with budget.condition:
+            heapq.heappush(budget.waiting, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if budget.waiting[0] == ticket:
+                        timeout = budget.delay(tokens)
+                        if timeout <= 0:
+                            heapq.heappop(budget.waiting)
+                            # Let the next caller check the budget
+                            budget.condition.notify_all()
+                            break
+                    try:
+                        await asyncio.wait_for(budget.condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if ticket in budget.waiting:
+                    budget.waiting.remove(ticket)
+                    heapq.heapify(budget.waiting)
+                    budget.condition.notify_all()
+                raise
+            reservation = budget.reserve(tokens)
+        LLM_SCHEDULER_WAIT.observe(
+            time.perf_counter() - started,
+            provider=self.name,
+            priority=PRIORITY_NAMES.get(priority, str(priority))
+        )
+        return reservation
+
+    async def release(
+        self,
+        model: str,
+        reservation: list,
+        headers: Any = None,
+        total_tokens: Optional[int] = None,
+        status_code: Optional[int] = None
+    ) -> None:
+        """
+        Update the budget with the outcome of a call.
+
+        Args:
+            model: Model the call went to
+            reservation: Value returned by acquire()
+            headers: Response headers, for Groq's rate limit headers
+            total_tokens: Tokens the call actually used, if known
+            status_code: HTTP status of the response
+        """
+        budget = self._budget(model)
+        async with budget.condition:
+            now = time.time()
+            budget._expire(now)
+            # A call's entry leaves the window after a minute, taking its reserved count with it
+            if total_tokens is not None and reservation[0] > now - 60:
+                budget.tokens_in_window += total_tokens - reservation[1]
+                reservation[1] = total_tokens
+            if headers is not None:
+                self._read_headers(budget, headers)
+            if status_code == 429:
+                retry_after = parse_duration(headers.get('retry-after')) if headers is not None else None
+                budget.blocked_until = max(budget.blocked_until, time.time() + (retry_after or 1.0))
+            budget.condition.notify_all()
+
+    def _read_headers(self, budget: ModelBudget, headers: Any) -> None:
+        """
+        Update a budget from Groq's x-ratelimit-* headers.
+        """
+        now = time.time()
+        limit_tokens = _header_int(headers, 'x-ratelimit-limit-tokens')
+        if limit_tokens:
+            budget.tokens_per_minute = limit_tokens
+
+        remaining_requests = _header_int(headers, 'x-ratelimit-remaining-requests')
+        if remaining_requests is not None:
+            budget.remaining_requests = remaining_requests
+            budget.requests_reset_at = now + (parse_duration(headers.get('x-ratelimit-reset-requests')) or 60.0)
+        remaining_tokens = _header_int(headers, 'x-ratelimit-remaining-tokens')
+        if remaining_tokens is not None:
+            budget.remaining_tokens = remaining_tokens
+            budget.tokens_reset_at = now + (parse_duration(headers.get('x-ratelimit-reset-tokens')) or 60.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current budget of each model.
+        """
+        now = time.time()
+        snapshot = {}
+        for model, budget in self.budgets.items():
+            budget._expire(now)
+            snapshot[model] = {
+                'requests_in_window': len(budget.window),
+                'tokens_in_window': budget.tokens_in_window,
+                'requests_per_minute': budget.requests_per_minute,
+                'tokens_per_minute': budget.tokens_per_minute,
+                'waiting': len(budget.waiting),
+                'blocked_seconds': max(budget.blocked_until - now, 0.0),
+            }
+        return snapshot
@@ -0,0 +1,107 @@
+"""
+Schemas of the JSON the agents ask the LLM for.
+
+Each LLM call that returns JSON is validated against one of these models.
+Values models commonly get slightly wrong (a comma-separated string where a
+list was asked for, a number as a job ID, "requiredSkills" or "Required
+skills" for required_skills) are coerced; missing required fields and wrong
+types fail validation.
+"""
+from typing import Any, Dict, List
+import re
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+def _string_list(value: Any) -> Any:
+    """
+    Coerce a comma-separated string or a list with non-string items into a list of strings.
+    """
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if isinstance(item, (str, int, float)) and str(item).strip()]
+    return value
+
+
+def _snake_case(key: str) -> str:
+    """
+    Convert a camelCase, title-case or hyphenated key to snake_case.
+    """
+    key = re.sub(r'(?<=[a-z0-9])([A-Z])', r'_\1', key.strip())
+    return re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')
+
+
+class SearchStrategySchema(BaseModel):
+    """Search strategy returned by the strategy prompt."""
+    model_config = ConfigDict(extra='ignore')
+
+    platforms: List[str]
+    filters: Dict[str, Any] = Field(default_factory=dict)
+    keywordVariations: List[str] = Field(default_factory=list)
+    specialConsiderations: List[str] = Field(default_factory=list)
+
+    @field_validator('platforms', 'keywordVariations', 'specialConsiderations', mode='before')
+    @classmethod
+    def split_lists(cls, value: Any) -> Any:
+        return _string_list(value)
+
+
+class SearchPlanSchema(SearchStrategySchema):
+    """Enhanced keywords and search strategy returned by the combined prompt."""
+    keywords: List[str]
+
+    @field_validator('keywords', mode='before')
+    @classmethod
+    def split_keywords(cls, value: Any) -> Any:
+        return _string_list(value)
+
+
+class JobAnalysisSchema(BaseModel):
+    """Categorization of one job description."""
+    model_config = ConfigDict(extra='ignore')
+
+    required_skills: List[str]
+    experience_level: str
+    job_category: str
+    key_responsibilities: List[str] = Field(default_factory=list)
+    nice_to_have_skills: List[str] = Field(default_factory=list)
+
+    @model_validator(mode='before')
+    @classmethod
+    def snake_case_keys(cls, value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        normalized = dict(value)
+        for key, item in value.items():
+            name = _snake_case(key) if isinstance(key, str) else key
+            if name != key and name in cls.model_fields and name not in value:
+                normalized[name] = item
+        return normalized
+
+    @field_validator('required_skills', 'key_responsibilities', 'nice_to_have_skills', mode='before')
+    @classmethod
+    def split_lists(cls, value: Any) -> Any:
+        return _string_list(value)
+
+
+class BatchJobAnalysisSchema(JobAnalysisSchema):
+    """Categorization of one job in a batch, with the ID it was given in the prompt."""
+    id: str
+
+    @field_validator('id', mode='before')
+    @classmethod
+    def id_string(cls, value: Any) -> Any:
+        return str(value) if isinstance(value, int) else value
+
+
+class BatchAnalysisSchema(BaseModel):
+    """
+    Categorizations returned by the batch prompt.
+
+    Jobs are validated one by one against BatchJobAnalysisSchema, so one
+    malformed job does not fail the whole batch.
+    """
+    model_config = ConfigDict(extra='ignore')
+
+    jobs: List[Dict[str, Any]]
@@ -1,34 +1,82 @@
 """
 LLM Service for handling interactions with language model providers.
-Currently supports Groq API.
+Supports Groq API and OpenAI-compatible local servers (Ollama), routed by
+services.llm_router.
+
+With LLM_STREAMING enabled, generate_list() and generate_json() stream the
+completion and parse it as it arrives, closing the stream as soon as the
+list or JSON object is complete.
+
+With LLM_JSON_MODE enabled, generate_json() asks the provider for a JSON
+object instead. Its output is repaired locally if needed and validated
+against the call's schema (services.llm_schemas); the LLM is asked again
+only if that fails.
 """
-from typing import Dict, Any, List, Optional
-import httpx
-from tenacity import retry, wait_exponential, stop_after_attempt
-import json
-import re
+from typing import AsyncIterator, Dict, Any, List, Optional, Type
+from pydantic import BaseModel, ValidationError
+from tenacity import retry, retry_if_not_exception_type, wait_exponential, stop_after_attempt
+import asyncio
+import contextlib
+import time
 
 from core.config import settings
 from core.logging import get_logger
+from core.tracing import tracer
+from core.metrics import LLM_REQUEST_DURATION, LLM_TOKENS, LLM_RETRIES, LLM_JSON_PARSE
+from .llm_errors import (
+    LLMServiceError, APIConnectionError, APIResponseError, ModelNotFoundError, JSONGenerationError, ResponseParsingError
+)
+from .llm_router import build_router
+from .json_repair import parse_json_lenient
+from .stream_parsers import IncrementalListParser, IncrementalJSONParser
 
 # Get logger
 logger = get_logger(__name__)
 
-class LLMServiceError(Exception):
-    """Base exception for LLM service errors."""
-    pass
+_backoff = wait_exponential(multiplier=1, min=4, max=10)
 
-class APIConnectionError(LLMServiceError):
-    """Exception raised when connection to LLM API fails."""
-    pass
 
-class APIResponseError(LLMServiceError):
-    """Exception raised when LLM API returns an error."""
-    pass
+def _retry_wait(retry_state) -> float:
+    """
+    Seconds to wait before retrying a completion (tenacity wait hook).
+    
+    Rate limited calls are retried at once: the scheduler holds them until
+    the provider's retry-after has passed.
+    """
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(error, APIResponseError) and error.status_code == 429:
+        return 0.0
+    return _backoff(retry_state)
+
+
+def parse_json_text(content: str) -> Any:
+    """
+    Parse the JSON in a completion (from a code block or the first brace),
+    repairing trailing commas, quotes and truncation.
+    
+    Args:
+        content: Completion text
+        
+    Returns:
+        Parsed JSON content
+        
+    Raises:
+        ResponseParsingError: If the text holds no valid JSON
+    """
+    try:
+        return parse_json_lenient(content or '')[0]
+    except ValueError as e:
+        logger.error(f"Error parsing JSON from Groq API response: {str(e)}")
+        raise ResponseParsingError(f"Error parsing JSON from Groq API response: {str(e)}")
+
+
+def _record_retry(retry_state) -> None:
+    """
+    Count a retried completion (tenacity before_sleep hook).
+    """
+    model = retry_state.kwargs.get('model') or settings.DEFAULT_LLM_MODEL
+    LLM_RETRIES.inc(model=model)
 
-class ResponseParsingError(LLMServiceError):
-    """Exception raised when parsing the LLM API response fails."""
-    pass
 
 class GroqService:
     """Service for interacting with Groq API."""
@@ -46,10 +94,13 @@ class GroqService:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.router = build_router(self.api_key)
     
     @retry(
-        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_not_exception_type(JSONGenerationError),
+        wait=_retry_wait,
         stop=stop_after_attempt(3),
+        before_sleep=_record_retry,
         reraise=True
     )
     async def generate_completion(
@@ -57,7 +108,9 @@ class GroqService:
         prompt: str, 
         model: str = None,
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        priority: Optional[int] = None,
+        json_mode: bool = False
     ) -> Dict[str, Any]:
         """
         Generate completion using Groq API.
@@ -67,75 +120,320 @@ class GroqService:
             model: Model to use (defaults to settings.DEFAULT_LLM_MODEL)
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
+            priority: Rate limit scheduling priority (see services.llm_scheduler),
+                or None for the priority of the current context
+            json_mode: Whether to ask for a JSON object (not retried if the provider rejects the output)
             
         Returns:
             Processed API response
             
         Raises:
             APIConnectionError: If connection to API fails
+            JSONGenerationError: If the provider rejected the model's output in JSON mode
             APIResponseError: If API returns an error
             ResponseParsingError: If parsing the response fails
         """
         # Use the default model from settings if none is provided
         model = model or settings.DEFAULT_LLM_MODEL
-        try:
-            # Log the request (without the full prompt for privacy/space reasons)
-            prompt_preview = prompt[:100] + "..." if len(prompt) > 100 else prompt
-            logger.debug(f"Calling Groq API with model={model}, temp={temperature}, prompt={prompt_preview}")
-            
-            # Make the API call
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json={
-                        "model": model,
-                        "messages": [{"role": "user", "content": prompt}],
-                        "temperature": temperature,
-                        "max_tokens": max_tokens
-                    },
-                    timeout=30.0  # 30 second timeout
-                )
-                
-                # Parse the response
-                response_json = response.json()
-                
-                # Check for API errors
-                if "error" in response_json:
-                    error_message = response_json.get("error", {}).get("message", "Unknown Groq API error")
-                    logger.error(f"Groq API error with model {model}: {error_message}")
-                    
-                    # If the error is model-related and we're not already using the fallback model, try the fallback
-                    if (model != settings.FALLBACK_LLM_MODEL and 
-                        ("model" in error_message.lower() or "not found" in error_message.lower())):
-                        logger.info(f"Trying fallback model: {settings.FALLBACK_LLM_MODEL}")
-                        return await self.generate_completion(
-                            prompt, 
-                            model=settings.FALLBACK_LLM_MODEL,
-                            temperature=temperature,
-                            max_tokens=max_tokens
-                        )
-                    
-                    raise APIResponseError(f"Groq API error: {error_message}")
+        started = time.perf_counter()
+        outcome = 'error'
+        with tracer.span('llm.completion', model=model, prompt_chars=len(prompt)) as span:
+            try:
+                # Log the request (without the full prompt for privacy/space reasons)
+                prompt_preview = prompt[:100] + "..." if len(prompt) > 100 else prompt
+                logger.debug(f"Calling Groq API with model={model}, temp={temperature}, prompt={prompt_preview}")
+            
+                # Send to the best provider (Groq unless LLM_PROVIDERS lists others)
+                response_json = await self.router.complete(prompt, model, temperature, max_tokens, priority, json_mode)
                 
                 # Check for expected response structure
                 if "choices" not in response_json or not response_json["choices"]:
-                    logger.error("Invalid response format from Groq API: missing 'choices'")
-                    raise ResponseParsingError("Invalid response format from Groq API: missing 'choices'")
+                    logger.error("Invalid response format from LLM API: missing 'choices'")
+                    raise ResponseParsingError("Invalid response format from LLM API: missing 'choices'")
                 
                 if "message" not in response_json["choices"][0]:
-                    logger.error("Invalid response format from Groq API: missing 'message' in choices")
-                    raise ResponseParsingError("Invalid response format from Groq API: missing 'message' in choices")
+                    logger.error("Invalid response format from LLM API: missing 'message' in choices")
+                    raise ResponseParsingError("Invalid response format from LLM API: missing 'message' in choices")
+                
+                usage = response_json.get("usage")
+                if isinstance(usage, dict):
+                    LLM_TOKENS.inc(usage.get("prompt_tokens", 0), model=model, kind='prompt')
+                    LLM_TOKENS.inc(usage.get("completion_tokens", 0), model=model, kind='completion')
+                    if span:
+                        span.set_attribute('llm.total_tokens', usage.get("total_tokens", 0))
+                outcome = 'success'
                 
                 # Return the validated response
                 return response_json
                 
-        except httpx.RequestError as e:
-            logger.error(f"Error connecting to Groq API: {str(e)}")
-            raise APIConnectionError(f"Error connecting to Groq API: {str(e)}")
-        except (KeyError, json.JSONDecodeError) as e:
-            logger.error(f"Error parsing Groq API response: {str(e)}")
-            raise ResponseParsingError(f"Error parsing Groq API response: {str(e)}")
+            except ModelNotFoundError as e:
+                logger.error(f"LLM API error with model {model}: {e}")
+                
+                # If we're not already using the fallback model, try the fallback
+                if model == settings.FALLBACK_LLM_MODEL:
+                    raise
+                logger.info(f"Trying fallback model: {settings.FALLBACK_LLM_MODEL}")
+                outcome = 'fallback'
+                return await self.generate_completion(
+                    prompt, 
+                    model=settings.FALLBACK_LLM_MODEL,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    priority=priority,
+                    json_mode=json_mode
+                )
+            except APIResponseError as e:
+                logger.error(f"LLM API error with model {model}: {e}")
+                if e.status_code == 429:
+                    outcome = 'throttled'
+                raise
+            except (APIConnectionError, ResponseParsingError) as e:
+                logger.error(str(e))
+                raise
+            except KeyError as e:
+                logger.error(f"Error parsing LLM API response: {str(e)}")
+                raise ResponseParsingError(f"Error parsing LLM API response: {str(e)}")
+            finally:
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started, model=model, outcome=outcome)
+    
+    async def stream_completion(
+        self,
+        prompt: str,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        priority: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion using Groq API.
+        
+        Failed requests are retried (and a missing model replaced by the
+        fallback model) until the first text arrives. Close the generator
+        (e.g. with contextlib.aclosing) to stop generation early.
+        
+        Args:
+            prompt: Prompt to send to Groq
+            model: Model to use (defaults to settings.DEFAULT_LLM_MODEL)
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Rate limit scheduling priority (see services.llm_scheduler),
+                or None for the priority of the current context
+            
+        Yields:
+            Pieces of the completion text as they arrive
+            
+        Raises:
+            APIConnectionError: If connection to API fails
+            APIResponseError: If API returns an error
+            ResponseParsingError: If parsing the response fails
+        """
+        model = model or settings.DEFAULT_LLM_MODEL
+        attempt = 0
+        while True:
+            attempt += 1
+            started = time.perf_counter()
+            outcome = 'error'
+            streamed_chars = 0
+            # Opened without becoming the current span, which would leak into the consumer's code at each yield
+            span = tracer.start_span('llm.completion', model=model, prompt_chars=len(prompt), stream=True)
+            error = None
+            try:
+                async with contextlib.aclosing(
+                    self.router.stream(prompt, model, temperature, max_tokens, priority)
+                ) as pieces:
+                    async for text in pieces:
+                        streamed_chars += len(text)
+                        yield text
+                outcome = 'success'
+                return
+            except ModelNotFoundError as e:
+                error = e
+                logger.error(f"LLM API error with model {model}: {e}")
+                if streamed_chars or model == settings.FALLBACK_LLM_MODEL:
+                    raise
+                logger.info(f"Trying fallback model: {settings.FALLBACK_LLM_MODEL}")
+                outcome = 'fallback'
+                model = settings.FALLBACK_LLM_MODEL
+                attempt = 0
+            except (APIConnectionError, APIResponseError, ResponseParsingError) as e:
+                error = e
+                logger.error(f"LLM API error with model {model}: {e}")
+                if isinstance(e, APIResponseError) and e.status_code == 429:
+                    outcome = 'throttled'
+                if streamed_chars or attempt >= 3:
+                    raise
+                LLM_RETRIES.inc(model=model)
+                # Rate limited calls are held by the scheduler instead
+                if outcome != 'throttled':
+                    await asyncio.sleep(min(max(2 ** attempt, 4), 10))
+            except GeneratorExit:
+                outcome = 'stopped'
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started, model=model, outcome=outcome)
+                if streamed_chars:
+                    # Streams closed early carry no usage; count the estimated tokens
+                    LLM_TOKENS.inc(len(prompt) // 4, model=model, kind='prompt')
+                    LLM_TOKENS.inc(streamed_chars // 4, model=model, kind='completion')
+                    if span:
+                        span.set_attribute('llm.completion_chars', streamed_chars)
+                tracer.end_span(span, error)
+
+    async def generate_list(
+        self,
+        prompt: str,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        priority: Optional[int] = None,
+        delimiter: str = ',',
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate a delimited list, stopping generation once it is complete.
+        
+        The list is complete at a closing bracket, a blank line after the
+        first item, or after `limit` items.
+        
+        Args:
+            prompt: Prompt to send to Groq
+            model: Model to use (defaults to settings.DEFAULT_LLM_MODEL)
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Rate limit scheduling priority, or None for the current context's
+            delimiter: Delimiter between items
+            limit: Maximum number of items, or None for no limit
+            
+        Returns:
+            List of strings
+            
+        Raises:
+            LLMServiceError: If there's an error with the LLM service
+        """
+        parser = IncrementalListParser(delimiter, limit)
+        if not settings.LLM_STREAMING:
+            response = await self.generate_completion(prompt, model, temperature, max_tokens, priority)
+            parser.feed(self.extract_text_content(response) or '')
+        else:
+            async with contextlib.aclosing(
+                self.stream_completion(prompt, model, temperature, max_tokens, priority)
+            ) as pieces:
+                async for text in pieces:
+                    parser.feed(text)
+                    if parser.complete:
+                        break
+        parser.close()
+        return parser.items
+    
+    async def generate_json(
+        self,
+        prompt: str,
+        schema: Optional[Type[BaseModel]] = None,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        priority: Optional[int] = None
+    ) -> Any:
+        """
+        Generate JSON content, validated against a schema.
+        
+        Malformed JSON is repaired locally; only output that cannot be
+        repaired or does not fit the schema is asked for again (up to
+        LLM_JSON_REASKS times), with the validation error in the prompt.
+        
+        Args:
+            prompt: Prompt to send to Groq
+            schema: Pydantic model the JSON must validate against, or None to accept any JSON
+            model: Model to use (defaults to settings.DEFAULT_LLM_MODEL)
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            priority: Rate limit scheduling priority, or None for the current context's
+            
+        Returns:
+            Parsed JSON content (the schema's fields, as a dictionary, if a schema is given)
+            
+        Raises:
+            ResponseParsingError: If the completion holds no valid JSON for the schema
+            LLMServiceError: If there's an error with the LLM service
+        """
+        call = schema.__name__ if schema else 'json'
+        attempt_prompt = prompt
+        for attempt in range(settings.LLM_JSON_REASKS + 1):
+            if attempt:
+                LLM_JSON_PARSE.inc(call=call, result='reasked')
+            content = await self._json_completion(attempt_prompt, model, temperature, max_tokens, priority)
+            try:
+                return self._validate_json(content, schema, call)
+            except ResponseParsingError as e:
+                error = e
+                logger.warning(f"Invalid JSON for {call} (attempt {attempt + 1}): {e}")
+                attempt_prompt = (
+                    f"{prompt}\n\nYour previous answer could not be used: {str(e)[:300]}\n"
+                    "Return only one valid JSON object with the requested keys."
+                )
+        raise error
+    
+    async def _json_completion(
+        self,
+        prompt: str,
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        priority: Optional[int]
+    ) -> str:
+        """
+        Get the text of a JSON completion: whole in JSON mode, otherwise streamed up to the end of the first object.
+        """
+        if settings.LLM_JSON_MODE:
+            try:
+                response = await self.generate_completion(
+                    prompt, model, temperature, max_tokens, priority, json_mode=True
+                )
+            except JSONGenerationError as e:
+                # The rejected output is usually one repair away from valid
+                return e.failed_generation
+            return self.extract_text_content(response) or ''
+        
+        if not settings.LLM_STREAMING:
+            response = await self.generate_completion(prompt, model, temperature, max_tokens, priority)
+            return self.extract_text_content(response) or ''
+        
+        parser = IncrementalJSONParser()
+        content = []
+        async with contextlib.aclosing(
+            self.stream_completion(prompt, model, temperature, max_tokens, priority)
+        ) as pieces:
+            async for text in pieces:
+                content.append(text)
+                parser.feed(text)
+                if parser.complete:
+                    break
+        return ''.join(content)
+    
+    def _validate_json(self, content: str, schema: Optional[Type[BaseModel]], call: str) -> Any:
+        """
+        Parse (repairing if needed) and validate the JSON in a completion.
+        
+        Raises:
+            ResponseParsingError: If the completion holds no valid JSON for the schema
+        """
+        try:
+            value, repaired = parse_json_lenient(content)
+        except ValueError as e:
+            LLM_JSON_PARSE.inc(call=call, result='invalid')
+            raise ResponseParsingError(f"Error parsing JSON from Groq API response: {str(e)}")
+        if schema is not None:
+            try:
+                value = schema.model_validate(value).model_dump()
+            except ValidationError as e:
+                LLM_JSON_PARSE.inc(call=call, result='invalid')
+                errors = '; '.join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()[:5])
+                raise ResponseParsingError(f"JSON does not match the {call} schema: {errors}")
+        LLM_JSON_PARSE.inc(call=call, result='repaired' if repaired else 'valid')
+        return value
     
     def extract_text_content(self, response: Dict[str, Any]) -> str:
         """
@@ -169,25 +467,7 @@ class GroqService:
         Raises:
             ResponseParsingError: If extracting or parsing JSON fails
         """
-        try:
-            content = self.extract_text_content(response)
-            
-            # Try to extract JSON from code blocks first
-            json_match = re.search(r'```(?:json)?\s*(.*?)\s*```', content, re.DOTALL)
-            if json_match:
-                content = json_match.group(1)
-            else:
-                # Try to find JSON object without code block
-                json_match = re.search(r'(\{.*\})', content, re.DOTALL)
-                if json_match:
-                    content = json_match.group(1)
-            
-            # Parse the JSON
-            return json.loads(content)
-            
-        except (json.JSONDecodeError, AttributeError) as e:
-            logger.error(f"Error parsing JSON from Groq API response: {str(e)}")
-            raise ResponseParsingError(f"Error parsing JSON from Groq API response: {str(e)}")
+        return parse_json_text(self.extract_text_content(response))
     
     def extract_list_content(self, response: Dict[str, Any], delimiter: str = ',') -> List[str]:
         """
@@ -0,0 +1,253 @@
+"""
+Background execution of job searches.
+
+Searches submitted through the asynchronous search API are queued here and
+run by a fixed number of workers, so the API can accept many more searches
+than it has crawl capacity for. The state of each search, with its partial
+results while it runs and its final results once it completes, is kept in
+the search store until SEARCH_RESULT_TTL_SECONDS after it finished.
+Workers crawl only once the admission controller gives them a crawl slot,
+so background and synchronous searches share one crawl capacity.
+"""
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from collections import deque
+import asyncio
+import contextvars
+import hashlib
+import math
+import time
+import uuid
+
+from core.config import settings
+from core.logging import get_logger
+from core.tracing import tracer
+from core.metrics import SEARCHES, SEARCH_QUEUE_DEPTH
+from core.mongodb import store_search, get_search, delete_expired_searches
+from services.admission_control import admission_controller, AdmissionRejectedError
+
+# Get logger
+logger = get_logger(__name__)
+
+
+# Search states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+FINISHED_STATES = (COMPLETED, FAILED)
+
+
+class SearchQueueFullError(Exception):
+    """Exception raised when no more searches can be queued."""
+    pass
+
+
+def search_owner(key: Optional[str]) -> Optional[str]:
+    """
+    Identify the API key that submitted a search without storing the key itself.
+
+    Args:
+        key: API key, or None
+
+    Returns:
+        SHA-256 hex digest of the key, or None
+    """
+    if key is None:
+        return None
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class SearchExecutor:
+    """
+    Queue of submitted searches and the workers that run them.
+    """
+    def __init__(self, workers: int = 4, max_queued: int = 100, ttl_seconds: int = 3600):
+        """
+        Initialize the executor.
+
+        Args:
+            workers: Searches run at the same time
+            max_queued: Searches that can wait for a worker before submissions are refused
+            ttl_seconds: Seconds a finished search's results are kept
+        """
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self.queue: Optional[asyncio.Queue] = None
+        # IDs of the queued searches, in queue order
+        self.queued_ids: deque = deque()
+        self.tasks: List[asyncio.Task] = []
+        self.running = 0
+        # Moving average of search durations, for Retry-After estimates
+        self.average_seconds = 30.0
+
+    def _start(self) -> None:
+        """
+        Start the workers on first use, in the running event loop.
+        """
+        if self.tasks and not all(task.done() for task in self.tasks):
+            return
+        self.queue = asyncio.Queue(self.max_queued)
+        self.queued_ids.clear()
+        loop = asyncio.get_running_loop()
+        # A fresh context, so searches are not traced as part of the request that started the workers
+        self.tasks = [
+            loop.create_task(self._work(), context=contextvars.Context())
+            for _ in range(self.workers)
+        ]
+        SEARCH_QUEUE_DEPTH.set_function(lambda: self.queue.qsize() if self.queue else 0)
+
+    async def submit(
+        self,
+        search: Callable[..., Awaitable[List[Dict[str, Any]]]],
+        keywords: List[str],
+        location: str,
+        key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a search.
+
+        Args:
+            search: Coroutine function running the search, called with keywords,
+                location and a progress callback (JobDiscoveryAgent.search_jobs)
+            keywords: List of search keywords
+            location: Job location
+            key: API key that submitted the search, counted against its limit until the search finishes
+
+        Returns:
+            Search record
+
+        Raises:
+            SearchQueueFullError: If max_queued searches are already waiting
+            AdmissionRejectedError: If the API key has too many searches waiting or running
+        """
+        self._start()
+        await delete_expired_searches(time.time())
+        record = {
+            'search_id': uuid.uuid4().hex,
+            'owner': search_owner(key),
+            'status': QUEUED,
+            'stage': None,
+            'keywords': keywords,
+            'location': location,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'expires_at': None,  # Set once the search finishes
+            'trace_id': None,
+            'error': None,
+            'jobs': [],
+        }
+        if self.queue.full():
+            SEARCHES.inc(status='rejected')
+            raise SearchQueueFullError(f"{self.max_queued} searches are already queued")
+        try:
+            admission_controller.hold(key)
+        except AdmissionRejectedError:
+            SEARCHES.inc(status='rejected')
+            raise
+        try:
+            await store_search(record)
+            self.queue.put_nowait((record['search_id'], search, key))
+        except asyncio.QueueFull:
+            # Filled up while the record was stored; the record is never run
+            admission_controller.release_hold(key)
+            SEARCHES.inc(status='rejected')
+            raise SearchQueueFullError(f"{self.max_queued} searches are already queued")
+        except Exception:
+            admission_controller.release_hold(key)
+            raise
+        self.queued_ids.append(record['search_id'])
+        SEARCHES.inc(status=QUEUED)
+        return record
+
+    async def get(self, search_id: str, key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a search that has not expired.
+
+        Args:
+            search_id: Search ID
+            key: API key of the request; searches submitted with another key are not returned
+
+        Returns:
+            Search record, or None if unknown, expired or submitted with another API key
+        """
+        record = await get_search(search_id)
+        if record is None or (record['expires_at'] is not None and record['expires_at'] <= time.time()):
+            return None
+        if record.get('owner') != search_owner(key):
+            return None
+        return record
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the queue is likely to have room again: one search's time, spread over the workers.
+        """
+        return max(1, math.ceil(self.average_seconds / self.workers))
+
+    def queue_position(self, record: Dict[str, Any]) -> Optional[int]:
+        """
+        Number of searches ahead of a queued search (0 if it is next).
+        """
+        if record['status'] != QUEUED or record['search_id'] not in self.queued_ids:
+            return None
+        return self.queued_ids.index(record['search_id'])
+
+    async def _work(self) -> None:
+        """
+        Run queued searches one at a time, forever.
+        """
+        while True:
+            search_id, search, key = await self.queue.get()
+            self.queued_ids.remove(search_id)
+            try:
+                # Wait for a crawl slot shared with synchronous searches; workers are never turned away
+                async with admission_controller.admit(shed=False):
+                    await self._run(search_id, search)
+            except Exception as e:
+                logger.error(f"Error running search {search_id}: {e}", exc_info=True)
+            finally:
+                admission_controller.release_hold(key)
+                self.queue.task_done()
+
+    async def _run(self, search_id: str, search: Callable[..., Awaitable[List[Dict[str, Any]]]]) -> None:
+        """
+        Run one search, storing its progress and results.
+        """
+        record = await get_search(search_id)
+        if record is None:
+            return
+        self.running += 1
+        record.update(status=RUNNING, started_at=time.time())
+        await store_search(record)
+
+        async def progress(stage: str, jobs: List[Dict[str, Any]]) -> None:
+            record.update(stage=stage, jobs=list(jobs))
+            await store_search(record)
+
+        with tracer.span('search_job', search_id=search_id) as span:
+            if span:
+                record['trace_id'] = span.trace_id
+            try:
+                jobs = await search(record['keywords'], record['location'], progress=progress)
+                record.update(status=COMPLETED, stage=None, jobs=jobs)
+            except Exception as e:
+                logger.error(f"Search {search_id} failed: {e}", exc_info=True)
+                record.update(status=FAILED, error=str(e))
+            finally:
+                self.running -= 1
+                now = time.time()
+                self.average_seconds = 0.8 * self.average_seconds + 0.2 * (now - record['started_at'])
+                record.update(finished_at=now, expires_at=now + self.ttl_seconds)
+                await store_search(record)
+                SEARCHES.inc(status=record['status'])
+                logger.info(f"Search {search_id} {record['status']} with {len(record['jobs'])} jobs")
+
+
+# Create a global search executor instance
+search_executor = SearchExecutor(
+    settings.SEARCH_WORKERS,
+    settings.SEARCH_MAX_QUEUED,
+    settings.SEARCH_RESULT_TTL_SECONDS
+)
@@ -0,0 +1,186 @@
+"""
+Incremental parsers for streamed LLM output.
+
+Completions are streamed a few characters at a time. These parsers take the
+text as it arrives and hand back each list item or top-level JSON field as
+soon as it is complete, and say when the answer is complete so the stream
+can be closed before the model adds commentary after it.
+"""
+from typing import Any, List, Optional, Tuple
+import json
+import re
+
+
+# Quotes, brackets, bullets and numbering around a list item ("1. python", '"python"', "- python")
+LIST_ITEM_NOISE = re.compile(r'^[\s\[\]"\'`*•-]*(?:\d+[.)]\s+[\s"\'`*]*)?|[\s\[\]"\'`.]*$')
+
+
+def clean_list_item(item: str) -> str:
+    """
+    Strip quotes, brackets, bullets and numbering from a list item.
+    """
+    return LIST_ITEM_NOISE.sub('', item)
+
+
+class IncrementalListParser:
+    """
+    Splits a delimited list into items as its text arrives.
+
+    The list ends at a closing bracket or a blank line after the first item,
+    or once it has `limit` items.
+    """
+    def __init__(self, delimiter: str = ',', limit: Optional[int] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            delimiter: Delimiter between items
+            limit: Number of items after which the list is complete, or None for no limit
+        """
+        self.delimiter = delimiter
+        self.limit = limit
+        self.items: List[str] = []
+        self.buffer = ''
+        self.complete = False
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next piece of the completion
+
+        Returns:
+            Items completed by this text
+        """
+        if self.complete:
+            return []
+        self.buffer += text
+        new_items = []
+        while not self.complete:
+            ends = [
+                (index, kind) for index, kind in (
+                    (self.buffer.find(self.delimiter), 'item'),
+                    (self.buffer.find(']'), 'end'),
+                    (self.buffer.find('\n\n') if self.items or new_items else -1, 'end'),
+                ) if index >= 0
+            ]
+            if not ends:
+                break
+            index, kind = min(ends)
+            item = clean_list_item(self.buffer[:index])
+            self.buffer = self.buffer[index + (len(self.delimiter) if kind == 'item' else 1):]
+            if item:
+                new_items.append(item)
+                self.complete = self.limit is not None and len(self.items) + len(new_items) >= self.limit
+            if kind == 'end':
+                self.complete = True
+        self.items.extend(new_items)
+        return new_items
+
+    def close(self) -> List[str]:
+        """
+        End the stream.
+
+        Returns:
+            The last item, if the text did not end with a delimiter
+        """
+        if self.complete:
+            return []
+        self.complete = True
+        item = clean_list_item(self.buffer)
+        self.buffer = ''
+        if not item:
+            return []
+        self.items.append(item)
+        return [item]
+
+
+class IncrementalJSONParser:
+    """
+    Finds the first JSON object in streamed text and parses its top-level fields as they complete.
+    """
+    def __init__(self):
+        """
+        Initialize the parser.
+        """
+        self.buffer = ''
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.field_start = 0
+        self.fields: List[Tuple[str, Any]] = []
+        self.complete = False
+        self.value: Optional[Any] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Add streamed text.
+
+        Args:
+            text: Next piece of the completion
+
+        Returns:
+            (key, value) of each top-level field completed by this text
+        """
+        if self.complete:
+            return []
+        if not self.started:
+            start = text.find('{')
+            if start < 0:
+                return []
+            self.started = True
+            text = text[start:]
+
+        new_fields = []
+        offset = len(self.buffer)
+        self.buffer += text
+        for index in range(offset, len(self.buffer)):
+            char = self.buffer[index]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+                if self.depth == 1:
+                    self.field_start = index + 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self._add_field(self.buffer[self.field_start:index], new_fields)
+                    self._finish(index + 1)
+                    break
+            elif char == ',' and self.depth == 1:
+                self._add_field(self.buffer[self.field_start:index], new_fields)
+                self.field_start = index + 1
+        self.fields.extend(new_fields)
+        return new_fields
+
+    def _add_field(self, text: str, new_fields: List[Tuple[str, Any]]) -> None:
+        """
+        Parse one `"key": value` member of the object.
+        """
+        if not text.strip():
+            return
+        try:
+            member = json.loads('{' + text + '}')
+        except json.JSONDecodeError:
+            return
+        new_fields.extend(member.items())
+
+    def _finish(self, end: int) -> None:
+        """
+        Parse the whole object once its closing brace has arrived.
+        """
+        self.complete = True
+        try:
+            self.value = json.loads(self.buffer[:end])
+        except json.JSONDecodeError:
+            self.value = None
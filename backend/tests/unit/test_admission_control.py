@@ -0,0 +1,167 @@
+"""
+Unit tests for search admission control.
+"""
+import asyncio
+
+import pytest
+
+from services.admission_control import AdmissionController, AdmissionRejectedError
+
+
+async def hold_slot(controller, started, release, key=None, shed=True):
+    async with controller.admit(key, shed=shed):
+        started.set()
+        await release.wait()
+
+
+def test_searches_within_capacity_are_admitted_at_once():
+    async def run():
+        controller = AdmissionController(max_concurrent=2)
+        async with controller.admit():
+            async with controller.admit():
+                return controller.active, len(controller.waiters)
+
+    assert asyncio.run(run()) == (2, 0)
+
+
+def test_released_slot_goes_to_the_longest_waiting_search():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=5, max_queue_seconds=5)
+        controller.average_seconds = 0.1
+        release = asyncio.Event()
+        first_started = asyncio.Event()
+        first = asyncio.create_task(hold_slot(controller, first_started, release))
+        await first_started.wait()
+
+        order = []
+
+        async def wait_for_slot(name):
+            async with controller.admit():
+                order.append(name)
+
+        waiters = [asyncio.create_task(wait_for_slot(name)) for name in ('second', 'third')]
+        await asyncio.sleep(0.01)
+        queued = len(controller.waiters)
+        release.set()
+        await asyncio.gather(first, *waiters)
+        return queued, order, controller.active
+
+    assert asyncio.run(run()) == (2, ['second', 'third'], 0)
+
+
+def test_full_queue_sheds_with_503():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=0)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, started, release))
+        await started.wait()
+        try:
+            async with controller.admit():
+                pass
+        finally:
+            release.set()
+            await holder
+
+    with pytest.raises(AdmissionRejectedError) as raised:
+        asyncio.run(run())
+    assert raised.value.reason == 'queue_full'
+    assert raised.value.status_code == 503
+    assert raised.value.retry_after >= 1
+
+
+def test_long_expected_wait_sheds():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=10, max_queue_seconds=5)
+        controller.average_seconds = 60.0
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, started, release))
+        await started.wait()
+        try:
+            async with controller.admit():
+                pass
+        finally:
+            release.set()
+            await holder
+
+    with pytest.raises(AdmissionRejectedError) as raised:
+        asyncio.run(run())
+    assert raised.value.reason == 'shed'
+
+
+def test_wait_times_out_and_frees_its_place():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=10, max_queue_seconds=0.05)
+        controller.average_seconds = 0.01
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, started, release))
+        await started.wait()
+        try:
+            with pytest.raises(AdmissionRejectedError) as raised:
+                async with controller.admit():
+                    pass
+            return raised.value.reason, len(controller.waiters)
+        finally:
+            release.set()
+            await holder
+
+    assert asyncio.run(run()) == ('timeout', 0)
+
+
+def test_background_searches_wait_instead_of_being_shed():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=0, max_queue_seconds=0.01)
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, started, release))
+        await started.wait()
+        background_started = asyncio.Event()
+        background = asyncio.create_task(hold_slot(controller, background_started, asyncio.Event(), shed=False))
+        await asyncio.sleep(0.05)
+        waiting = not background_started.is_set()
+        release.set()
+        await holder
+        await background_started.wait()
+        background.cancel()
+        return waiting
+
+    assert asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def run():
+        controller = AdmissionController(max_concurrent=1, max_queued=5, max_queue_seconds=5)
+        controller.average_seconds = 0.1
+        release = asyncio.Event()
+        started = asyncio.Event()
+        holder = asyncio.create_task(hold_slot(controller, started, release))
+        await started.wait()
+        waiter = asyncio.create_task(hold_slot(controller, asyncio.Event(), asyncio.Event()))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await holder
+        return len(controller.waiters), controller.active
+
+    assert asyncio.run(run()) == (0, 0)
+
+
+def test_api_key_limit_answers_429_and_is_released():
+    async def run():
+        controller = AdmissionController(max_concurrent=4, max_per_key=1)
+        async with controller.admit('key-a'):
+            with pytest.raises(AdmissionRejectedError) as raised:
+                async with controller.admit('key-a'):
+                    pass
+            async with controller.admit('key-b'):
+                pass
+        return raised.value, dict(controller.held_by_key)
+
+    error, held = asyncio.run(run())
+
+    assert error.reason == 'key_limit'
+    assert error.status_code == 429
+    assert held == {}
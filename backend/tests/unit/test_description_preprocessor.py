@@ -0,0 +1,71 @@
+"""
+Unit tests for job description preprocessing.
+"""
+from agents.description_preprocessor import DescriptionPreprocessor, section_heading, starts_section
+
+
+def preprocess(description: str) -> str:
+    return DescriptionPreprocessor(token_budget=600).preprocess(description)
+
+
+def test_curly_apostrophe_heading_ends_about_us():
+    result = preprocess(
+        "About Us\n"
+        "We are a fast growing startup in Berlin.\n"
+        "What You’ll Do\n"
+        "Design and build backend services in Python.\n"
+        "Who You Are\n"
+        "5+ years of experience with distributed systems."
+    )
+
+    assert "fast growing startup" not in result
+    assert "Design and build backend services in Python." in result
+    assert "5+ years of experience with distributed systems." in result
+
+
+def test_unknown_heading_ends_benefits():
+    result = preprocess(
+        "Acme is hiring.\n"
+        "Benefits\n"
+        "Health insurance\n"
+        "Free lunch\n"
+        "Your Day-to-Day\n"
+        "Build APIs in Python."
+    )
+
+    assert "Health insurance" not in result
+    assert "Free lunch" not in result
+    assert "Build APIs in Python." in result
+
+
+def test_skill_paragraph_in_boilerplate_section_is_kept():
+    result = preprocess(
+        "Benefits\n"
+        "Health insurance\n"
+        "We are looking for 3+ years of experience with Kubernetes."
+    )
+
+    assert "Health insurance" not in result
+    assert "3+ years of experience with Kubernetes" in result
+
+
+def test_colon_heading_ends_boilerplate():
+    result = preprocess(
+        "About the company\n"
+        "Founded in 2010, we serve customers worldwide.\n"
+        "A typical week:\n"
+        "Ship features in TypeScript and React."
+    )
+
+    assert "Founded in 2010" not in result
+    assert "Ship features in TypeScript and React." in result
+
+
+def test_section_heading_normalizes_curly_apostrophe():
+    assert section_heading("What You’ll Do") == "what you'll do"
+
+
+def test_short_list_item_does_not_start_section():
+    assert not starts_section("Health insurance")
+    assert starts_section("Your Day-to-Day")
+    assert starts_section("Perks and more:")
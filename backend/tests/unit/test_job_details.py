@@ -0,0 +1,38 @@
+"""
+Unit tests for adding details to crawled jobs.
+"""
+import asyncio
+
+from agents.crawlers.base_crawler import BaseCrawler
+from core import mongodb
+
+
+class DetailCrawler(BaseCrawler):
+    source = 'testboard'
+
+    async def search(self, *args, **kwargs):
+        return []
+
+
+def test_known_stored_jobs_skip_detail_fetches():
+    fetched = []
+
+    async def get_details(job):
+        fetched.append(job['external_id'])
+        return {'description': f"Fetched {job['external_id']}"}
+
+    async def add_details():
+        await mongodb.store_job_listings([
+            {'source': 'testboard', 'external_id': 'old', 'url': 'https://testboard/old', 'description': 'Stored'},
+        ])
+        jobs = [
+            {'external_id': 'new', 'url': 'https://testboard/new'},
+            {'external_id': 'old', 'url': 'https://testboard/old'},
+        ]
+        return await DetailCrawler()._add_job_details(jobs, get_details, 5, known_ids={'old'})
+
+    jobs, detailed = asyncio.run(add_details())
+
+    assert fetched == ['new']
+    assert [job['description'] for job in jobs] == ['Fetched new', 'Stored']
+    assert [job['external_id'] for job in detailed] == ['new']
@@ -0,0 +1,51 @@
+"""
+Unit tests for local JSON repair.
+"""
+import pytest
+
+from services.json_repair import extract_json_text, parse_json_lenient, repair_json
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a":"x","b":1', {'a': 'x', 'b': 1}),
+    ('{"a":"x","b":true', {'a': 'x', 'b': True}),
+    ('{"a":[1,2', {'a': [1, 2]}),
+    ('{"a":"x","b":null', {'a': 'x', 'b': None}),
+    ('{"a":-1.5e3', {'a': -1500.0}),
+    ('{"a":1 \n', {'a': 1}),
+])
+def test_truncated_complete_values_are_kept(content, expected):
+    assert parse_json_lenient(content) == (expected, True)
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"a":"x","b":"unterminated', {'a': 'x'}),
+    ('{"a":"x","b', {'a': 'x'}),
+    ('{"a":"x","b":', {'a': 'x'}),
+    ('{"a":"x","b":tr', {'a': 'x'}),
+    ('{"a":"x","b":1.', {'a': 'x'}),
+    ('{"a":"x","b":tr\n', {'a': 'x'}),
+    ('{"a":["x","y', {'a': ['x']}),
+])
+def test_incomplete_trailing_tokens_are_cut(content, expected):
+    assert parse_json_lenient(content) == (expected, True)
+
+
+def test_single_quotes_bare_keys_and_python_literals():
+    assert parse_json_lenient("{a: 'x', 'b': True, c: None,}") == ({'a': 'x', 'b': True, 'c': None}, True)
+
+
+def test_code_block_and_commentary():
+    content = 'Here you go:\n```json\n{"a": [1, 2]}\n```\nLet me know!'
+    assert extract_json_text(content) == '{"a": [1, 2]}'
+    assert parse_json_lenient(content) == ({'a': [1, 2]}, False)
+
+
+def test_valid_json_is_not_repaired():
+    assert parse_json_lenient('{"a": 1} trailing words') == ({'a': 1}, False)
+
+
+def test_no_json_raises():
+    assert repair_json('no json here') is None
+    with pytest.raises(ValueError):
+        parse_json_lenient('no json here')
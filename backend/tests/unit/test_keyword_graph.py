@@ -0,0 +1,33 @@
+"""
+Unit tests for the keyword expansion graph.
+"""
+import asyncio
+import json
+
+from agents.keyword_graph import KeywordGraph
+
+
+def test_expansions_link_only_their_own_keyword(tmp_path):
+    path = tmp_path / "graph.json"
+    graph = KeywordGraph(min_count=1, path=str(path))
+
+    asyncio.run(graph.add_expansions({
+        'python': ['django', 'flask'],
+        'kubernetes': ['helm charts', 'docker'],
+    }))
+
+    assert set(graph.edges['python']) == {'django', 'flask'}
+    assert set(graph.edges['kubernetes']) == {'helm charts', 'docker'}
+    saved = json.loads(path.read_text())
+    assert set(saved['expanded']) == {'python', 'kubernetes'}
+    assert 'docker' not in saved['edges']['python']
+
+
+def test_empty_expansion_is_asked_again():
+    graph = KeywordGraph(min_count=1)
+
+    asyncio.run(graph.add_expansions({'zig': [], 'python': ['python', ' '], 'rust': ['cargo']}))
+
+    assert set(graph.expanded) == {'rust'}
+    assert 'zig' not in graph.counts
+    assert graph.expand(['zig'])[1] == ['zig']
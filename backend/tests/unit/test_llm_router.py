@@ -0,0 +1,137 @@
+"""
+Unit tests for LLM provider routing.
+"""
+import asyncio
+import contextlib
+
+import pytest
+
+from services.llm_errors import APIConnectionError, ModelNotFoundError
+from services.llm_router import LLMProvider, LLMRouter
+
+
+class FakeProvider(LLMProvider):
+    """
+    Provider answering from a script instead of over HTTP.
+    """
+    def __init__(self, name, delay=0.0, error=None, pieces=('answer',), fail_after=None):
+        super().__init__(name, f"http://{name}.test")
+        self.delay = delay
+        self.error = error
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.calls = 0
+        self.cancelled = False
+
+    async def complete(self, prompt, model, temperature, max_tokens, priority=None, json_mode=False):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return {'provider': self.name}
+
+    async def stream(self, prompt, model, temperature, max_tokens, priority=None):
+        self.calls += 1
+        if self.error and self.fail_after is None:
+            raise self.error
+        for index, piece in enumerate(self.pieces):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise self.error
+            yield piece
+
+
+def complete(router):
+    return asyncio.run(router.complete('prompt', 'model', 0.0, 100))
+
+
+def stream(router):
+    async def collect():
+        async with contextlib.aclosing(router.stream('prompt', 'model', 0.0, 100)) as pieces:
+            return [piece async for piece in pieces]
+    return asyncio.run(collect())
+
+
+def test_fails_over_to_next_provider():
+    primary = FakeProvider('primary', error=APIConnectionError("down"))
+    backup = FakeProvider('backup')
+
+    assert complete(LLMRouter([primary, backup])) == {'provider': 'backup'}
+    assert primary.calls == backup.calls == 1
+
+
+def test_request_errors_are_not_failed_over():
+    primary = FakeProvider('primary', error=ModelNotFoundError("no such model", 404))
+    backup = FakeProvider('backup')
+
+    with pytest.raises(ModelNotFoundError):
+        complete(LLMRouter([primary, backup]))
+    assert backup.calls == 0
+
+
+def test_all_providers_failing_raises_first_error():
+    first_error = APIConnectionError("primary down")
+    providers = [FakeProvider('primary', error=first_error), FakeProvider('backup', error=APIConnectionError("backup down"))]
+
+    with pytest.raises(APIConnectionError) as raised:
+        complete(LLMRouter(providers))
+    assert raised.value is first_error
+
+
+def test_ranked_prefers_fast_healthy_providers():
+    slow = FakeProvider('slow')
+    slow.latency = 5.0
+    failing = FakeProvider('failing')
+    failing._record(0.1, False)
+    failing._record(0.1, False)
+    fast = FakeProvider('fast')
+    fast.latency = 0.5
+
+    assert [provider.name for provider in LLMRouter([slow, failing, fast]).ranked()] == ['fast', 'failing', 'slow']
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary = FakeProvider('primary', delay=5.0)
+    primary.latencies.extend([0.05] * 20)
+    backup = FakeProvider('backup', delay=0.01)
+    backup.latency = 2.0
+
+    assert complete(LLMRouter([primary, backup], hedging=True)) == {'provider': 'backup'}
+    assert primary.cancelled
+
+
+def test_fast_primary_is_not_hedged():
+    primary = FakeProvider('primary')
+    primary.latencies.extend([1.0] * 20)
+    backup = FakeProvider('backup')
+    backup.latency = 2.0
+
+    assert complete(LLMRouter([primary, backup], hedging=True)) == {'provider': 'primary'}
+    assert backup.calls == 0
+
+
+def test_hedged_primary_error_fails_over():
+    primary = FakeProvider('primary', error=APIConnectionError("down"))
+    backup = FakeProvider('backup')
+    backup.latency = 2.0
+
+    assert complete(LLMRouter([primary, backup], hedging=True)) == {'provider': 'backup'}
+
+
+def test_stream_fails_over_before_first_text():
+    primary = FakeProvider('primary', error=APIConnectionError("down"))
+    backup = FakeProvider('backup', pieces=('a', 'b'))
+
+    assert stream(LLMRouter([primary, backup])) == ['a', 'b']
+
+
+def test_stream_error_after_text_is_raised():
+    primary = FakeProvider('primary', error=APIConnectionError("dropped"), pieces=('a', 'b'), fail_after=1)
+    backup = FakeProvider('backup')
+
+    with pytest.raises(APIConnectionError):
+        stream(LLMRouter([primary, backup]))
+    assert backup.calls == 0
@@ -0,0 +1,122 @@
+"""
+Unit tests for client-side LLM rate limit scheduling.
+"""
+import asyncio
+import time
+
+import pytest
+
+from services.llm_scheduler import (
+    PRIORITY_BACKGROUND, PRIORITY_CRITICAL, RateLimitScheduler, llm_priority, parse_duration
+)
+
+
+def test_release_corrects_tokens_of_calls_in_the_window():
+    async def call():
+        scheduler = RateLimitScheduler('test', tokens_per_minute=1000)
+        reservation = await scheduler.acquire('model', 100)
+        await scheduler.release('model', reservation, total_tokens=40)
+        return scheduler.budgets['model'].tokens_in_window
+
+    assert asyncio.run(call()) == 40
+
+
+def test_release_ignores_calls_that_left_the_window():
+    async def call():
+        scheduler = RateLimitScheduler('test', tokens_per_minute=1000)
+        reservation = await scheduler.acquire('model', 100)
+        # The call took over a minute
+        reservation[0] -= 61
+        await scheduler.release('model', reservation, total_tokens=40)
+        return scheduler.budgets['model']
+
+    budget = asyncio.run(call())
+
+    assert budget.tokens_in_window == 0
+    assert not budget.window
+
+
+def test_waiting_calls_are_served_by_priority():
+    async def run():
+        scheduler = RateLimitScheduler('test')
+        budget = scheduler._budget('model')
+        budget.blocked_until = time.time() + 0.1
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire('model', 10, priority)
+            order.append(name)
+
+        background = asyncio.create_task(call('background', PRIORITY_BACKGROUND))
+        await asyncio.sleep(0.01)
+        critical = asyncio.create_task(call('critical', PRIORITY_CRITICAL))
+        await asyncio.gather(background, critical)
+        return order
+
+    assert asyncio.run(run()) == ['critical', 'background']
+
+
+def test_context_priority_is_used_by_default():
+    async def run():
+        scheduler = RateLimitScheduler('test')
+        scheduler._budget('model').blocked_until = time.time() + 0.1
+        with llm_priority(PRIORITY_BACKGROUND):
+            task = asyncio.create_task(scheduler.acquire('model', 10))
+        await asyncio.sleep(0.01)
+        waiting = list(scheduler.budgets['model'].waiting)
+        await task
+        return waiting
+
+    assert [priority for priority, _ in asyncio.run(run())] == [PRIORITY_BACKGROUND]
+
+
+def test_429_holds_calls_until_retry_after():
+    async def run():
+        scheduler = RateLimitScheduler('test')
+        reservation = await scheduler.acquire('model', 10)
+        await scheduler.release('model', reservation, {'retry-after': '2'}, status_code=429)
+        return scheduler.budgets['model'].delay(10)
+
+    assert 1.5 < asyncio.run(run()) <= 2.0
+
+
+def test_request_limit_delays_until_window_has_room():
+    async def run():
+        scheduler = RateLimitScheduler('test', requests_per_minute=1)
+        await scheduler.acquire('model', 10)
+        return scheduler.budgets['model'].delay(10)
+
+    assert 59.0 < asyncio.run(run()) <= 60.0
+
+
+def test_rate_limit_headers_update_the_budget():
+    async def run():
+        scheduler = RateLimitScheduler('test', tokens_per_minute=1000)
+        reservation = await scheduler.acquire('model', 10)
+        await scheduler.release('model', reservation, {
+            'x-ratelimit-limit-tokens': '6000',
+            'x-ratelimit-remaining-requests': '0',
+            'x-ratelimit-reset-requests': '7.5s',
+        }, status_code=200)
+        return scheduler.budgets['model']
+
+    budget = asyncio.run(run())
+
+    assert budget.tokens_per_minute == 6000
+    assert 7.0 < budget.delay(10) <= 7.5
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ('1', 1.0),
+    ('0.5', 0.5),
+    ('2m59.56s', 179.56),
+    ('120ms', 0.12),
+    ('1h', 3600.0),
+    ('', None),
+    ('soon', None),
+])
+def test_parse_duration(value, seconds):
+    if seconds is None:
+        assert parse_duration(value) is None
+    else:
+        assert parse_duration(value) == pytest.approx(seconds)
@@ -0,0 +1,35 @@
+"""
+Unit tests for the LLM service.
+"""
+import asyncio
+import contextlib
+
+from core.tracing import tracer
+from services.llm_service import GroqService
+
+
+class FakeRouter:
+    async def stream(self, prompt, model, temperature, max_tokens, priority):
+        for piece in ('alpha', 'beta'):
+            yield piece
+
+
+def test_stream_span_is_not_current_in_the_consumer():
+    service = GroqService(api_key='test')
+    service.router = FakeRouter()
+
+    async def consume():
+        current = []
+        with tracer.span('test.request') as request_span:
+            async with contextlib.aclosing(service.stream_completion('prompt')) as pieces:
+                async for _ in pieces:
+                    current.append(tracer.current_span())
+        return request_span, current
+
+    request_span, current = asyncio.run(consume())
+
+    assert current == [request_span, request_span]
+    spans = tracer.get_trace(request_span.trace_id)['spans']
+    completion = next(span for span in spans if span['name'] == 'llm.completion')
+    assert completion['parent_id'] == request_span.span_id
+    assert completion['duration_ms'] is not None
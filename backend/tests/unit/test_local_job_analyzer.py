@@ -0,0 +1,22 @@
+"""
+Unit tests for skill matching in the local job analyzer.
+"""
+from agents.local_job_analyzer import local_job_analyzer
+
+
+def skills(text: str) -> set:
+    return {skill for _, skill in local_job_analyzer.matcher.find(text.lower())}
+
+
+def test_common_words_are_not_skills():
+    assert skills("You will go to meetings and react to feedback") == set()
+    assert skills("Our R&D team ships every week") == set()
+
+
+def test_context_phrases_match_ambiguous_skills():
+    assert skills("Backend services in Golang, frontend in React.js") == {'Go', 'React'}
+    assert skills("Models in R programming and Python") == {'R', 'Python'}
+
+
+def test_unambiguous_canonical_names_match():
+    assert skills("Experience with Kubernetes and Python") == {'Kubernetes', 'Python'}
@@ -0,0 +1,66 @@
+"""
+Unit tests for concurrent result page fetching.
+"""
+import asyncio
+
+from agents.crawlers.base_crawler import BaseCrawler
+
+
+class PageCrawler(BaseCrawler):
+    async def search(self, *args, **kwargs):
+        return []
+
+
+def page(index: int, size: int = 10) -> list:
+    return [{'external_id': f"{index}-{n}"} for n in range(size)]
+
+
+def test_failed_page_keeps_later_pages():
+    async def fetch_page(index):
+        if index == 1:
+            raise RuntimeError("timeout")
+        return page(index) if index < 4 else []
+
+    jobs = asyncio.run(PageCrawler()._paginate(fetch_page, max_results=100, page_size=10))
+
+    assert {job['external_id'].split('-')[0] for job in jobs} == {'0', '2', '3'}
+
+
+def test_pages_in_flight_are_cancelled_once_enough_jobs():
+    cancelled = []
+
+    async def fetch_page(index):
+        try:
+            await asyncio.sleep(0 if index == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return page(index)
+
+    jobs = asyncio.run(asyncio.wait_for(
+        PageCrawler()._paginate(fetch_page, max_results=10, page_size=10), 5
+    ))
+
+    assert len(jobs) == 10
+    assert cancelled
+
+
+def test_pages_after_an_empty_page_are_cancelled():
+    cancelled = []
+
+    async def fetch_page(index):
+        if index == 0:
+            return []
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return page(index)
+
+    jobs = asyncio.run(asyncio.wait_for(
+        PageCrawler()._paginate(fetch_page, max_results=50, page_size=10), 5
+    ))
+
+    assert jobs == []
+    assert cancelled
@@ -0,0 +1,62 @@
+"""
+Unit tests for the background search executor.
+"""
+import asyncio
+
+import pytest
+
+from services import search_executor as executor_module
+from services.admission_control import admission_controller
+from services.search_executor import SearchExecutor
+
+
+async def never_run(keywords, location, progress):
+    return []
+
+
+def test_failed_store_releases_the_key_hold(monkeypatch):
+    async def failing_store(record):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(executor_module, 'store_search', failing_store)
+
+    async def submit():
+        executor = SearchExecutor(workers=0)
+        with pytest.raises(RuntimeError):
+            await executor.submit(never_run, ['python'], 'Berlin', key='key-a')
+
+    asyncio.run(submit())
+
+    assert 'key-a' not in admission_controller.held_by_key
+
+
+def test_search_is_only_visible_to_its_api_key():
+    async def submit_and_get():
+        executor = SearchExecutor(workers=1)
+        record = await executor.submit(never_run, ['python'], 'Berlin', key='key-a')
+        return (
+            await executor.get(record['search_id'], 'key-a'),
+            await executor.get(record['search_id'], 'key-b'),
+        )
+
+    own, other = asyncio.run(submit_and_get())
+
+    assert own is not None
+    assert other is None
+
+
+def test_queue_position_follows_submission_order():
+    async def submit_behind_running_search():
+        blocked = asyncio.Event()
+
+        async def blocking_search(keywords, location, progress):
+            await blocked.wait()
+            return []
+
+        executor = SearchExecutor(workers=1)
+        await executor.submit(blocking_search, ['go'], 'Berlin')
+        await asyncio.sleep(0.01)
+        queued = [await executor.submit(never_run, [keyword], 'Berlin') for keyword in ('python', 'rust')]
+        return [executor.queue_position(record) for record in queued]
+
+    assert asyncio.run(submit_behind_running_search()) == [0, 1]
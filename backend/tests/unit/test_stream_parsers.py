@@ -0,0 +1,76 @@
+"""
+Unit tests for the incremental parsers of streamed LLM output.
+"""
+from services.stream_parsers import IncrementalJSONParser, IncrementalListParser, clean_list_item
+
+
+def feed_all(parser, pieces):
+    results = []
+    for piece in pieces:
+        results.append(parser.feed(piece))
+    return results
+
+
+def test_list_items_are_returned_as_they_complete():
+    parser = IncrementalListParser()
+
+    assert feed_all(parser, ['pyth', 'on, dja', 'ngo,', ' flask']) == [[], ['python'], ['django'], []]
+    assert parser.close() == ['flask']
+    assert parser.items == ['python', 'django', 'flask']
+
+
+def test_list_ends_at_limit():
+    parser = IncrementalListParser(limit=2)
+
+    assert parser.feed('a, b, c, d') == ['a', 'b']
+    assert parser.complete
+    assert parser.feed('e,') == []
+    assert parser.close() == []
+
+
+def test_list_ends_at_closing_bracket_or_blank_line():
+    bracketed = IncrementalListParser()
+    assert bracketed.feed('["go", "rust"] Let me know') == ['go', 'rust']
+    assert bracketed.complete
+
+    commented = IncrementalListParser()
+    assert commented.feed('go, rust\n\nThese are') == ['go', 'rust']
+    assert commented.complete
+
+
+def test_list_with_newline_delimiter_and_numbering():
+    parser = IncrementalListParser(delimiter='\n')
+
+    assert parser.feed('1. python\n2. "django"\n- flask\n') == ['python', 'django', 'flask']
+
+
+def test_clean_list_item():
+    assert clean_list_item(' 3) `kubernetes`. ') == 'kubernetes'
+    assert clean_list_item('* "react"') == 'react'
+
+
+def test_json_fields_are_returned_as_they_complete():
+    parser = IncrementalJSONParser()
+
+    results = feed_all(parser, ['Sure: {"required_skills": ["Go",', ' "SQL"], "experience', '_level": "senior"}', ' done'])
+
+    assert results == [[], [('required_skills', ['Go', 'SQL'])], [('experience_level', 'senior')], []]
+    assert parser.complete
+    assert parser.value == {'required_skills': ['Go', 'SQL'], 'experience_level': 'senior'}
+
+
+def test_json_braces_and_commas_in_strings_do_not_split_fields():
+    parser = IncrementalJSONParser()
+
+    fields = parser.feed('{"a": "x, {y}", "b": "say \\"}\\"", "c": {"d": [1, 2]}}')
+
+    assert fields == [('a', 'x, {y}'), ('b', 'say "}"'), ('c', {'d': [1, 2]})]
+    assert parser.value == {'a': 'x, {y}', 'b': 'say "}"', 'c': {'d': [1, 2]}}
+
+
+def test_json_incomplete_object_is_not_complete():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"a": 1, "b": [2') == [('a', 1)]
+    assert not parser.complete
+    assert parser.value is None